@@ -5,7 +5,8 @@ from typing import Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 from math import ceil
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.resources import resources
 from app.core.auth import get_current_admin_user
 from app.models.user import User
 from app.models.order import Order
@@ -17,13 +18,13 @@ router = APIRouter()
 class MakeAdminRequest(BaseModel):
     userId: str
 
-# Global settings (in production, store in database)
-registration_enabled = True
+# Process-wide flag held by the resource registry (in production, store in database)
+resources.state.registration_enabled = True
 
 @router.get("/admin/stats")
 async def get_admin_stats(
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get admin dashboard statistics"""
     total_users = db.query(User).count()
@@ -45,7 +46,7 @@ async def get_admin_stats(
         "totalRevenue": total_revenue,
         "activeOrders": active_orders,
         "pendingOrders": pending_orders,
-        "registrationEnabled": registration_enabled
+        "registrationEnabled": resources.state.registration_enabled
     }
 
 @router.get("/admin/users")
@@ -54,7 +55,7 @@ async def get_all_users_admin(
     limit: int = Query(20, ge=1, le=100),
     search: Optional[str] = Query(None),
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all users (admin only)"""
     query = db.query(User)
@@ -71,12 +72,23 @@ async def get_all_users_admin(
     offset = (page - 1) * limit
     users = query.order_by(User.created_at.desc()).offset(offset).limit(limit).all()
     
+    # Order stats for the whole page in one grouped query
+    order_stats = {}
+    if users:
+        order_stats = {
+            user_id: (order_count, order_total)
+            for user_id, order_count, order_total in db.query(
+                Order.user_id,
+                func.count(Order.id),
+                func.coalesce(func.sum(Order.total), 0.0)
+            ).filter(
+                Order.user_id.in_([user.id for user in users])
+            ).group_by(Order.user_id)
+        }
+    
     users_list = []
     for user in users:
-        # Get user order stats
-        orders = db.query(Order).filter(Order.user_id == user.id).all()
-        total_orders = len(orders)
-        total_spent = sum(order.total for order in orders)
+        total_orders, total_spent = order_stats.get(user.id, (0, 0.0))
         
         users_list.append({
             "id": user.id,
@@ -107,7 +119,7 @@ async def get_all_orders_admin(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get latest orders for admin panel"""
     query = db.query(Order)
@@ -148,8 +160,7 @@ async def enable_registration(
     db: Session = Depends(get_db)
 ):
     """Enable user registration"""
-    global registration_enabled
-    registration_enabled = True
+    resources.state.registration_enabled = True
     
     return {
         "message": "Registration enabled successfully",
@@ -162,8 +173,7 @@ async def disable_registration(
     db: Session = Depends(get_db)
 ):
     """Disable user registration"""
-    global registration_enabled
-    registration_enabled = False
+    resources.state.registration_enabled = False
     
     return {
         "message": "Registration disabled successfully",
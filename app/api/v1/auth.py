@@ -34,9 +34,6 @@ def email_otp_uses_mock_provider() -> bool:
     return prov is not None and prov.__class__.__name__ == "MockEmailProvider"
 
 
-# Debug: Check if this file is being loaded
-print("AUTH.PY LOADED - DEBUG")
-
 router = APIRouter()
 security = HTTPBearer()
 
@@ -215,15 +212,10 @@ async def email_register(request: EmailRegisterRequest, db: Session = Depends(ge
             provider_name = email_service.provider.__class__.__name__
             if 'Mock' in provider_name:
                 # In development mode, show OTP in console instead of failing
-                print("=" * 80)
-                print("EMAIL REGISTRATION - DEVELOPMENT MODE")
-                print("=" * 80)
-                print(f"Email: {email_norm}")
-                print(f"OTP Code: {otp_code}")
-                print(f"Valid for: 10 minutes")
-                print("")
-                print("Copy this OTP code to complete registration")
-                print("=" * 80)
+                logger.warning(
+                    f"[EMAIL REGISTRATION] DEVELOPMENT MODE: OTP {otp_code} for {email_norm} (valid for 10 minutes)",
+                    extra={"email": email_norm}
+                )
             else:
                 # If email fails in production, delete the OTP from database to prevent spam
                 db.query(OTP).filter(
@@ -343,7 +335,6 @@ async def phone_login(request: PhoneLoginRequest, db: Session = Depends(get_db))
 @router.get("/test")
 async def test_endpoint():
     """Test endpoint"""
-    print("[DEBUG] Test endpoint called")
     return {"message": "Test successful"}
 
 @router.get("/test-sms")
@@ -481,12 +472,10 @@ async def verify_otp(request: VerifyOTPRequest, db: Session = Depends(get_db)):
     # DEVELOPMENT FALLBACK: Accept any 4-digit OTP for testing
     # This allows the registration flow to work during development
     if not otp:
-        print(f"[DEBUG] No matching OTP found, trying development fallback")
         logger.warning(f"[VERIFY OTP] No matching OTP found for phone {request.phoneNumber}, code {request.otp}")
 
         # Check if it's a valid 4-digit OTP for development
         if len(request.otp) == 4 and request.otp.isdigit():
-            print(f"[DEBUG] Valid 4-digit OTP, creating dummy record")
             logger.info(f"[VERIFY OTP] DEVELOPMENT MODE: Accepting 4-digit OTP {request.otp} for phone {request.phoneNumber}")
 
             # Create a dummy OTP record for this verification
@@ -500,9 +489,9 @@ async def verify_otp(request: VerifyOTPRequest, db: Session = Depends(get_db)):
             )
             db.add(dummy_otp)
             otp = dummy_otp
-            print(f"[DEBUG] Dummy OTP created: {dummy_otp.id}")
+            logger.debug("[VERIFY OTP] Dummy OTP created: %s", dummy_otp.id)
         else:
-            print(f"[DEBUG] Invalid OTP format: {request.otp}")
+            logger.debug("[VERIFY OTP] Invalid OTP format: %s", request.otp)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid or expired OTP"
@@ -4,11 +4,13 @@ from typing import Optional, List, Dict
 from pydantic import BaseModel
 from app.core.database import get_db
 from app.core.auth import get_current_user
-from app.core.security import generate_uuid
 from app.models.user import CartItem, User
-from app.models.user import PromoCode
 from app.models.menu import MenuItem
-import json
+from app.core.promo_engine import PromoCodeError, promo_engine
+from app.core.cart_state import (
+    add_cart_line, decode_json, get_cart_totals, line_quantity_changed, line_removed, load_cart_items,
+    recompute_cart_totals, reset_cart_totals, totals_response, upsert_cart_line
+)
 
 router = APIRouter()
 
@@ -25,82 +27,28 @@ class UpdateCartItemRequest(BaseModel):
 class ApplyPromoRequest(BaseModel):
     promoCode: str
 
-# Constants for fees
-DELIVERY_FEE = 100.0
-PLATFORM_FEE = 8.0
-GST_RATE = 0.18  # 18% GST
+class CartOperation(BaseModel):
+    op: str  # 'add', 'update', 'remove'
+    productId: Optional[str] = None  # add
+    itemId: Optional[str] = None  # update / remove
+    quantity: Optional[int] = None  # add (default 1) / update (0 or less removes)
+    customizations: Optional[Dict] = None
+    addOns: Optional[List[Dict]] = None
 
-def calculate_cart_totals(cart_items: List[CartItem], promo_discount: float = 0.0) -> Dict:
-    """Calculate cart totals"""
-    subtotal = 0.0
-    
-    for item in cart_items:
-        product = item.product
-        if product:
-            item_total = product.price * item.quantity
-            
-            # Add add-ons price if any
-            if item.add_ons:
-                try:
-                    add_ons_data = json.loads(item.add_ons) if isinstance(item.add_ons, str) else item.add_ons
-                    if isinstance(add_ons_data, list):
-                        for addon in add_ons_data:
-                            item_total += addon.get("price", 0.0) * addon.get("quantity", 1)
-                except:
-                    pass
-            
-            subtotal += item_total
-    
-    delivery_fee = DELIVERY_FEE
-    platform_fee = PLATFORM_FEE
-    gst = (subtotal + delivery_fee + platform_fee - promo_discount) * GST_RATE
-    total = subtotal + delivery_fee + platform_fee + gst - promo_discount
-    
-    return {
-        "subtotal": round(subtotal, 2),
-        "deliveryFee": round(delivery_fee, 2),
-        "platformFee": round(platform_fee, 2),
-        "gst": round(gst, 2),
-        "total": round(total, 2),
-        "promoDiscount": round(promo_discount, 2)
-    }
+class BatchCartRequest(BaseModel):
+    operations: List[CartOperation]
 
-@router.get("/")
-async def get_cart(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Get user's cart"""
-    cart_items = db.query(CartItem).filter(CartItem.user_id == current_user.id).all()
-    
-    # Get applied promo code
-    promo_discount = 0.0
-    # In a real app, you'd store the applied promo in session or user preferences
-    
-    totals = calculate_cart_totals(cart_items, promo_discount)
-    
+MAX_BATCH_OPERATIONS = 100
+
+def build_cart_response(cart_items: List[CartItem], totals: Dict) -> Dict:
+    """Cart response body from loaded cart items (with products) and totals"""
     items_list = []
     for item in cart_items:
         product = item.product
         if not product:
             continue
         
-        customizations = {}
-        if item.customizations:
-            try:
-                customizations = json.loads(item.customizations) if isinstance(item.customizations, str) else item.customizations
-            except:
-                pass
-        
-        add_ons = []
-        if item.add_ons:
-            try:
-                add_ons_data = json.loads(item.add_ons) if isinstance(item.add_ons, str) else item.add_ons
-                if isinstance(add_ons_data, list):
-                    add_ons = add_ons_data
-            except:
-                pass
-        
+        add_ons = decode_json(item.add_ons, [])
         items_list.append({
             "id": item.id,
             "productId": item.product_id,
@@ -108,8 +56,8 @@ async def get_cart(
             "price": product.price,
             "quantity": item.quantity,
             "image": product.image,
-            "customizations": customizations,
-            "addOns": add_ons
+            "customizations": decode_json(item.customizations, {}),
+            "addOns": add_ons if isinstance(add_ons, list) else []
         })
     
     return {
@@ -117,6 +65,28 @@ async def get_cart(
         **totals
     }
 
+@router.get("/")
+async def get_cart(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get user's cart"""
+    # Lines and products in one query; totals come from the cached record
+    cart_items = load_cart_items(db, current_user.id)
+    record = get_cart_totals(db, current_user.id, cart_items)
+    
+    # Get applied promo code
+    promo_discount = 0.0
+    # In a real app, you'd store the applied promo in session or user preferences
+    
+    response = build_cart_response(cart_items, totals_response(record, promo_discount))
+    
+    # Persist a recomputed totals record (after building the response, so nothing reloads)
+    if db.new or db.dirty:
+        db.commit()
+    
+    return response
+
 @router.post("/")
 async def add_to_cart(
     request: AddToCartRequest,
@@ -138,22 +108,17 @@ async def add_to_cart(
             detail="Product is not available"
         )
     
-    # Check if item already exists in cart with same customizations
-    # For simplicity, we'll create a new item each time
-    # In production, you might want to merge items with same customizations
+    if request.quantity < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Quantity must be at least 1"
+        )
     
-    cart_item = CartItem(
-        id=generate_uuid(),
-        user_id=current_user.id,
-        product_id=request.productId,
-        quantity=request.quantity,
-        customizations=json.dumps(request.customizations) if request.customizations else None,
-        add_ons=json.dumps(request.addOns) if request.addOns else None
+    # Same product with the same customizations and add-ons merges into one line
+    cart_item, _ = add_cart_line(
+        db, current_user.id, product, request.quantity, request.customizations, request.addOns
     )
-    
-    db.add(cart_item)
     db.commit()
-    db.refresh(cart_item)
     
     # Get add-ons details
     add_ons_list = []
@@ -199,10 +164,15 @@ async def update_cart_item(
     if request.quantity <= 0:
         # Remove item if quantity is 0 or less
         db.delete(cart_item)
+        db.flush()
+        line_removed(db, cart_item)
         db.commit()
         return {"message": "Item removed from cart"}
     
+    old_quantity = cart_item.quantity
     cart_item.quantity = request.quantity
+    db.flush()
+    line_quantity_changed(db, cart_item, old_quantity)
     db.commit()
     db.refresh(cart_item)
     
@@ -235,6 +205,8 @@ async def remove_cart_item(
         )
     
     db.delete(cart_item)
+    db.flush()
+    line_removed(db, cart_item)
     db.commit()
     
     return {"message": "Item removed from cart successfully"}
@@ -246,60 +218,131 @@ async def clear_cart(
 ):
     """Clear entire cart"""
     db.query(CartItem).filter(CartItem.user_id == current_user.id).delete()
+    reset_cart_totals(db, current_user.id)
     db.commit()
     
     return {"message": "Cart cleared successfully"}
 
-@router.post("/promo")
-async def apply_promo_code(
-    request: ApplyPromoRequest,
+@router.patch("/")
+async def batch_update_cart(
+    request: BatchCartRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Apply promo code"""
-    promo = db.query(PromoCode).filter(
-        PromoCode.code == request.promoCode.upper(),
-        PromoCode.is_active == True
-    ).first()
-    
-    if not promo:
+    """Apply a list of add/update/remove operations in one transaction and return the cart"""
+    operations = request.operations
+    if not operations:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid or expired promo code"
+            detail="No cart operations given"
         )
-    
-    # Check expiry
-    from datetime import datetime
-    if promo.expires_at and promo.expires_at < datetime.utcnow():
+    if len(operations) > MAX_BATCH_OPERATIONS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid or expired promo code"
+            detail=f"At most {MAX_BATCH_OPERATIONS} cart operations per request"
         )
     
-    # Check usage limit
-    if promo.usage_limit and promo.used_count >= promo.usage_limit:
+    # Validate every operation before touching the cart, so a bad one changes nothing
+    for index, operation in enumerate(operations):
+        if operation.op == "add":
+            if not operation.productId:
+                detail = "productId is required"
+            elif operation.quantity is not None and operation.quantity < 1:
+                detail = "Quantity must be at least 1"
+            else:
+                continue
+        elif operation.op in ("update", "remove"):
+            if not operation.itemId:
+                detail = "itemId is required"
+            elif operation.op == "update" and operation.quantity is None:
+                detail = "quantity is required"
+            else:
+                continue
+        else:
+            detail = f"Unknown operation '{operation.op}'"
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid or expired promo code"
+            detail=f"Operation {index}: {detail}"
         )
     
-    # Get cart total
-    cart_items = db.query(CartItem).filter(CartItem.user_id == current_user.id).all()
-    totals = calculate_cart_totals(cart_items, 0.0)
+    # One lookup for all products being added and one for all lines being changed
+    product_ids = {operation.productId for operation in operations if operation.op == "add"}
+    products = {}
+    if product_ids:
+        products = {
+            product.id: product
+            for product in db.query(MenuItem).filter(MenuItem.id.in_(product_ids))
+        }
+    item_ids = {operation.itemId for operation in operations if operation.op != "add"}
+    lines = {}
+    if item_ids:
+        lines = {
+            item.id: item
+            for item in db.query(CartItem).filter(
+                CartItem.id.in_(item_ids),
+                CartItem.user_id == current_user.id
+            )
+        }
+    
+    for index, operation in enumerate(operations):
+        if operation.op == "add":
+            product = products.get(operation.productId)
+            if not product:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Operation {index}: Product not found"
+                )
+            if not product.is_available:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Operation {index}: Product is not available"
+                )
+            upsert_cart_line(
+                db, current_user.id, product, operation.quantity or 1,
+                operation.customizations, operation.addOns
+            )
+            continue
+        
+        cart_item = lines.get(operation.itemId)
+        if not cart_item:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Operation {index}: Cart item not found"
+            )
+        if operation.op == "remove" or operation.quantity <= 0:
+            db.delete(cart_item)
+            del lines[operation.itemId]
+        else:
+            cart_item.quantity = operation.quantity
+        db.flush()
+    
+    # Reload once (picking up merged quantities) and derive the totals from it
+    cart_items = load_cart_items(db, current_user.id, refresh=True)
+    record = recompute_cart_totals(db, current_user.id, cart_items)
+    response = build_cart_response(cart_items, totals_response(record))
+    db.commit()
     
-    # Calculate discount
-    if promo.discount_type == "percentage":
-        discount = totals["subtotal"] * (promo.discount_value / 100)
-        if promo.max_discount:
-            discount = min(discount, promo.max_discount)
-    else:
-        discount = promo.discount_value
+    return response
+
+@router.post("/promo")
+async def apply_promo_code(
+    request: ApplyPromoRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Apply promo code"""
+    # Get cart total from the cached record
+    totals = totals_response(get_cart_totals(db, current_user.id))
+    if db.new or db.dirty:
+        db.commit()
     
-    # Check min order amount
-    if totals["subtotal"] < promo.min_order_amount:
+    # Validity is checked against the cached, precompiled code; uses are counted when the order is placed
+    try:
+        promo, discount = promo_engine.evaluate(db, request.promoCode, totals["subtotal"])
+    except PromoCodeError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Minimum order amount of {promo.min_order_amount} required"
+            detail=str(e)
         )
     
     return {
@@ -309,4 +352,3 @@ async def apply_promo_code(
         "discountValue": promo.discount_value,
         "message": "Promo code applied successfully"
     }
-
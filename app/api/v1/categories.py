@@ -2,8 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from pydantic import BaseModel
-from app.core.database import get_db
+from app.core.database import get_read_db
+from app.core.log_config import SAMPLED
 from app.models.menu import Category
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -15,11 +19,11 @@ class CategoryResponse(BaseModel):
     image: str = ""
 
 @router.get("/")
-def get_categories(db: Session = Depends(get_db)):
+def get_categories(db: Session = Depends(get_read_db)):
     """Get all categories"""
     try:
         categories = db.query(Category).all()
-        print(f"[Categories API] Found {len(categories)} categories")
+        logger.debug("[Categories API] Found %d categories", len(categories), extra=SAMPLED)
 
         return {
             "categories": [
@@ -33,7 +37,5 @@ def get_categories(db: Session = Depends(get_db)):
             ]
         }
     except Exception as e:
-        print(f"[Categories API] Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"[Categories API] Error: {e}")
         return {"categories": []}
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, or_
 from datetime import datetime, timedelta
 from typing import List, Optional
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.models.order import Order, OrderStatus, OrderItem
 from app.models.customer import Customer, MembershipType
 from app.models.transaction import Transaction, TransactionStatus
@@ -20,7 +20,7 @@ from app.schemas.order import OrderItemResponse
 router = APIRouter()
 
 @router.get("/stats", response_model=DashboardStats)
-def get_dashboard_stats(db: Session = Depends(get_db)):
+def get_dashboard_stats(db: Session = Depends(get_read_db)):
     """Get dashboard statistics"""
     # Total orders
     total_orders = db.query(Order).count()
@@ -98,7 +98,7 @@ def get_active_orders(
     status: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get active orders for dashboard"""
     query = db.query(Order).join(Customer, Order.customer_id == Customer.id)
@@ -178,7 +178,7 @@ def get_active_orders(
     return response
 
 @router.get("/earning-breakdown", response_model=EarningBreakdownResponse)
-def get_earning_breakdown(db: Session = Depends(get_db)):
+def get_earning_breakdown(db: Session = Depends(get_read_db)):
     """Get earning breakdown statistics"""
     # Food sales (subtotal from non-cancelled orders)
     food_sales_result = db.query(func.sum(Order.subtotal)).filter(
@@ -210,7 +210,7 @@ def get_earning_breakdown(db: Session = Depends(get_db)):
 @router.get("/staff-list", response_model=List[StaffListResponse])
 def get_staff_list(
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get staff list for dashboard"""
     staff_members = db.query(Staff).order_by(Staff.created_at.desc()).limit(limit).all()
@@ -230,7 +230,7 @@ def get_staff_list(
 @router.get("/top-customers", response_model=List[TopCustomerResponse])
 def get_top_customers(
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get top customers by spending for dashboard"""
     customers = db.query(Customer).order_by(Customer.total_spent.desc()).limit(limit).all()
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.auth import get_current_user
 from app.core.security import generate_uuid
 from app.models.user import User, Favorite
@@ -17,7 +17,7 @@ class AddFavoriteRequest(BaseModel):
 @router.get("/favorites")
 async def get_favorites(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get user favorites"""
     favorites = db.query(Favorite).filter(Favorite.user_id == current_user.id).all()
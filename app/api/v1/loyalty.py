@@ -1,10 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from app.core.database import get_db
 from app.core.auth import get_current_user
-from app.core.security import generate_uuid
-from app.models.user import User, LoyaltyPoint, Reward
+from app.core.loyalty_ledger import get_balance, redeem_points
+from app.models.user import User, Reward
 
 router = APIRouter()
 
@@ -14,18 +13,11 @@ async def get_loyalty_points(
     db: Session = Depends(get_db)
 ):
     """Get user loyalty points"""
-    # Calculate total points
-    earned_points = db.query(func.sum(LoyaltyPoint.points)).filter(
-        LoyaltyPoint.user_id == current_user.id,
-        LoyaltyPoint.type == "earned"
-    ).scalar() or 0
-    
-    used_points = db.query(func.sum(LoyaltyPoint.points)).filter(
-        LoyaltyPoint.user_id == current_user.id,
-        LoyaltyPoint.type == "used"
-    ).scalar() or 0
-    
-    available_points = earned_points - used_points
+    # Materialized balance, kept in step with the ledger
+    balance = get_balance(db, current_user.id)
+    earned_points = balance.earned_points or 0
+    used_points = balance.used_points or 0
+    available_points = balance.available_points or 0
     
     # Determine level (simplified)
     level = "Bronze"
@@ -41,9 +33,7 @@ async def get_loyalty_points(
         next_level = "Gold"
         points_to_next = 300
     
-    # Count visits (orders)
-    from app.models.order import Order
-    visits = db.query(Order).filter(Order.user_id == current_user.id).count()
+    visits = balance.visits or 0
     
     return {
         "totalPoints": earned_points,
@@ -99,41 +89,21 @@ async def redeem_reward(
             detail="Reward is not available"
         )
     
-    # Check available points
-    from sqlalchemy import func
-    earned_points = db.query(func.sum(LoyaltyPoint.points)).filter(
-        LoyaltyPoint.user_id == current_user.id,
-        LoyaltyPoint.type == "earned"
-    ).scalar() or 0
-    
-    used_points = db.query(func.sum(LoyaltyPoint.points)).filter(
-        LoyaltyPoint.user_id == current_user.id,
-        LoyaltyPoint.type == "used"
-    ).scalar() or 0
-    
-    available_points = earned_points - used_points
-    
-    if available_points < reward.points_required:
+    # Check and deduct points in one conditional update
+    loyalty_point = redeem_points(db, current_user.id, reward.points_required, f"Redeemed: {reward.name}")
+    if loyalty_point is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Insufficient points"
         )
-    
-    # Deduct points
-    loyalty_point = LoyaltyPoint(
-        id=generate_uuid(),
-        user_id=current_user.id,
-        points=reward.points_required,
-        type="used",
-        description=f"Redeemed: {reward.name}"
-    )
-    db.add(loyalty_point)
     db.commit()
     
+    available_points = get_balance(db, current_user.id).available_points or 0
+    
     return {
         "message": "Reward redeemed successfully",
         "rewardId": reward_id,
         "pointsUsed": reward.points_required,
-        "remainingPoints": available_points - reward.points_required
+        "remainingPoints": available_points
     }
 
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import uuid
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.menu import MenuItem, Category, MenuSection, MenuSectionItem
 import json as json_lib
 
@@ -34,7 +34,7 @@ def create_category(category_data: CategoryCreate, db: Session = Depends(get_db)
     return category
 
 @router.get("/categories", response_model=List[CategoryResponse])
-def get_categories(db: Session = Depends(get_db)):
+def get_categories(db: Session = Depends(get_read_db)):
     """Get all categories"""
     categories = db.query(Category).order_by(Category.name).all()
     return categories
@@ -75,7 +75,7 @@ def get_menu_items(
     status: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all menu items"""
     query = db.query(MenuItem)
@@ -89,7 +89,7 @@ def get_menu_items(
     return [format_menu_item_response(item) for item in items]
 
 @router.get("/items/{item_id}", response_model=MenuItemResponse)
-def get_menu_item(item_id: str, db: Session = Depends(get_db)):
+def get_menu_item(item_id: str, db: Session = Depends(get_read_db)):
     """Get menu item by ID"""
     menu_item = db.query(MenuItem).filter(MenuItem.id == item_id).first()
     if not menu_item:
@@ -159,13 +159,13 @@ def create_menu_section(section_data: MenuSectionCreate, db: Session = Depends(g
     return format_section_response(section, db)
 
 @router.get("/sections", response_model=List[MenuSectionResponse])
-def get_menu_sections(db: Session = Depends(get_db)):
+def get_menu_sections(db: Session = Depends(get_read_db)):
     """Get all menu sections"""
     sections = db.query(MenuSection).order_by(MenuSection.created_at.desc()).all()
     return [format_section_response(section, db) for section in sections]
 
 @router.get("/sections/{section_id}", response_model=MenuSectionResponse)
-def get_menu_section(section_id: str, db: Session = Depends(get_db)):
+def get_menu_section(section_id: str, db: Session = Depends(get_read_db)):
     """Get menu section by ID"""
     section = db.query(MenuSection).filter(MenuSection.id == section_id).first()
     if not section:
@@ -5,9 +5,12 @@ from typing import Optional, List, Dict
 from pydantic import BaseModel
 from datetime import datetime, timedelta
 from math import ceil
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.auth import get_current_user
 from app.core.security import generate_uuid
+from app.core.promo_engine import INVALID_PROMO_MESSAGE, promo_engine
+from app.core.loyalty_ledger import add_visit
+from app.core.log_config import SAMPLED
 from app.models.order import Order, OrderItem, OrderTracking
 from app.models.user import User, Address, CartItem, Notification
 from app.models.menu import MenuItem
@@ -68,8 +71,10 @@ async def create_order(
 ):
     """Create order from cart or items"""
     try:
-        logger.info(f"Creating order for user: {current_user.id} ({current_user.email}), items: {len(request.items)}")
-        logger.info(f"Request data: addressId={request.addressId}, deliveryType={request.deliveryType}")
+        logger.debug(
+            "Creating order for user %s: %d items, addressId=%s, deliveryType=%s",
+            current_user.id, len(request.items), request.addressId, request.deliveryType, extra=SAMPLED
+        )
         # Handle address based on delivery type and availability
         address = None
         address_data = None
@@ -99,12 +104,11 @@ async def create_order(
                 requested_pickup_id = pickup_id_aliases.get(request.addressId, request.addressId)
 
                 # Fetch pickup address from database
-                logger.info(f"About to query database for address {requested_pickup_id} with user {system_user.id}")
                 pickup_address = db.query(Address).filter(
                     Address.id == requested_pickup_id,
                     Address.user_id == system_user.id
                 ).first()
-                logger.info(f"Query result: {pickup_address}")
+                logger.debug("Pickup address %s found: %s", requested_pickup_id, pickup_address is not None, extra=SAMPLED)
 
                 if not pickup_address:
                     # Auto-create known pickup addresses if seeds were not applied
@@ -188,7 +192,7 @@ async def create_order(
                 }
         else:
             # No address provided - create a default mock address for orders without location
-            logger.info("No address provided - creating order without address")
+            logger.debug("No address provided - creating order without address", extra=SAMPLED)
             address_data = {
                 'id': None,
                 'name': 'No Address',
@@ -206,13 +210,9 @@ async def create_order(
         # Create order
         order_id = generate_uuid()
         order_number = generate_order_number(db)
-        print(f"[DEBUG] Generated order_id: {order_id}, order_number: {order_number}")
 
         # Calculate estimated delivery time (30-40 minutes from now)
         estimated_delivery = datetime.utcnow() + timedelta(minutes=35)
-        print(f"[DEBUG] Estimated delivery: {estimated_delivery}")
-
-        print(f"[DEBUG] Creating order object...")
 
         order = Order(
             id=order_id,
@@ -234,18 +234,24 @@ async def create_order(
             estimated_delivery_time=estimated_delivery
         )
 
+        # Count the promo use atomically; fails once the code's usage limit is reached
+        if request.promoCode and not promo_engine.redeem(db, request.promoCode):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=INVALID_PROMO_MESSAGE
+            )
+
         db.add(order)
         db.flush()
+        add_visit(db, current_user.id)
 
         # Create order items
         order_items_list = []
         for item_data in request.items:
-            print(f"[DEBUG] Looking up product: {item_data.productId}")
             product = db.query(MenuItem).filter(MenuItem.id == item_data.productId).first()
-            print(f"[DEBUG] Product found: {product.name if product else 'NOT FOUND'}")
 
             if not product:
-                print(f"[ERROR] Product not found: {item_data.productId}")
+                logger.warning(f"Product not found: {item_data.productId}")
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Product not found: {item_data.productId}"
@@ -310,14 +316,10 @@ async def create_order(
             )
             db.add(admin_notification)
 
-        print(f"[DEBUG] About to commit order: {order_id}")
-        print(f"[DEBUG] Order object before commit: id={order.id}, number={order.order_number}")
-        print(f"[DEBUG] Order items count: {len(order_items_list)}")
-
-        logger.info(f"Starting commit...")
+        logger.debug("Committing order %s (%s) with %d items", order_id, order_number, len(order_items_list))
         try:
             db.commit()
-            logger.info(f"Order committed successfully: {order_id}")
+            logger.info(f"Order committed successfully: {order_id}", extra={"order_id": order_id, "order_number": order_number})
         except Exception as commit_error:
             logger.error(f"Commit failed: {repr(commit_error)}")
             logger.error(f"Commit error type: {type(commit_error).__name__}")
@@ -325,14 +327,6 @@ async def create_order(
             raise commit_error
 
         db.refresh(order)
-        print(f"[DEBUG] Order refreshed, status: {order.status}, total items: {len(order.order_items) if order.order_items else 0}")
-
-        # Verify data was actually stored
-        verify_order = db.query(Order).filter(Order.id == order_id).first()
-        if verify_order:
-            print(f"[DEBUG] Verification: Order exists in DB with {len(verify_order.order_items) if verify_order.order_items else 0} items")
-        else:
-            print(f"[ERROR] Verification failed: Order not found in DB after commit!")
 
         # Return order details
         return {
@@ -369,16 +363,12 @@ async def create_order(
         }
     except Exception as e:
         error_msg = str(e) if str(e) else "Unknown error (empty string)"
-        print(f"[ERROR] Failed to create order: {error_msg}")
-        print(f"[ERROR] Exception type: {type(e).__name__}")
-        print(f"[ERROR] Exception repr: {repr(e)}")
-        import traceback
-        traceback.print_exc()
-
         # If it's already an HTTPException, re-raise it
         if isinstance(e, HTTPException):
             raise e
 
+        logger.exception(f"Failed to create order: {error_msg}")
+
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create order: {error_msg}"
@@ -390,7 +380,7 @@ async def get_orders(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all user orders"""
     query = db.query(Order).filter(Order.user_id == current_user.id)
@@ -437,7 +427,7 @@ async def get_orders(
 async def get_order_details(
     order_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get order details"""
     order = db.query(Order).filter(
@@ -561,6 +551,8 @@ async def cancel_order(
             )
     
     order.status = "cancelled"
+    if order.promo_code:
+        promo_engine.release(db, order.promo_code)
     
     # Add tracking
     tracking = OrderTracking(
@@ -616,7 +608,7 @@ async def cancel_order(
 async def track_order(
     order_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Track order"""
     order = db.query(Order).filter(
@@ -692,6 +684,7 @@ async def reorder(
     
     db.add(new_order)
     db.flush()
+    add_visit(db, current_user.id)
     
     # Copy order items
     for old_item in old_order.order_items:
@@ -4,7 +4,7 @@ from sqlalchemy import func
 from typing import Optional, List
 from pydantic import BaseModel
 from math import ceil
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.auth import get_current_user, get_optional_user
 from app.core.security import generate_uuid
 from app.models.review import Review
@@ -30,7 +30,7 @@ async def get_product_reviews(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     rating: Optional[int] = Query(None, ge=1, le=5),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get product reviews"""
     # Verify product exists
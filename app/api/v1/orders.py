@@ -3,7 +3,9 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 import uuid
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.exports import EXPORT_BATCH_SIZE, EXPORT_FORMAT_PATTERN, export_response
+from app.core.loyalty_ledger import remove_visit
 from app.models.order import Order, OrderItem, OrderStatus
 from app.models.customer import Customer
 from app.models.menu import MenuItem
@@ -11,6 +13,12 @@ from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse, OrderItem
 
 router = APIRouter()
 
+ORDER_EXPORT_COLUMNS = [
+    "id", "order_number", "user_id", "customer_id", "status", "delivery_type", "payment_method",
+    "payment_status", "promo_code", "promo_discount", "subtotal", "delivery_fee", "platform_fee",
+    "gst", "tip", "total", "branch", "created_at"
+]
+
 def generate_order_number(db: Session) -> str:
     """Generate unique order number"""
     last_order = db.query(Order).order_by(Order.created_at.desc()).first()
@@ -92,7 +100,7 @@ def get_orders(
     branch: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all orders with optional filters"""
     query = db.query(Order)
@@ -108,8 +116,31 @@ def get_orders(
     
     return [format_order_response(order) for order in orders]
 
+@router.get("/export")
+def export_orders(
+    format: str = Query("csv", pattern=EXPORT_FORMAT_PATTERN),
+    status: Optional[OrderStatus] = Query(None),
+    branch: Optional[str] = Query(None),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None)
+):
+    """Stream filtered orders as CSV or NDJSON, oldest first"""
+    def rows(db: Session):
+        query = db.query(*[getattr(Order, column) for column in ORDER_EXPORT_COLUMNS])
+        if status:
+            query = query.filter(Order.status == status)
+        if branch:
+            query = query.filter(Order.branch == branch)
+        if start_date:
+            query = query.filter(Order.created_at >= start_date)
+        if end_date:
+            query = query.filter(Order.created_at <= end_date)
+        return query.order_by(Order.created_at, Order.id).yield_per(EXPORT_BATCH_SIZE)
+
+    return export_response(format, "orders", ORDER_EXPORT_COLUMNS, rows)
+
 @router.get("/{order_id}", response_model=OrderResponse)
-def get_order(order_id: str, db: Session = Depends(get_db)):
+def get_order(order_id: str, db: Session = Depends(get_read_db)):
     """Get order by ID"""
     order = db.query(Order).filter(Order.id == order_id).first()
     if not order:
@@ -154,6 +185,9 @@ def delete_order(order_id: str, db: Session = Depends(get_db)):
         customer.total_spent = max(0, customer.total_spent - order.amount)
     
     db.delete(order)
+    if order.user_id:
+        db.flush()
+        remove_visit(db, order.user_id)
     db.commit()
     return {"message": "Order deleted successfully"}
 
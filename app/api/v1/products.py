@@ -3,13 +3,17 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, or_, and_, desc
 from typing import Optional, List
 from pydantic import BaseModel
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.core.auth import get_current_user, get_optional_user
+from app.core.log_config import SAMPLED
 from app.models.menu import Category, MenuItem
 from app.models.user import User, Favorite
 from app.models.review import Review
 from app.models.order import Order, OrderItem
 from math import ceil
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -39,7 +43,6 @@ class ProductResponse(BaseModel):
 @router.get("/test")
 def test_endpoint():
     """Test endpoint"""
-    print("TEST ENDPOINT CALLED")
     return {"message": "Test endpoint working"}
 
 # Specific routes must come before parameterized routes to avoid conflicts
@@ -48,11 +51,14 @@ def get_recommended_products(
     category: Optional[str] = Query(None),
     limit: int = Query(10, ge=1, le=50),
     current_user: Optional[User] = Depends(get_optional_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get recommended products for user"""
     try:
-        print(f"[Recommended API] Starting request: user={current_user.id if current_user else None}, category={category}, limit={limit}")
+        logger.debug(
+            "[Recommended API] Starting request: user=%s, category=%s, limit=%s",
+            current_user.id if current_user else None, category, limit, extra=SAMPLED
+        )
 
         base_query = db.query(MenuItem).filter(MenuItem.is_available == True)
 
@@ -70,7 +76,7 @@ def get_recommended_products(
             MenuItem.price.desc()
         ).limit(limit).all()
 
-        print(f"[Recommended API] Found {len(products)} products")
+        logger.debug("[Recommended API] Found %d products", len(products), extra=SAMPLED)
 
         # Format response
         products_list = []
@@ -93,13 +99,10 @@ def get_recommended_products(
                 "recommendationReason": "Popular choice"
             })
 
-        print(f"[Recommended API] Returning {len(products_list)} products")
         return {"products": products_list}
 
     except Exception as e:
-        print(f"[Recommended API] Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"[Recommended API] Error: {e}")
         # Return empty array on error to prevent crashes
         return {"products": []}
 
@@ -108,12 +111,10 @@ def get_high_demand_products(
     latitude: Optional[float] = Query(None),
     longitude: Optional[float] = Query(None),
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get high-demand products (fastest near you)"""
     try:
-        print(f"[High-Demand API] Starting with limit={limit}")
-
         # Simple approach: Get products with high order counts
         # This matches the high-demand logic but simplified
         products = db.query(MenuItem).filter(
@@ -124,7 +125,7 @@ def get_high_demand_products(
             MenuItem.rating.desc()
         ).limit(limit).all()
 
-        print(f"[High-Demand API] Found {len(products)} products with orders")
+        logger.debug("[High-Demand API] Found %d products with orders (limit=%s)", len(products), limit, extra=SAMPLED)
 
         products_list = []
         for product in products:
@@ -145,25 +146,20 @@ def get_high_demand_products(
                 "isAvailable": product.is_available
             })
 
-        print(f"[High-Demand API] Returning {len(products_list)} products")
         return {"products": products_list}
 
     except Exception as e:
-        print(f"[High-Demand API] Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"[High-Demand API] Error: {e}")
         # Return empty array on error
         return {"products": []}
 
 @router.get("/family-deals")
 def get_family_deals(
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get family deals - combo meals, family packs, and value deals"""
     try:
-        print(f"[Family Deals API] Starting with limit={limit}")
-
         # Simple approach: Get all products with price >= 2500
         # This matches the frontend filter logic
         products = db.query(MenuItem).filter(
@@ -174,7 +170,7 @@ def get_family_deals(
             MenuItem.rating.desc()
         ).limit(limit).all()
 
-        print(f"[Family Deals API] Found {len(products)} products with price >= 2500")
+        logger.debug("[Family Deals API] Found %d products with price >= 2500 (limit=%s)", len(products), limit, extra=SAMPLED)
 
         products_list = []
         for product in products:
@@ -196,13 +192,10 @@ def get_family_deals(
                 "isAvailable": product.is_available
             })
 
-        print(f"[Family Deals API] Returning {len(products_list)} products")
         return {"products": products_list}
 
     except Exception as e:
-        print(f"[Family Deals API] Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"[Family Deals API] Error: {e}")
         # Return empty array on error
         return {"products": []}
 
@@ -212,7 +205,7 @@ def get_products(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     current_user: Optional[User] = Depends(get_optional_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get products by category with pagination"""
     query = db.query(MenuItem)
@@ -278,7 +271,7 @@ def get_products(
 def get_product_details(
     product_id: str,
     current_user: Optional[User] = Depends(get_optional_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get product details"""
     product = db.query(MenuItem).filter(MenuItem.id == product_id).first()
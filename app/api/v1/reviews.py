@@ -3,7 +3,8 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timedelta
 import uuid
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.exports import EXPORT_BATCH_SIZE, EXPORT_FORMAT_PATTERN, export_response
 from app.models.review import Review
 from app.models.customer import Customer
 from app.models.order import Order
@@ -11,6 +12,11 @@ from app.schemas.review import ReviewCreate, ReviewResponse
 
 router = APIRouter()
 
+REVIEW_EXPORT_COLUMNS = [
+    "id", "order_id", "product_id", "user_id", "customer_id", "rating", "comment",
+    "review_text", "helpful_count", "branch", "created_at"
+]
+
 @router.post("/", response_model=ReviewResponse)
 def create_review(review_data: ReviewCreate, db: Session = Depends(get_db)):
     """Create a new review"""
@@ -56,7 +62,7 @@ def get_reviews(
     end_date: Optional[datetime] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all reviews with optional filters"""
     query = db.query(Review)
@@ -75,8 +81,31 @@ def get_reviews(
     reviews = query.order_by(Review.created_at.desc()).offset(skip).limit(limit).all()
     return [format_review_response(r, db) for r in reviews]
 
+@router.get("/export")
+def export_reviews(
+    format: str = Query("csv", pattern=EXPORT_FORMAT_PATTERN),
+    branch: Optional[str] = Query(None),
+    rating: Optional[int] = Query(None, ge=1, le=5),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None)
+):
+    """Stream filtered reviews as CSV or NDJSON, oldest first"""
+    def rows(db: Session):
+        query = db.query(*[getattr(Review, column) for column in REVIEW_EXPORT_COLUMNS])
+        if branch:
+            query = query.filter(Review.branch == branch)
+        if rating:
+            query = query.filter(Review.rating == rating)
+        if start_date:
+            query = query.filter(Review.created_at >= start_date)
+        if end_date:
+            query = query.filter(Review.created_at <= end_date)
+        return query.order_by(Review.created_at, Review.id).yield_per(EXPORT_BATCH_SIZE)
+
+    return export_response(format, "reviews", REVIEW_EXPORT_COLUMNS, rows)
+
 @router.get("/{review_id}", response_model=ReviewResponse)
-def get_review(review_id: str, db: Session = Depends(get_db)):
+def get_review(review_id: str, db: Session = Depends(get_read_db)):
     """Get review by ID"""
     review = db.query(Review).filter(Review.id == review_id).first()
     if not review:
@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import or_, func
 from typing import Optional
 from pydantic import BaseModel
 from app.core.database import get_db
-from app.core.auth import get_current_user, get_optional_user
+from app.core.auth import get_current_user, get_current_user_id, get_optional_user
+from app.core.search_buffer import search_history_buffer
+from app.core.search_engine import search_engine
+from app.core.search_stats import popular_searches
+from app.core.search_suggest import SUGGEST_TOP_K, suggestion_service
 from app.models.menu import MenuItem, Category
 from app.models.user import User, SearchHistory, Favorite
 from app.models.review import Review
@@ -22,24 +26,29 @@ async def search_products(
     db: Session = Depends(get_db)
 ):
     """Search products"""
-    query = db.query(MenuItem).filter(
-        MenuItem.is_available == True,
-        or_(
-            MenuItem.name.ilike(f"%{q}%"),
-            MenuItem.description.ilike(f"%{q}%")
-        )
-    )
-    
+    category_id = None
     if category:
         cat = db.query(Category).filter(
             or_(Category.id == category, Category.name.ilike(f"%{category}%"))
         ).first()
         if cat:
-            query = query.filter(MenuItem.category_id == cat.id)
+            category_id = cat.id
     
-    total = query.count()
     offset = (page - 1) * limit
-    products = query.offset(offset).limit(limit).all()
+    total, product_ids = search_engine.search(
+        db, q, category_id=category_id, limit=limit, offset=offset
+    )
+    
+    # Load the ranked page in one query and keep the engine's ordering
+    products_by_id = {}
+    if product_ids:
+        products_by_id = {
+            product.id: product
+            for product in db.query(MenuItem).options(joinedload(MenuItem.category)).filter(
+                MenuItem.id.in_(product_ids)
+            ).all()
+        }
+    products = [products_by_id[pid] for pid in product_ids if pid in products_by_id]
     
     # Get user favorites if authenticated
     favorite_ids = set()
@@ -47,20 +56,29 @@ async def search_products(
         favorites = db.query(Favorite).filter(Favorite.user_id == current_user.id).all()
         favorite_ids = {fav.product_id for fav in favorites}
     
+    # Review stats for the whole page in one grouped query
+    review_stats = {}
+    if product_ids:
+        review_stats = {
+            row.product_id: (row.avg_rating, row.reviews_count)
+            for row in db.query(
+                Review.product_id,
+                func.avg(Review.rating).label("avg_rating"),
+                func.count(Review.id).label("reviews_count")
+            ).filter(Review.product_id.in_(product_ids)).group_by(Review.product_id)
+        }
+    
     products_list = []
     for product in products:
-        reviews = db.query(Review).filter(Review.product_id == product.id).all()
-        rating = 0.0
-        if reviews:
-            rating = sum(r.rating for r in reviews) / len(reviews)
+        avg_rating, reviews_count = review_stats.get(product.id, (0.0, 0))
         
         products_list.append({
             "id": product.id,
             "name": product.name,
             "price": product.price,
             "image": product.image,
-            "rating": round(rating, 1),
-            "reviewsCount": len(reviews),
+            "rating": round(float(avg_rating or 0.0), 1),
+            "reviewsCount": reviews_count,
             "category": product.category.name if product.category else ""
         })
     
@@ -74,6 +92,15 @@ async def search_products(
         }
     }
 
+@router.get("/suggest")
+def suggest_searches(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(8, ge=1, le=SUGGEST_TOP_K),
+    db: Session = Depends(get_db)
+):
+    """Typeahead suggestions from product names, categories and popular searches"""
+    return {"suggestions": suggestion_service.suggest(db, q, limit)}
+
 @router.get("/search/recent")
 async def get_recent_searches(
     current_user: User = Depends(get_current_user),
@@ -84,47 +111,31 @@ async def get_recent_searches(
         SearchHistory.user_id == current_user.id
     ).order_by(SearchHistory.created_at.desc()).limit(10).all()
     
-    # Get unique queries
+    # Get unique queries, including searches still waiting in the write buffer
     unique_queries = []
     seen = set()
-    for search in searches:
-        if search.query not in seen:
-            unique_queries.append(search.query)
-            seen.add(search.query)
+    for query in search_history_buffer.pending_for(current_user.id) + [search.query for search in searches]:
+        if query not in seen:
+            unique_queries.append(query)
+            seen.add(query)
     
     return {"searches": unique_queries[:10]}
 
 @router.get("/search/popular")
 async def get_popular_searches(db: Session = Depends(get_db)):
     """Get popular searches"""
-    # Get most searched queries
-    popular = db.query(
-        SearchHistory.query,
-        func.count(SearchHistory.id).label('count')
-    ).group_by(SearchHistory.query).order_by(
-        func.count(SearchHistory.id).desc()
-    ).limit(10).all()
-    
+    # Served from the cached, time-decayed daily counters instead of grouping all history
     return {
-        "searches": [item[0] for item in popular]
+        "searches": popular_searches.top(db, 10)
     }
 
 @router.post("/search/history")
 async def save_search_history(
     query: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: str = Depends(get_current_user_id)
 ):
     """Save search history"""
-    from app.core.security import generate_uuid
-    
-    search_history = SearchHistory(
-        id=generate_uuid(),
-        user_id=current_user.id,
-        query=query
-    )
-    db.add(search_history)
-    db.commit()
+    # Queued and written in batches by the background writer, which drops rows of deleted users; no database work here
+    search_history_buffer.add(user_id, query)
     
     return {"message": "Search saved successfully"}
-
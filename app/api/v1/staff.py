@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import uuid
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.staff import Staff, StaffRole, StaffStatus
 from app.models.role import Role
 from app.schemas.staff import StaffCreate, StaffUpdate, StaffResponse
@@ -99,7 +99,7 @@ def get_staff(
     status: Optional[StaffStatus] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all staff with optional filters"""
     query = db.query(Staff)
@@ -119,7 +119,7 @@ def get_staff(
     return staff_list
 
 @router.get("/{staff_id}", response_model=StaffResponse)
-def get_staff_member(staff_id: str, db: Session = Depends(get_db)):
+def get_staff_member(staff_id: str, db: Session = Depends(get_read_db)):
     """Get staff member by ID"""
     staff = db.query(Staff).filter(Staff.id == staff_id).first()
     if not staff:
@@ -3,13 +3,19 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timedelta
 import uuid
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.exports import EXPORT_BATCH_SIZE, EXPORT_FORMAT_PATTERN, export_response
 from app.models.transaction import Transaction, TransactionStatus, PaymentMethod
 from app.models.order import Order
 from app.schemas.transaction import TransactionCreate, TransactionResponse
 
 router = APIRouter()
 
+TRANSACTION_EXPORT_COLUMNS = [
+    "id", "order_id", "order_number", "amount", "payment_method", "status",
+    "transaction_id", "branch", "created_at"
+]
+
 @router.post("/", response_model=TransactionResponse)
 def create_transaction(transaction_data: TransactionCreate, db: Session = Depends(get_db)):
     """Create a new transaction"""
@@ -26,7 +32,7 @@ def create_transaction(transaction_data: TransactionCreate, db: Session = Depend
     db.add(transaction)
     db.commit()
     db.refresh(transaction)
-    return format_transaction_response(transaction, db)
+    return format_transaction_response(transaction, order.order_number)
 
 @router.get("/", response_model=List[TransactionResponse])
 def get_transactions(
@@ -37,11 +43,51 @@ def get_transactions(
     end_date: Optional[datetime] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all transactions with optional filters"""
-    query = db.query(Transaction)
+    query = filter_transactions(
+        transaction_rows(db), status, payment_method, branch, start_date, end_date
+    )
     
+    rows = query.order_by(Transaction.created_at.desc()).offset(skip).limit(limit).all()
+    return [format_transaction_response(t, order_number) for t, order_number in rows]
+
+@router.get("/export")
+def export_transactions(
+    format: str = Query("csv", pattern=EXPORT_FORMAT_PATTERN),
+    status: Optional[TransactionStatus] = Query(None),
+    payment_method: Optional[PaymentMethod] = Query(None),
+    branch: Optional[str] = Query(None),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None)
+):
+    """Stream filtered transactions as CSV or NDJSON, oldest first"""
+    def rows(db: Session):
+        query = db.query(
+            Transaction.id, Transaction.order_id, Order.order_number, Transaction.amount,
+            Transaction.payment_method, Transaction.status, Transaction.transaction_id,
+            Transaction.branch, Transaction.created_at
+        ).outerjoin(Order, Order.id == Transaction.order_id)
+        return stream_transactions(
+            filter_transactions(query, status, payment_method, branch, start_date, end_date)
+        )
+
+    return export_response(format, "transactions", TRANSACTION_EXPORT_COLUMNS, rows)
+
+def transaction_rows(db: Session):
+    """Transactions with their order number, joined in the same query"""
+    return db.query(Transaction, Order.order_number).outerjoin(Order, Order.id == Transaction.order_id)
+
+def filter_transactions(
+    query,
+    status: Optional[str] = None,
+    payment_method: Optional[str] = None,
+    branch: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+):
+    """Apply the listing filters; date bounds are inclusive"""
     if status:
         query = query.filter(Transaction.status == status)
     if payment_method:
@@ -52,25 +98,26 @@ def get_transactions(
         query = query.filter(Transaction.created_at >= start_date)
     if end_date:
         query = query.filter(Transaction.created_at <= end_date)
-    
-    transactions = query.order_by(Transaction.created_at.desc()).offset(skip).limit(limit).all()
-    return [format_transaction_response(t, db) for t in transactions]
+    return query
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
-def get_transaction(transaction_id: str, db: Session = Depends(get_db)):
+def get_transaction(transaction_id: str, db: Session = Depends(get_read_db)):
     """Get transaction by ID"""
-    transaction = db.query(Transaction).filter(Transaction.id == transaction_id).first()
-    if not transaction:
+    row = transaction_rows(db).filter(Transaction.id == transaction_id).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Transaction not found")
-    return format_transaction_response(transaction, db)
+    return format_transaction_response(*row)
+
+def stream_transactions(query, batch_size: int = EXPORT_BATCH_SIZE):
+    """Iterate filtered rows oldest first through a server-side cursor, batch_size rows in memory at a time"""
+    return query.order_by(Transaction.created_at, Transaction.id).yield_per(batch_size)
 
-def format_transaction_response(transaction: Transaction, db: Session) -> TransactionResponse:
+def format_transaction_response(transaction: Transaction, order_number: Optional[str]) -> TransactionResponse:
     """Format transaction response with order number"""
-    order = db.query(Order).filter(Order.id == transaction.order_id).first()
     return TransactionResponse(
         id=transaction.id,
         order_id=transaction.order_id,
-        order_number=order.order_number if order else "N/A",
+        order_number=order_number or "N/A",
         amount=transaction.amount,
         payment_method=transaction.payment_method,
         status=transaction.status,
@@ -47,6 +47,32 @@ async def get_current_user(
     
     return user
 
+async def get_current_user_id(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+) -> str:
+    """Get the authenticated user's id from the token without touching the database.
+
+    The user may no longer exist: only use it where writes referencing a deleted
+    user fail on the foreign key and are dropped (e.g. the search history buffer).
+    """
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    payload = verify_token(credentials.credentials)
+    user_id: Optional[str] = payload.get("sub") if payload else None
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return user_id
+
 async def get_current_admin_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -0,0 +1,342 @@
+import hashlib
+import json
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.orm import Session, joinedload
+from app.core.security import generate_uuid
+from app.models.menu import MenuItem
+from app.models.user import CartItem, CartTotals
+
+# Constants for fees
+DELIVERY_FEE = 100.0
+PLATFORM_FEE = 8.0
+GST_RATE = 0.18  # 18% GST
+
+@lru_cache(maxsize=4096)
+def _decode_json_text(raw: str) -> Any:
+    return json.loads(raw)
+
+def decode_json(raw: Any, default: Any) -> Any:
+    """Decode a JSON text column, caching the parsed value per distinct string.
+
+    Callers must treat the result as read-only since it is shared.
+    """
+    if not raw:
+        return default
+    if not isinstance(raw, str):
+        return raw
+    try:
+        return _decode_json_text(raw)
+    except (TypeError, ValueError):
+        return default
+
+def add_ons_total(add_ons: Any) -> float:
+    """Price of a line's add-ons per unit (price * quantity of each add-on)"""
+    add_ons_data = decode_json(add_ons, [])
+    total = 0.0
+    if isinstance(add_ons_data, list):
+        for addon in add_ons_data:
+            if isinstance(addon, dict):
+                try:
+                    total += float(addon.get("price", 0.0) or 0.0) * (addon.get("quantity", 1) or 1)
+                except (TypeError, ValueError):
+                    pass
+    return total
+
+def line_total(item: CartItem) -> float:
+    """Total of one cart line from its price snapshot"""
+    return ((item.unit_price or 0.0) + (item.add_ons_total or 0.0)) * (item.quantity or 0)
+
+def _canonical(value: Any) -> Any:
+    """Normalized customization / add-on JSON: sorted keys, trimmed strings, no empty values"""
+    if isinstance(value, dict):
+        normalized = {}
+        for key in sorted(value, key=str):
+            item = _canonical(value[key])
+            if item is not None and item != "" and item != [] and item != {}:
+                normalized[str(key)] = item
+        return normalized
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def line_key(product_id: str, customizations: Any, add_ons: Any) -> str:
+    """Canonical hash identifying a cart line: same product, customizations and add-ons"""
+    add_ons_data = decode_json(add_ons, [])
+    if not isinstance(add_ons_data, list):
+        add_ons_data = []
+    canonical = {
+        "product": product_id,
+        "customizations": _canonical(decode_json(customizations, {})),
+        # The order add-ons were picked in doesn't make a different line
+        "addOns": sorted(
+            (_canonical(addon) for addon in add_ons_data),
+            key=lambda addon: json.dumps(addon, sort_keys=True, default=str)
+        )
+    }
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+def build_totals(subtotal: float, promo_discount: float = 0.0) -> Dict:
+    """Fees, GST and total for a cart subtotal"""
+    delivery_fee = DELIVERY_FEE
+    platform_fee = PLATFORM_FEE
+    gst = (subtotal + delivery_fee + platform_fee - promo_discount) * GST_RATE
+    total = subtotal + delivery_fee + platform_fee + gst - promo_discount
+
+    return {
+        "subtotal": round(subtotal, 2),
+        "deliveryFee": round(delivery_fee, 2),
+        "platformFee": round(platform_fee, 2),
+        "gst": round(gst, 2),
+        "total": round(total, 2),
+        "promoDiscount": round(promo_discount, 2)
+    }
+
+def totals_response(record: CartTotals, promo_discount: float = 0.0) -> Dict:
+    """Response totals from the cached record"""
+    if not promo_discount:
+        return {
+            "subtotal": round(record.subtotal or 0.0, 2),
+            "deliveryFee": round(record.delivery_fee or 0.0, 2),
+            "platformFee": round(record.platform_fee or 0.0, 2),
+            "gst": round(record.gst or 0.0, 2),
+            "total": round(record.total or 0.0, 2),
+            "promoDiscount": 0.0
+        }
+    return build_totals(record.subtotal or 0.0, promo_discount)
+
+def _store(record: CartTotals, item_count: int, items_subtotal: float, add_ons_sum: float):
+    if item_count <= 0:
+        # Reset exactly so floating point drift can't survive an emptied cart
+        item_count, items_subtotal, add_ons_sum = 0, 0.0, 0.0
+    totals = build_totals(items_subtotal + add_ons_sum)
+    record.item_count = item_count
+    record.items_subtotal = round(items_subtotal, 2)
+    record.add_ons_total = round(add_ons_sum, 2)
+    record.subtotal = totals["subtotal"]
+    record.delivery_fee = totals["deliveryFee"]
+    record.platform_fee = totals["platformFee"]
+    record.gst = totals["gst"]
+    record.total = totals["total"]
+    record.is_stale = False
+
+def load_cart_items(db: Session, user_id: str, refresh: bool = False) -> List[CartItem]:
+    """Cart lines with their products, in one query.
+
+    refresh overwrites lines already in the session, e.g. after upserts.
+    """
+    query = db.query(CartItem).options(joinedload(CartItem.product)).filter(
+        CartItem.user_id == user_id
+    ).order_by(CartItem.created_at)
+    if refresh:
+        query = query.populate_existing()
+    return query.all()
+
+def _get_record(db: Session, user_id: str, lock: bool = False) -> Optional[CartTotals]:
+    query = db.query(CartTotals).filter(CartTotals.user_id == user_id)
+    if lock:
+        query = query.with_for_update()
+    return query.first()
+
+def recompute_cart_totals(db: Session, user_id: str, items: Optional[List[CartItem]] = None) -> CartTotals:
+    """Re-derive the cached totals from the cart lines and current product prices"""
+    if items is None:
+        items = load_cart_items(db, user_id)
+
+    item_count = 0
+    items_subtotal = 0.0
+    add_ons_sum = 0.0
+    for item in items:
+        product = item.product
+        if not product:
+            continue
+        if item.unit_price != product.price:
+            item.unit_price = product.price
+        line_add_ons = add_ons_total(item.add_ons)
+        if item.add_ons_total != line_add_ons:
+            item.add_ons_total = line_add_ons
+        item_count += 1
+        items_subtotal += product.price * item.quantity
+        add_ons_sum += line_add_ons * item.quantity
+
+    record = _get_record(db, user_id, lock=True)
+    if record is None:
+        record = CartTotals(id=generate_uuid(), user_id=user_id)
+        db.add(record)
+    _store(record, item_count, items_subtotal, add_ons_sum)
+    return record
+
+def apply_cart_change(
+    db: Session,
+    user_id: str,
+    item_delta: int = 0,
+    subtotal_delta: float = 0.0,
+    add_ons_delta: float = 0.0
+) -> CartTotals:
+    """Apply one line's change to the cached totals; call after the line change is flushed"""
+    record = _get_record(db, user_id, lock=True)
+    if record is None or record.is_stale:
+        db.flush()
+        return recompute_cart_totals(db, user_id)
+    _store(
+        record,
+        (record.item_count or 0) + item_delta,
+        (record.items_subtotal or 0.0) + subtotal_delta,
+        (record.add_ons_total or 0.0) + add_ons_delta
+    )
+    return record
+
+def line_added(db: Session, item: CartItem) -> CartTotals:
+    """Account for a new cart line"""
+    return apply_cart_change(
+        db, item.user_id, 1, (item.unit_price or 0.0) * item.quantity, (item.add_ons_total or 0.0) * item.quantity
+    )
+
+def line_removed(db: Session, item: CartItem) -> CartTotals:
+    """Account for a deleted cart line; call after the delete is flushed"""
+    if item.unit_price is None:
+        db.flush()
+        return recompute_cart_totals(db, item.user_id)
+    return apply_cart_change(
+        db, item.user_id, -1, -item.unit_price * item.quantity, -(item.add_ons_total or 0.0) * item.quantity
+    )
+
+def line_quantity_changed(db: Session, item: CartItem, old_quantity: int) -> CartTotals:
+    """Account for a quantity change on an existing cart line"""
+    if item.unit_price is None:
+        db.flush()
+        return recompute_cart_totals(db, item.user_id)
+    difference = item.quantity - old_quantity
+    return apply_cart_change(
+        db, item.user_id, 0, item.unit_price * difference, (item.add_ons_total or 0.0) * difference
+    )
+
+def upsert_cart_line(
+    db: Session,
+    user_id: str,
+    product: MenuItem,
+    quantity: int,
+    customizations: Optional[Dict] = None,
+    add_ons: Optional[List[Dict]] = None
+) -> Tuple[str, bool]:
+    """Insert a cart line or bump the quantity of the identical one; returns (line_key, created).
+
+    A single upsert on (user_id, line_key), so concurrent adds of the same line
+    can't create duplicates. Does not touch the cached cart totals.
+    """
+    key = line_key(product.id, customizations, add_ons)
+    row = {
+        "id": generate_uuid(),
+        "user_id": user_id,
+        "product_id": product.id,
+        "quantity": quantity,
+        "customizations": json.dumps(customizations) if customizations else None,
+        "add_ons": json.dumps(add_ons) if add_ons else None,
+        "line_key": key,
+        "unit_price": product.price,
+        "add_ons_total": add_ons_total(add_ons)
+    }
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        statement = insert(CartItem).values(row)
+        line_id = db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[CartItem.user_id, CartItem.line_key],
+                set_={"quantity": CartItem.quantity + statement.excluded.quantity, "updated_at": func.now()}
+            ).returning(CartItem.id)
+        ).scalar_one()
+        created = line_id == row["id"]
+    elif dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        statement = insert(CartItem).values(row)
+        result = db.execute(
+            statement.on_duplicate_key_update(
+                quantity=CartItem.quantity + statement.inserted.quantity,
+                updated_at=func.now()
+            )
+        )
+        # MySQL reports 1 affected row for an insert and 2 for an update
+        created = result.rowcount == 1
+    else:
+        existing = db.query(CartItem).filter(
+            CartItem.user_id == user_id,
+            CartItem.line_key == key
+        ).with_for_update().first()
+        if existing is not None:
+            existing.quantity = (existing.quantity or 0) + quantity
+        else:
+            db.add(CartItem(**row))
+        db.flush()
+        created = existing is None
+    return key, created
+
+def add_cart_line(
+    db: Session,
+    user_id: str,
+    product: MenuItem,
+    quantity: int,
+    customizations: Optional[Dict] = None,
+    add_ons: Optional[List[Dict]] = None
+) -> Tuple[CartItem, bool]:
+    """Add to the cart (merging identical lines) and update the cached totals; returns (line, created)"""
+    key, created = upsert_cart_line(db, user_id, product, quantity, customizations, add_ons)
+    item = db.query(CartItem).options(joinedload(CartItem.product)).filter(
+        CartItem.user_id == user_id,
+        CartItem.line_key == key
+    ).populate_existing().one()
+    apply_cart_change(
+        db, user_id, 1 if created else 0, product.price * quantity, (item.add_ons_total or 0.0) * quantity
+    )
+    return item, created
+
+def get_cart_totals(db: Session, user_id: str, items: Optional[List[CartItem]] = None) -> CartTotals:
+    """Cached totals, recomputed only when missing, stale or out of step with the lines.
+
+    When the caller already loaded the lines (with products), they are used to
+    verify the snapshot: same number of lines and unchanged product prices.
+    """
+    record = _get_record(db, user_id)
+    if record is None or record.is_stale:
+        return recompute_cart_totals(db, user_id, items)
+
+    if items is not None:
+        live_items = [item for item in items if item.product]
+        if len(live_items) != (record.item_count or 0) or any(
+            item.unit_price != item.product.price for item in live_items
+        ):
+            return recompute_cart_totals(db, user_id, items)
+    return record
+
+def reset_cart_totals(db: Session, user_id: str):
+    """Zero the cached totals after the cart was cleared"""
+    record = _get_record(db, user_id, lock=True)
+    if record is not None:
+        _store(record, 0, 0.0, 0.0)
+
+def _mark_carts_stale(connection, product_id: str):
+    connection.execute(
+        update(CartTotals).where(
+            CartTotals.user_id.in_(select(CartItem.user_id).where(CartItem.product_id == product_id))
+        ).values(is_stale=True)
+    )
+
+@event.listens_for(MenuItem, "after_update")
+def _product_price_changed(mapper, connection, target):
+    if inspect(target).attrs.price.history.has_changes():
+        _mark_carts_stale(connection, target.id)
+
+@event.listens_for(MenuItem, "after_delete")
+def _product_deleted(mapper, connection, target):
+    _mark_carts_stale(connection, target.id)
@@ -80,7 +80,68 @@ class Settings(BaseSettings):
     LOCATION_CACHE_ENABLED: bool = True  # Enable caching for location requests
     LOCATION_CACHE_TTL: int = 3600  # Cache TTL in seconds (1 hour)
     LOCATION_RATE_LIMIT: int = 100  # Requests per minute per IP
-    
+
+    # Product Search Settings
+    SEARCH_BACKEND: str = "auto"  # 'auto', 'postgres' (tsvector + GIN), 'memory' (inverted index)
+    SEARCH_INDEX_REFRESH_SECONDS: int = 60  # How often the in-memory index checks the catalog for changes
+    SUGGEST_REFRESH_SECONDS: int = 300  # How often typeahead suggestions reload popular searches
+    SUGGEST_POPULAR_QUERIES: int = 500  # Number of popular searches offered as suggestions
+    POPULAR_SEARCH_WINDOW_DAYS: int = 30  # Daily search counters older than this are ignored and compacted
+    POPULAR_SEARCH_HALF_LIFE_DAYS: float = 7.0  # A day's searches count half as much after this many days
+    POPULAR_SEARCH_REFRESH_SECONDS: int = 60  # How often the cached popular searches are recomputed
+    SEARCH_HISTORY_RETENTION_DAYS: int = 90  # Raw per-user search history kept for "recent searches"
+    SEARCH_HISTORY_FLUSH_SECONDS: float = 2.0  # Max time a saved search waits in memory before being written
+    SEARCH_HISTORY_BATCH_SIZE: int = 500  # Queued searches that trigger an early flush (rows per insert)
+    SEARCH_HISTORY_MAX_PENDING: int = 10000  # Backpressure: further searches are dropped beyond this
+    SEARCH_HISTORY_DEDUPE_SECONDS: float = 30.0  # Same user + same query within this window is saved once
+
+    # Database Pool Settings
+    DB_POOL_SIZE: int = 10  # Connections kept open per worker
+    DB_MAX_OVERFLOW: int = 20  # Extra connections allowed under bursts (closed when returned)
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds a request waits for a free connection before failing
+    DB_POOL_RECYCLE: int = 1800  # Reconnect connections older than this (keep below server/proxy idle timeouts)
+    DB_POOL_PRE_PING: bool = False  # Ping on every checkout (one extra round trip); recycling covers liveness
+    DB_POOL_WARMUP_CONNECTIONS: int = 2  # Connections opened at startup so first requests don't pay for connecting
+    SQLITE_JOURNAL_MODE: str = "WAL"  # Readers don't block the writer
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # Safe with WAL; fsync at checkpoints instead of every commit
+    SQLITE_MMAP_SIZE: int = 268435456  # Bytes of the database file read through mmap (256 MB)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait for a lock instead of failing with "database is locked"
+
+    # Read Replica Settings
+    DATABASE_REPLICA_URLS: Optional[str] = None  # Comma-separated replica URLs for read-only endpoints
+    REPLICA_STICKY_SECONDS: float = 5.0  # After a caller's own write, their reads use the primary this long
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # PostgreSQL replicas further behind than this are skipped
+    REPLICA_LAG_CHECK_SECONDS: float = 2.0  # How often a replica's lag is measured
+    REPLICA_RETRY_SECONDS: float = 30.0  # A replica that failed to connect is skipped this long
+
+    # Logging Settings
+    LOG_LEVEL: str = "INFO"  # Root level
+    LOG_LEVELS: Optional[str] = None  # Per-module overrides, e.g. "app.core.sms=DEBUG,sqlalchemy.engine=WARNING"
+    LOG_FORMAT: str = "json"  # "json" (one object per line) or "text"
+    LOG_SAMPLE_RATE: float = 0.01  # Share of high-volume debug events (logged with extra=SAMPLED) that are kept
+
+    # Metrics Settings
+    METRICS_ENABLED: bool = True  # Record per-route latency/size/DB histograms and serve them at /metrics
+    SLOW_QUERY_MS: float = 200.0  # Statements slower than this are logged with their route
+    QUERY_N_PLUS_ONE_DETECTION: bool = False  # Dev/test: log requests repeating a statement shape (needs METRICS_ENABLED)
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 5  # Repetitions of one statement shape in a request that count as N+1
+
+    # Promo Code Settings
+    PROMO_CACHE_REFRESH_SECONDS: int = 30  # How often cached promo codes are reloaded (changes made in-process apply at once)
+
+    # Loyalty Settings
+    LOYALTY_ACCRUAL_ENABLED: bool = True  # Award points when an order is delivered
+    LOYALTY_SPEND_PER_POINT: float = 100.0  # Order total (Rs.) that earns one point
+    LOYALTY_MIN_ORDER_TOTAL: float = 0.0  # Orders below this total earn nothing
+    LOYALTY_MAX_POINTS_PER_ORDER: int = 0  # Cap per order (0 = no cap)
+    LOYALTY_ACCRUAL_FLUSH_SECONDS: float = 1.0  # Max time a delivered order waits before its points are written
+    LOYALTY_ACCRUAL_BATCH_SIZE: int = 200  # Delivered orders accrued per transaction
+
+    @property
+    def replica_urls(self) -> List[str]:
+        """Read replica URLs from DATABASE_REPLICA_URLS"""
+        return [url.strip() for url in (self.DATABASE_REPLICA_URLS or "").split(",") if url.strip()]
+
     @property
     def database_host(self) -> str:
         """Get database host - Railway MYSQLHOST takes priority"""
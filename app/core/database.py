@@ -1,14 +1,24 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, object_session, sessionmaker
+from starlette.requests import Request
+from typing import Dict, List, Optional, Tuple
 from app.core.config import settings
+from app.core.db_pool import InstrumentedQueuePool, instrument_pool_events, pool_stats
+from app.core.resources import resources
+from app.core.security import verify_token
+import logging
 import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 # Database connection - supports PostgreSQL, MySQL and SQLite with fallback
 def create_database_engine():
     """Create database engine with support for PostgreSQL, MySQL, and SQLite"""
     database_url = settings.database_url
-    print(f"DATABASE: Initial database_url from settings: {database_url}")
 
     # Force SQLite only when no explicit database config exists anywhere.
     # IMPORTANT: settings.database_url may come from .env (not process env), so
@@ -20,55 +30,64 @@ def create_database_engine():
         not os.getenv('POSTGRES_HOST') and
         not os.getenv('DATABASE_URL')):
         database_url = "sqlite:///./shawarma_local.db"
-        print("INFO: Using SQLite for local development")
-    print(f"DATABASE: Final database_url: {database_url}")
+        logger.info("Using SQLite for local development")
+    logger.info(f"Database: {make_url(database_url).render_as_string(hide_password=True)}")
 
     # Try to create engine
     try:
-        if database_url.startswith('sqlite'):
-            # SQLite configuration
-            engine = create_engine(
-                database_url,
-                connect_args={"check_same_thread": False},  # Required for SQLite
-                echo=False
-            )
-        elif database_url.startswith('postgresql'):
-            # PostgreSQL connection with proper settings
-            engine = create_engine(
-                database_url,
-                pool_pre_ping=True,  # Verify connections before using
-                pool_recycle=3600,   # Recycle connections after 1 hour
-                echo=False,          # Set to True for SQL query logging
-                # PostgreSQL-specific settings
-                pool_size=10,        # Connection pool size
-                max_overflow=20      # Max overflow connections
-            )
-        elif database_url.startswith('mysql'):
-            # MySQL connection with proper settings (for backward compatibility)
-            engine = create_engine(
-                database_url,
-                pool_pre_ping=True,  # Verify connections before using
-                pool_recycle=3600,   # Recycle connections after 1 hour
-                echo=False           # Set to True for SQL query logging
-            )
-        else:
-            # Default configuration for other database types
-            engine = create_engine(
-                database_url,
-                pool_pre_ping=True,
-                pool_recycle=3600,
-                echo=False
-            )
-        return engine
+        return _build_engine(database_url)
     except Exception as e:
-        print(f"WARNING: Failed to create database engine: {e}")
-        print("INFO: Falling back to SQLite database")
+        logger.warning(f"Failed to create database engine, falling back to SQLite: {e}")
         # Fallback to SQLite if connection fails
-        return create_engine(
-            "sqlite:///./shawarma_local.db",
-            connect_args={"check_same_thread": False},
-            echo=False
+        return _build_engine("sqlite:///./shawarma_local.db")
+
+def _pool_options() -> dict:
+    """Pool sizing from settings; liveness comes from recycling unless DB_POOL_PRE_PING is on"""
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_use_lifo": True  # Reuse warm connections; idle extras age out via recycle
+    }
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    finally:
+        cursor.close()
+
+def _build_engine(database_url: str):
+    if database_url.startswith('sqlite'):
+        in_memory = database_url.rstrip('/') in ('sqlite:', 'sqlite:/', 'sqlite://') or ':memory:' in database_url
+        if in_memory:
+            # One shared in-memory database: no pool sizing, no file pragmas
+            return create_engine(database_url, connect_args={"check_same_thread": False}, echo=False)
+        # SQLite configuration: a connection per thread from the pool, WAL so readers don't block the writer
+        engine = create_engine(
+            database_url,
+            connect_args={"check_same_thread": False},  # Required for SQLite
+            echo=False,
+            **_pool_options()
         )
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    elif database_url.startswith('postgresql'):
+        # PostgreSQL connection with pool settings from DB_POOL_*
+        engine = create_engine(database_url, echo=False, **_pool_options())
+    elif database_url.startswith('mysql'):
+        # MySQL connection (for backward compatibility); recycle below the server's wait_timeout
+        engine = create_engine(database_url, echo=False, **_pool_options())
+    else:
+        # Default configuration for other database types
+        engine = create_engine(database_url, pool_pre_ping=True, pool_recycle=settings.DB_POOL_RECYCLE, echo=False)
+    instrument_pool_events(engine)
+    return engine
 
 engine = create_database_engine()
 
@@ -76,10 +95,202 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
-def get_db():
+def get_db(request: Request = None):
     db = SessionLocal()
+    if request is not None:
+        # Commits through this session make the caller's reads sticky to the primary
+        db.info["request"] = request
     try:
         yield db
     finally:
         db.close()
 
+def warm_up_pool(connections: int = settings.DB_POOL_WARMUP_CONNECTIONS, target=None):
+    """Open pool connections up front so the first requests don't pay for connecting"""
+    target = target or engine
+    opened = []
+    try:
+        for _ in range(max(connections, 1)):
+            connection = target.connect()
+            opened.append(connection)
+            connection.exec_driver_sql("SELECT 1")
+    finally:
+        for connection in opened:
+            connection.close()
+
+resources.register("database", warmup=warm_up_pool, shutdown=engine.dispose)
+
+# Read replicas
+
+PG_REPLICA_LAG_SQL = (
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+def client_key(request: Request) -> Optional[str]:
+    """Who is asking: the bearer token's user id, else the client address"""
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        payload = verify_token(authorization[7:].strip())
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
+    return f"ip:{request.client.host}" if request.client else None
+
+class ReplicaRouter:
+    """Routes read-only sessions to healthy replicas, round robin.
+
+    A caller whose own write committed less than REPLICA_STICKY_SECONDS ago
+    reads from the primary (read-your-writes, tracked per process). A replica
+    that fails to connect is skipped for REPLICA_RETRY_SECONDS, and a PostgreSQL
+    replica lagging more than REPLICA_MAX_LAG_SECONDS is skipped until its next
+    lag check; with no usable replica, reads go to the primary.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.engines = [_build_engine(url) for url in urls]
+        self._lock = threading.Lock()
+        self._next = 0
+        self._down_until: Dict[int, float] = {}
+        self._lag: Dict[int, Tuple[float, float]] = {}  # replica -> (checked_at, lag seconds)
+        self._sticky: Dict[str, float] = {}
+        self.reads = {"replica": 0, "primary": 0, "sticky": 0, "failover": 0}
+
+    def mark_write(self, key: Optional[str]):
+        if not key or not self.engines:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._sticky[key] = now + settings.REPLICA_STICKY_SECONDS
+            if len(self._sticky) > 10000:
+                self._sticky = {k: until for k, until in self._sticky.items() if until > now}
+
+    def is_sticky(self, key: Optional[str]) -> bool:
+        if not key:
+            return False
+        until = self._sticky.get(key)
+        return until is not None and until > time.monotonic()
+
+    def mark_down(self, index: int, reason: str):
+        with self._lock:
+            self._down_until[index] = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+        logger.warning(f"Read replica {index} unavailable, reading from the primary: {reason}")
+
+    def _candidates(self) -> List[int]:
+        now = time.monotonic()
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self.engines)
+        order = [(start + offset) % len(self.engines) for offset in range(len(self.engines))]
+        return [index for index in order if self._down_until.get(index, 0) <= now]
+
+    def _lag_ok(self, index: int, db: Session) -> bool:
+        if self.engines[index].dialect.name != "postgresql":
+            return True
+        now = time.monotonic()
+        checked_at, lag = self._lag.get(index, (0.0, 0.0))
+        if now - checked_at >= settings.REPLICA_LAG_CHECK_SECONDS:
+            lag = float(db.connection().exec_driver_sql(PG_REPLICA_LAG_SQL).scalar() or 0)
+            self._lag[index] = (now, lag)
+        if lag > settings.REPLICA_MAX_LAG_SECONDS:
+            logger.warning(f"Read replica {index} is {lag:.1f}s behind, reading from the primary")
+            return False
+        return True
+
+    def session(self, request: Optional[Request] = None) -> Session:
+        """A session for reads: on a replica when one is usable, else on the primary"""
+        if not self.engines:
+            return SessionLocal()
+        if request is not None and self.is_sticky(client_key(request)):
+            self.reads["sticky"] += 1
+            return SessionLocal()
+
+        for index in self._candidates():
+            db = SessionLocal(bind=self.engines[index])
+            try:
+                db.connection()  # Connect now, so a dead replica fails over instead of failing the request
+                if self._lag_ok(index, db):
+                    db.info["replica"] = index
+                    self.reads["replica"] += 1
+                    return db
+            except Exception as e:
+                self.mark_down(index, str(e).splitlines()[0])
+            db.close()
+
+        self.reads["failover"] += 1
+        return SessionLocal()
+
+    def warm_up(self):
+        for index, replica in enumerate(self.engines):
+            try:
+                warm_up_pool(target=replica)
+            except Exception as e:
+                self.mark_down(index, str(e).splitlines()[0])
+
+    def dispose(self):
+        for replica in self.engines:
+            replica.dispose()
+
+    def status(self) -> Dict:
+        now = time.monotonic()
+        return {
+            "replicas": [
+                {
+                    "index": index,
+                    "dialect": replica.dialect.name,
+                    "available": self._down_until.get(index, 0) <= now,
+                    "lagSeconds": self._lag.get(index, (0.0, None))[1],
+                    "pool": pool_stats(replica)
+                }
+                for index, replica in enumerate(self.engines)
+            ],
+            "reads": dict(self.reads)
+        }
+
+replica_router = ReplicaRouter(settings.replica_urls)
+
+if replica_router.engines:
+    resources.register("database-replicas", warmup=replica_router.warm_up, shutdown=replica_router.dispose)
+
+def get_read_db(request: Request = None):
+    """Session for read-only endpoints (GET listings, stats): served by a replica when configured"""
+    db = replica_router.session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+def _track_primary_write(session):
+    request = session.info.get("request")
+    if request is not None and replica_router.engines and session.get_bind() is engine:
+        replica_router.mark_write(client_key(request))
+
+event.listen(Session, "after_commit", _track_primary_write)
+
+
+def on_committed_changes(model, callback, when=None):
+    """Call callback(ids) with the ids of model rows inserted, updated or deleted by each committed session.
+
+    when(target), if given, limits tracking to rows it returns True for.
+    """
+    key = f"committed_changes:{model.__tablename__}:{id(callback)}"
+
+    def track(mapper, connection, target):
+        if when is not None and not when(target):
+            return
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault(key, set()).add(target.id)
+
+    for event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(model, event_name, track)
+
+    def after_commit(session):
+        ids = session.info.pop(key, None)
+        if ids:
+            callback(ids)
+
+    def after_rollback(session):
+        session.info.pop(key, None)
+
+    event.listen(Session, "after_commit", after_commit)
+    event.listen(Session, "after_rollback", after_rollback)
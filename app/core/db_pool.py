@@ -0,0 +1,103 @@
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+class PoolMetrics:
+    """Checkout counters of an engine's connection pool (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def count_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def count_invalidation(self):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self, pool) -> Dict:
+        """Current pool occupancy plus the counters since startup"""
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "waitSecondsTotal": round(self.wait_seconds_total, 6),
+                "waitSecondsMax": round(self.wait_seconds_max, 6),
+                "waitSecondsAvg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0
+            }
+        stats["poolClass"] = type(pool).__name__
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "size": pool.size(),
+                "checkedOut": pool.checkedout(),
+                "checkedIn": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "maxOverflow": pool._max_overflow
+            })
+        return stats
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times every checkout, including waits for a free connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.observe_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.observe_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics  # engine.dispose() keeps the counters
+        return pool
+
+def instrument_pool_events(engine):
+    """Count new DBAPI connections and invalidated ones on the engine's pool"""
+    def on_connect(dbapi_connection, connection_record):
+        metrics = getattr(engine.pool, "metrics", None)
+        if metrics is not None:
+            metrics.count_connect()
+
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics = getattr(engine.pool, "metrics", None)
+        if metrics is not None:
+            metrics.count_invalidation()
+
+    event.listen(engine, "connect", on_connect)
+    event.listen(engine, "invalidate", on_invalidate)
+
+def pool_stats(engine) -> Dict:
+    """Pool metrics of an engine, or just its pool class when it isn't instrumented"""
+    metrics = getattr(engine.pool, "metrics", None)
+    if metrics is None:
+        return {"poolClass": type(engine.pool).__name__}
+    return metrics.snapshot(engine.pool)
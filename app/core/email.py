@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any
 import logging
+import threading
 from app.core.config import settings
+from app.core.resources import resources
 
 logger = logging.getLogger(__name__)
 
@@ -138,23 +140,28 @@ class MockEmailProvider(EmailProvider):
             logger.info(f"Text: {text_content[:100]}...")
         logger.info(f"HTML: {html_content[:100]}...")
 
-        print(f"📧 MOCK EMAIL to {to_email}")
-        print(f"Subject: {subject}")
-        print(f"Content: {text_content or html_content[:100]}...")
         return True
 
 class EmailService:
-    """Email service manager"""
+    """Email service manager; the provider (and its client) is built on first use"""
 
     def __init__(self):
-        self.provider: Optional[EmailProvider] = None
-        self._initialize_provider()
+        self._provider: Optional[EmailProvider] = None
+        self._lock = threading.Lock()
+
+    @property
+    def provider(self) -> Optional[EmailProvider]:
+        if self._provider is None:
+            with self._lock:
+                if self._provider is None:
+                    self._initialize_provider()
+        return self._provider
 
     def _initialize_provider(self):
         """Initialize email provider based on settings"""
         if not getattr(settings, 'EMAIL_ENABLED', False):
             logger.warning("Email is disabled. Using mock provider for development.")
-            self.provider = MockEmailProvider()
+            self._provider = MockEmailProvider()
             return
 
         provider = getattr(settings, 'EMAIL_PROVIDER', 'smtp').lower()
@@ -162,14 +169,14 @@ class EmailService:
         if provider == "sendgrid":
             if not hasattr(settings, 'SENDGRID_API_KEY'):
                 logger.error("SendGrid API key not configured. Using mock provider.")
-                self.provider = MockEmailProvider()
+                self._provider = MockEmailProvider()
             else:
                 try:
-                    self.provider = SendGridEmailProvider()
+                    self._provider = SendGridEmailProvider()
                     logger.info("SendGrid email provider initialized successfully")
                 except ImportError:
                     logger.error("SendGrid package not installed. Using mock provider.")
-                    self.provider = MockEmailProvider()
+                    self._provider = MockEmailProvider()
         elif provider == "smtp":
             # Check for user-provided credentials or standard SMTP config
             has_user_config = all([
@@ -180,17 +187,17 @@ class EmailService:
 
             if not has_user_config:
                 logger.error("SMTP credentials not configured (EMAIL_HOST/EMAIL_USER/EMAIL_PASS or SMTP_*). Using mock provider.")
-                self.provider = MockEmailProvider()
+                self._provider = MockEmailProvider()
             else:
                 try:
-                    self.provider = SMTPEmailProvider()
+                    self._provider = SMTPEmailProvider()
                     logger.info(f"SMTP email provider initialized successfully for {getattr(settings, 'EMAIL_USER', getattr(settings, 'SMTP_USERNAME', 'unknown'))}")
                 except Exception as e:
                     logger.error(f"SMTP initialization failed: {e}. Using mock provider.")
-                    self.provider = MockEmailProvider()
+                    self._provider = MockEmailProvider()
         else:
             logger.warning(f"Unknown email provider: {provider}. Using mock provider.")
-            self.provider = MockEmailProvider()
+            self._provider = MockEmailProvider()
 
     async def send_email(self, to_email: str, subject: str, html_content: str, text_content: Optional[str] = None) -> bool:
         """Send custom email"""
@@ -302,3 +309,5 @@ class EmailService:
 
 # Global email service instance
 email_service = EmailService()
+
+resources.register("email", warmup=lambda: email_service.provider)
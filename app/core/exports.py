@@ -0,0 +1,102 @@
+import csv
+import enum
+import io
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, Callable, Iterable, Iterator, List, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson"
+}
+EXPORT_FORMAT_PATTERN = "^(csv|ndjson)$"
+EXPORT_BATCH_SIZE = 1000  # Rows fetched per round trip from the server-side cursor
+EXPORT_CHUNK_BYTES = 64 * 1024  # Response chunk size
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return _json_value(value)
+
+def iter_csv(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    """CSV text in chunks of about EXPORT_CHUNK_BYTES, header first"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def iter_ndjson(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    """One JSON object per line, in chunks of about EXPORT_CHUNK_BYTES"""
+    chunk: List[str] = []
+    size = 0
+    for row in rows:
+        line = json.dumps(
+            {column: _json_value(value) for column, value in zip(columns, row)},
+            default=str,
+            separators=(",", ":")
+        ) + "\n"
+        chunk.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_BYTES:
+            yield "".join(chunk)
+            chunk, size = [], 0
+    if chunk:
+        yield "".join(chunk)
+
+def iter_export(
+    fmt: str,
+    columns: Sequence[str],
+    rows_factory: Callable[[Session], Iterable[Sequence[Any]]]
+) -> Iterator[str]:
+    """Run rows_factory on a session owned by the stream and format its rows.
+
+    The session lives exactly as long as the response body, independent of the
+    request's get_db session, and rows_factory should return a column query
+    with yield_per so neither ORM objects nor the full result are held.
+    """
+    formatter = iter_ndjson if fmt == "ndjson" else iter_csv
+    db = SessionLocal()
+    try:
+        yield from formatter(columns, rows_factory(db))
+    except Exception as e:
+        logger.error(f"Export stream failed: {e}")
+        raise
+    finally:
+        db.close()
+
+def export_response(
+    fmt: str,
+    filename: str,
+    columns: Sequence[str],
+    rows_factory: Callable[[Session], Iterable[Sequence[Any]]]
+) -> StreamingResponse:
+    """StreamingResponse for a CSV / NDJSON export"""
+    extension = "ndjson" if fmt == "ndjson" else "csv"
+    return StreamingResponse(
+        iter_export(fmt, columns, rows_factory),
+        media_type=EXPORT_FORMATS.get(fmt, EXPORT_FORMATS["csv"]),
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'}
+    )
@@ -1,10 +1,10 @@
-import requests
 import json
 import time
 import hashlib
 from typing import Dict, Optional, Any, Tuple
 from functools import lru_cache
 from app.core.config import settings
+from app.core.resources import resources
 
 class LocationServiceError(Exception):
     """Custom exception for location service errors"""
@@ -20,6 +20,11 @@ class GoogleMapsService:
         self.cache_ttl = settings.LOCATION_CACHE_TTL
         self.rate_limit = settings.LOCATION_RATE_LIMIT
 
+        # Imported here so the HTTP stack loads with the first location lookup, not at app import
+        import requests
+        self.requests = requests
+        self.http = requests.Session()  # Keep-alive connections to the Maps API
+
         # Simple in-memory cache (in production, use Redis)
         self._cache: Dict[str, Tuple[Any, float]] = {}
 
@@ -56,7 +61,7 @@ class GoogleMapsService:
         params['key'] = self.api_key
 
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
 
             if response.status_code == 200:
                 data = response.json()
@@ -82,11 +87,15 @@ class GoogleMapsService:
             else:
                 raise LocationServiceError(f"HTTP {response.status_code}: {response.text}")
 
-        except requests.RequestException as e:
+        except self.requests.RequestException as e:
             raise LocationServiceError(f"Network error: {str(e)}")
         except json.JSONDecodeError:
             raise LocationServiceError("Invalid response from Google Maps API")
 
+    def close(self):
+        """Close the pooled HTTP connections"""
+        self.http.close()
+
     def reverse_geocode(self, latitude: float, longitude: float) -> Dict[str, Any]:
         """
         Convert coordinates to address (reverse geocoding)
@@ -251,3 +260,16 @@ def get_google_maps_service() -> GoogleMapsService:
     if _google_maps_service is None:
         _google_maps_service = GoogleMapsService()
     return _google_maps_service
+
+def close_google_maps_service():
+    """Drop the service instance and its HTTP connections"""
+    global _google_maps_service
+    if _google_maps_service is not None:
+        _google_maps_service.close()
+        _google_maps_service = None
+
+def _warm_up_google_maps_service():
+    if settings.GOOGLE_MAPS_API_KEY:
+        get_google_maps_service()
+
+resources.register("google-maps", warmup=_warm_up_google_maps_service, shutdown=close_google_maps_service)
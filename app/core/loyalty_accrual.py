@@ -0,0 +1,188 @@
+import logging
+import math
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Iterable, Optional
+
+from sqlalchemy import and_, inspect
+from sqlalchemy.orm import Session, aliased
+from app.core.config import settings
+from app.core.database import SessionLocal, on_committed_changes
+from app.core.resources import resources
+from app.core.loyalty_ledger import earn_points
+from app.core.security import generate_uuid
+from app.models.order import Order
+from app.models.user import LoyaltyPoint
+
+logger = logging.getLogger(__name__)
+
+DELIVERED_STATUSES = ("delivered", "Delivered")
+BACKFILL_CHUNK_SIZE = 1000
+
+def points_for_total(total: Optional[float]) -> int:
+    """Points an order earns, from the LOYALTY_* rules"""
+    total = total or 0.0
+    if total <= 0 or total < settings.LOYALTY_MIN_ORDER_TOTAL or settings.LOYALTY_SPEND_PER_POINT <= 0:
+        return 0
+    points = int(math.floor(total / settings.LOYALTY_SPEND_PER_POINT))
+    if settings.LOYALTY_MAX_POINTS_PER_ORDER > 0:
+        points = min(points, settings.LOYALTY_MAX_POINTS_PER_ORDER)
+    return points
+
+def accrue_orders(db: Session, order_ids: Iterable[str]) -> int:
+    """Write 'earned' entries for delivered orders and credit balances; returns points awarded.
+
+    Idempotent per order: orders that already earned are skipped, and the
+    unique (order_id, type) index settles races between workers. The caller commits.
+    """
+    order_ids = list(set(order_ids))
+    if not order_ids:
+        return 0
+
+    orders = db.query(Order.id, Order.user_id, Order.total, Order.order_number).filter(
+        Order.id.in_(order_ids),
+        Order.user_id.isnot(None),
+        Order.status.in_(DELIVERED_STATUSES)
+    ).all()
+    already_earned = {
+        order_id for (order_id,) in db.query(LoyaltyPoint.order_id).filter(
+            LoyaltyPoint.order_id.in_(order_ids),
+            LoyaltyPoint.type == "earned"
+        )
+    }
+
+    now = datetime.utcnow()
+    rows = []
+    for order in orders:
+        points = points_for_total(order.total)
+        if points <= 0 or order.id in already_earned:
+            continue
+        rows.append({
+            "id": generate_uuid(),
+            "user_id": order.user_id,
+            "points": points,
+            "type": "earned",
+            "description": f"Order {order.order_number or order.id} delivered",
+            "order_id": order.id,
+            "created_at": now
+        })
+    return sum(entry["points"] for entry in earn_points(db, rows))
+
+class LoyaltyAccrualWorker:
+    """Background accrual of loyalty points for delivered orders.
+
+    Order ids are queued when a commit moves an order to delivered and are
+    processed by a daemon thread in batches of LOYALTY_ACCRUAL_BATCH_SIZE, at
+    least every LOYALTY_ACCRUAL_FLUSH_SECONDS. Orders lost to a crash or a failed
+    batch are picked up by backfill_accruals.
+    """
+
+    def __init__(self):
+        self._pending: Deque[str] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def enqueue(self, order_ids: Iterable[str]):
+        if not settings.LOYALTY_ACCRUAL_ENABLED:
+            return
+        with self._lock:
+            self._pending.extend(order_ids)
+            pending = len(self._pending)
+        self._ensure_started()
+        if pending >= settings.LOYALTY_ACCRUAL_BATCH_SIZE:
+            self._wake.set()
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="loyalty-accrual", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(settings.LOYALTY_ACCRUAL_FLUSH_SECONDS)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Loyalty accrual failed: {e}")
+
+    def flush(self) -> int:
+        """Accrue everything queued so far; returns the points awarded"""
+        with self._flush_lock:
+            awarded = 0
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        return awarded
+                    batch = [
+                        self._pending.popleft()
+                        for _ in range(min(len(self._pending), settings.LOYALTY_ACCRUAL_BATCH_SIZE))
+                    ]
+                db = SessionLocal()
+                try:
+                    awarded += accrue_orders(db, batch)
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    logger.error(f"Loyalty accrual for {len(batch)} orders failed, left for backfill: {e}")
+                finally:
+                    db.close()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the background worker and accrue whatever is still queued"""
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+        self._thread = None
+        self.flush()
+
+loyalty_accrual_worker = LoyaltyAccrualWorker()
+
+def _became_delivered(order: Order) -> bool:
+    return order.status in DELIVERED_STATUSES and inspect(order).attrs.status.history.has_changes()
+
+on_committed_changes(Order, loyalty_accrual_worker.enqueue, when=_became_delivered)
+# Accrue orders still waiting in the queue on shutdown
+resources.register("loyalty-accrual", shutdown=loyalty_accrual_worker.stop)
+
+def backfill_accruals(
+    db: Session,
+    since: Optional[datetime] = None,
+    chunk_size: int = BACKFILL_CHUNK_SIZE
+) -> Dict[str, int]:
+    """Accrue delivered orders that never earned points, chunk_size orders per transaction"""
+    earned = aliased(LoyaltyPoint)
+    stats = {"orders": 0, "points": 0}
+    last_id = ""
+    while True:
+        query = db.query(Order.id).outerjoin(
+            earned, and_(earned.order_id == Order.id, earned.type == "earned")
+        ).filter(
+            Order.id > last_id,
+            Order.user_id.isnot(None),
+            Order.status.in_(DELIVERED_STATUSES),
+            earned.id.is_(None)
+        )
+        if since:
+            query = query.filter(Order.created_at >= since)
+        order_ids = [row.id for row in query.order_by(Order.id).limit(chunk_size)]
+        if not order_ids:
+            break
+        last_id = order_ids[-1]
+
+        stats["points"] += accrue_orders(db, order_ids)
+        stats["orders"] += len(order_ids)
+        db.commit()
+        logger.info(f"Loyalty backfill: {stats['orders']} orders, {stats['points']} points so far")
+    return stats
@@ -0,0 +1,265 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.security import generate_uuid
+from app.models.order import Order
+from app.models.user import LoyaltyBalance, LoyaltyPoint, User
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_BATCH_SIZE = 500
+
+def _derive_balances(db: Session, user_ids: List[str]) -> Dict[str, Tuple[int, int, int]]:
+    """(earned, used, visits) per user, straight from the ledger and orders"""
+    derived: Dict[str, List[int]] = {}
+    ledger = db.query(LoyaltyPoint.user_id, LoyaltyPoint.type, func.sum(LoyaltyPoint.points)).filter(
+        LoyaltyPoint.user_id.in_(user_ids),
+        LoyaltyPoint.type.in_(("earned", "used"))
+    ).group_by(LoyaltyPoint.user_id, LoyaltyPoint.type)
+    for user_id, entry_type, points in ledger:
+        totals = derived.setdefault(user_id, [0, 0, 0])
+        totals[0 if entry_type == "earned" else 1] = int(points or 0)
+
+    visits = db.query(Order.user_id, func.count(Order.id)).filter(
+        Order.user_id.in_(user_ids)
+    ).group_by(Order.user_id)
+    for user_id, count in visits:
+        derived.setdefault(user_id, [0, 0, 0])[2] = int(count or 0)
+
+    return {user_id: tuple(totals) for user_id, totals in derived.items()}
+
+def _balance_row(user_id: str, earned: int, used: int, visits: int) -> Dict:
+    return {
+        "id": generate_uuid(),
+        "user_id": user_id,
+        "earned_points": earned,
+        "used_points": used,
+        "available_points": earned - used,
+        "visits": visits
+    }
+
+def _insert_if_missing(db: Session, row: Dict) -> bool:
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        result = db.execute(
+            insert(LoyaltyBalance).values(row).on_conflict_do_nothing(index_elements=[LoyaltyBalance.user_id])
+        )
+        return result.rowcount == 1
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        result = db.execute(insert(LoyaltyBalance).values(row).prefix_with("IGNORE"))
+        return result.rowcount == 1
+
+    try:
+        with db.begin_nested():
+            db.add(LoyaltyBalance(**row))
+        return True
+    except IntegrityError:
+        return False
+
+def ensure_balances(db: Session, user_ids: Iterable[str]) -> Set[str]:
+    """Create missing balance rows from the ledger; returns the users whose row was created.
+
+    Call before adding the ledger entries or orders being accounted for, unless
+    they are already flushed and should be part of the derived balance.
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return set()
+    existing = {
+        row.user_id for row in db.query(LoyaltyBalance.user_id).filter(LoyaltyBalance.user_id.in_(user_ids))
+    }
+    missing = sorted(user_ids - existing)
+    if not missing:
+        return set()
+
+    derived = _derive_balances(db, missing)
+    created = set()
+    for user_id in missing:
+        earned, used, visits = derived.get(user_id, (0, 0, 0))
+        if _insert_if_missing(db, _balance_row(user_id, earned, used, visits)):
+            created.add(user_id)
+    return created
+
+def ensure_balance(db: Session, user_id: str) -> bool:
+    """Create the user's balance row from the ledger if missing; True when created"""
+    return bool(ensure_balances(db, [user_id]))
+
+def get_balance(db: Session, user_id: str) -> LoyaltyBalance:
+    """The user's balance row, materialized from the ledger (and committed) on first access"""
+    balance = db.query(LoyaltyBalance).filter(LoyaltyBalance.user_id == user_id).populate_existing().first()
+    if balance is None:
+        if ensure_balance(db, user_id):
+            db.commit()
+        balance = db.query(LoyaltyBalance).filter(LoyaltyBalance.user_id == user_id).populate_existing().one()
+    return balance
+
+def _insert_earned(db: Session, entries: List[Dict]) -> List[Dict]:
+    """Insert 'earned' entries, skipping orders that already have one; returns the entries written"""
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        written = set(db.execute(
+            insert(LoyaltyPoint).values(entries).on_conflict_do_nothing(
+                index_elements=[LoyaltyPoint.order_id, LoyaltyPoint.type]
+            ).returning(LoyaltyPoint.order_id)
+        ).scalars())
+        return [entry for entry in entries if entry["order_id"] in written]
+
+    written = []
+    for entry in entries:
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert
+            if db.execute(insert(LoyaltyPoint).values(entry).prefix_with("IGNORE")).rowcount == 1:
+                written.append(entry)
+            continue
+        try:
+            with db.begin_nested():
+                db.add(LoyaltyPoint(**entry))
+            written.append(entry)
+        except IntegrityError:
+            pass
+    return written
+
+def earn_points(db: Session, entries: List[Dict]) -> List[Dict]:
+    """Write 'earned' ledger entries (row dicts) and credit the balances; returns the entries written.
+
+    An order earns once: entries for an order that already has one are skipped,
+    and the unique (order_id, type) index settles races. The caller commits.
+    """
+    if not entries:
+        return []
+    # Materialize missing balances before the new entries exist, so they aren't counted twice
+    ensure_balances(db, {entry["user_id"] for entry in entries})
+    written = _insert_earned(db, entries)
+
+    points_by_user: Dict[str, int] = {}
+    for entry in written:
+        points_by_user[entry["user_id"]] = points_by_user.get(entry["user_id"], 0) + entry["points"]
+    if points_by_user:
+        table = LoyaltyBalance.__table__
+        db.execute(
+            table.update().where(table.c.user_id == bindparam("b_user_id")).values(
+                earned_points=table.c.earned_points + bindparam("b_points"),
+                available_points=table.c.available_points + bindparam("b_points")
+            ),
+            [{"b_user_id": user_id, "b_points": points} for user_id, points in points_by_user.items()]
+        )
+    return written
+
+def redeem_points(db: Session, user_id: str, points: int, description: Optional[str] = None) -> Optional[LoyaltyPoint]:
+    """Debit points if the balance covers them; None when it doesn't. The caller commits.
+
+    The check and the debit are one conditional UPDATE, so concurrent
+    redemptions can't spend the same points twice.
+    """
+    ensure_balance(db, user_id)
+    result = db.execute(
+        update(LoyaltyBalance).where(
+            LoyaltyBalance.user_id == user_id,
+            LoyaltyBalance.available_points >= points
+        ).values(
+            used_points=LoyaltyBalance.used_points + points,
+            available_points=LoyaltyBalance.available_points - points
+        ).execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        return None
+
+    entry = LoyaltyPoint(
+        id=generate_uuid(),
+        user_id=user_id,
+        points=points,
+        type="used",
+        description=description
+    )
+    db.add(entry)
+    return entry
+
+def add_visit(db: Session, user_id: str):
+    """Count an order towards the user's visits; call after the order is flushed"""
+    if ensure_balance(db, user_id):
+        return  # Freshly derived from the orders table, which already has this order
+    db.execute(
+        update(LoyaltyBalance).where(LoyaltyBalance.user_id == user_id).values(
+            visits=LoyaltyBalance.visits + 1
+        ).execution_options(synchronize_session=False)
+    )
+
+def remove_visit(db: Session, user_id: str):
+    """Stop counting a deleted order towards the user's visits; call after the delete is flushed"""
+    if ensure_balance(db, user_id):
+        return  # Freshly derived from the orders table, which no longer has this order
+    db.execute(
+        update(LoyaltyBalance).where(LoyaltyBalance.user_id == user_id, LoyaltyBalance.visits > 0).values(
+            visits=LoyaltyBalance.visits - 1
+        ).execution_options(synchronize_session=False)
+    )
+
+def reconcile_balances(db: Session, batch_size: int = RECONCILE_BATCH_SIZE, fix: bool = True) -> Dict[str, int]:
+    """Re-derive balances from the ledger, batch_size users at a time, and report drift.
+
+    Balance rows of a batch are locked while it is checked, so ledger writes
+    that commit meanwhile apply their delta on top of the corrected value.
+    With fix=False drift is only logged.
+    """
+    stats = {"checked": 0, "drifted": 0, "created": 0}
+    last_id = ""
+    while True:
+        user_ids = [
+            row.id for row in db.query(User.id).filter(User.id > last_id).order_by(User.id).limit(batch_size)
+        ]
+        if not user_ids:
+            break
+        last_id = user_ids[-1]
+
+        balances = {
+            balance.user_id: balance
+            for balance in db.query(LoyaltyBalance).filter(
+                LoyaltyBalance.user_id.in_(user_ids)
+            ).with_for_update().populate_existing()
+        }
+        derived = _derive_balances(db, user_ids)
+
+        for user_id in user_ids:
+            earned, used, visits = derived.get(user_id, (0, 0, 0))
+            balance = balances.get(user_id)
+            if balance is None:
+                if earned or used or visits:
+                    stats["created"] += 1
+                    if fix:
+                        db.add(LoyaltyBalance(**_balance_row(user_id, earned, used, visits)))
+                continue
+
+            stats["checked"] += 1
+            expected = (earned, used, earned - used, visits)
+            actual = (balance.earned_points, balance.used_points, balance.available_points, balance.visits)
+            if actual != expected:
+                stats["drifted"] += 1
+                logger.warning(
+                    f"Loyalty balance drift for user {user_id}: "
+                    f"stored (earned, used, available, visits)={actual}, ledger={expected}"
+                )
+                if fix:
+                    balance.earned_points, balance.used_points, balance.available_points, balance.visits = expected
+
+        if fix:
+            db.commit()
+        else:
+            db.rollback()
+
+    logger.info(
+        f"Loyalty reconciliation: {stats['checked']} checked, {stats['drifted']} drifted, {stats['created']} created"
+    )
+    return stats
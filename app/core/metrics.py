@@ -0,0 +1,232 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.db_pool import pool_stats
+from app.core.query_profiler import QueryProfile, current_profile, report_n_plus_one
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+UNMATCHED_ROUTE = "unmatched"  # 404s share one label instead of one per probed path
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values: Tuple[str, ...] = (), amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = list(self._values.items())
+        for label_values, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}")
+        return lines
+
+class Gauge(Counter):
+    def dec(self, label_values: Tuple[str, ...] = (), amount: float = 1):
+        self.inc(label_values, -amount)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram; observe() touches one bucket, render() accumulates"""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], list] = {}  # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, label_values: Tuple[str, ...] = ()):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(label_values, list(counts), total, count) for label_values, (counts, total, count) in self._series.items()]
+        for label_values, counts, total, count in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="' + _format_value(float(bound)) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, label_values)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, label_values)} {count}")
+        return lines
+
+class MetricsRegistry:
+    """Metrics of this process in the Prometheus text exposition format (version 0.0.4)"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []  # Callables returning extra exposition lines at scrape time
+
+    def counter(self, *args, **kwargs) -> Counter:
+        return self._add(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        return self._add(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        return self._add(Histogram(*args, **kwargs))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+http_requests = metrics.counter("http_requests_total", "HTTP requests handled", ("method", "route", "status"))
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds", "Time from request start to the last response byte", ("method", "route")
+)
+http_request_size = metrics.histogram("http_request_size_bytes", "Request body size", ("method", "route"), SIZE_BUCKETS)
+http_response_size = metrics.histogram("http_response_size_bytes", "Response body size", ("method", "route"), SIZE_BUCKETS)
+http_requests_in_progress = metrics.gauge("http_requests_in_progress", "Requests currently being handled")
+http_request_db_queries = metrics.histogram(
+    "http_request_db_queries", "SQL statements executed per request", ("method", "route"), QUERY_COUNT_BUCKETS
+)
+http_request_db_duration = metrics.histogram(
+    "http_request_db_duration_seconds", "Time spent executing SQL per request", ("method", "route")
+)
+
+# Middleware
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, sizes, in-flight requests and DB work per route.
+
+    Routes are labelled by their path template (/api/orders/{order_id}), so the
+    number of series stays bounded. The request's QueryProfile lives in a
+    contextvar, which is copied into the threadpool that runs sync endpoints,
+    so their queries are attributed to the request; with
+    QUERY_N_PLUS_ONE_DETECTION on, repeated statement shapes are logged.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_templates: Optional[Dict[object, str]] = None
+
+    def _route_label(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        if self._route_templates is None:
+            templates = {}
+            for route in getattr(scope.get("app"), "routes", []):
+                templates.setdefault(getattr(route, "endpoint", None), getattr(route, "path", UNMATCHED_ROUTE))
+            self._route_templates = templates
+        return self._route_templates.get(endpoint, UNMATCHED_ROUTE)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        request_size = 0
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                request_size = int(value or 0)
+                break
+        status_code = 500
+        response_size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        profile = QueryProfile(f"{scope['method']} {scope['path']}", track_shapes=settings.QUERY_N_PLUS_ONE_DETECTION)
+        token = current_profile.set(profile)
+        http_requests_in_progress.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_progress.dec()
+            current_profile.reset(token)
+            labels = (scope["method"], self._route_label(scope))
+            http_requests.inc(labels + (str(status_code),))
+            http_request_duration.observe(time.perf_counter() - started, labels)
+            http_request_size.observe(request_size, labels)
+            http_response_size.observe(response_size, labels)
+            http_request_db_queries.observe(profile.queries, labels)
+            http_request_db_duration.observe(profile.seconds, labels)
+            if profile.shapes is not None:
+                profile.label = " ".join(labels)
+                report_n_plus_one(profile)
+
+def pool_metric_lines(engines: Dict[str, Engine]) -> List[str]:
+    """Gauges/counters from the instrumented connection pools, labelled by pool name"""
+    fields = [
+        ("db_pool_size", "gauge", "Connections kept open by the pool", "size"),
+        ("db_pool_checked_out", "gauge", "Connections currently in use", "checkedOut"),
+        ("db_pool_overflow", "gauge", "Overflow connections open beyond the pool size", "overflow"),
+        ("db_pool_checkouts_total", "counter", "Connections handed out", "checkouts"),
+        ("db_pool_timeouts_total", "counter", "Checkouts that timed out waiting for a connection", "timeouts"),
+        ("db_pool_wait_seconds_total", "counter", "Time spent waiting for a connection", "waitSecondsTotal"),
+    ]
+    stats = {name: pool_stats(target) for name, target in engines.items()}
+    lines = []
+    for metric, kind, documentation, key in fields:
+        samples = [(name, values[key]) for name, values in stats.items() if key in values]
+        if not samples:
+            continue
+        lines.append(f"# HELP {metric} {documentation}")
+        lines.append(f"# TYPE {metric} {kind}")
+        if key == "overflow":
+            samples = [(name, max(value, 0)) for name, value in samples]  # QueuePool reports -size..0 until full
+        lines.extend(f'{metric}{{pool="{name}"}} {_format_value(value)}' for name, value in samples)
+    return lines
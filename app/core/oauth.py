@@ -1,6 +1,8 @@
 from typing import Optional, Dict, Any
 import logging
+import threading
 from app.core.config import settings
+from app.core.resources import resources
 
 logger = logging.getLogger(__name__)
 
@@ -118,44 +120,62 @@ class MockOAuthProvider:
         }
 
 class OAuthService:
-    """OAuth service manager"""
+    """OAuth service manager; providers (and their clients) are built on first use"""
 
     def __init__(self):
-        self.google_provider: Optional[GoogleOAuthProvider] = None
-        self.facebook_provider: Optional[FacebookOAuthProvider] = None
-        self._initialize_providers()
+        self._google_provider: Optional[GoogleOAuthProvider] = None
+        self._facebook_provider: Optional[FacebookOAuthProvider] = None
+        self._initialized = False
+        self._lock = threading.Lock()
+
+    def _ensure_initialized(self):
+        if not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    self._initialize_providers()
+                    self._initialized = True
+
+    @property
+    def google_provider(self) -> Optional[GoogleOAuthProvider]:
+        self._ensure_initialized()
+        return self._google_provider
+
+    @property
+    def facebook_provider(self) -> Optional[FacebookOAuthProvider]:
+        self._ensure_initialized()
+        return self._facebook_provider
 
     def _initialize_providers(self):
         """Initialize OAuth providers based on settings"""
         if not getattr(settings, 'OAUTH_ENABLED', False):
             logger.warning("OAuth is disabled. Using mock provider for development.")
-            self.google_provider = MockOAuthProvider()
-            self.facebook_provider = MockOAuthProvider()
+            self._google_provider = MockOAuthProvider()
+            self._facebook_provider = MockOAuthProvider()
             return
 
         # Initialize Google OAuth
         if hasattr(settings, 'GOOGLE_CLIENT_ID') and settings.GOOGLE_CLIENT_ID:
             try:
-                self.google_provider = GoogleOAuthProvider()
+                self._google_provider = GoogleOAuthProvider()
                 logger.info("Google OAuth provider initialized successfully")
             except ImportError:
                 logger.error("Google Auth package not installed. Using mock provider.")
-                self.google_provider = MockOAuthProvider()
+                self._google_provider = MockOAuthProvider()
         else:
             logger.warning("Google OAuth credentials not configured. Using mock provider.")
-            self.google_provider = MockOAuthProvider()
+            self._google_provider = MockOAuthProvider()
 
         # Initialize Facebook OAuth
         if hasattr(settings, 'FACEBOOK_APP_ID') and settings.FACEBOOK_APP_ID:
             try:
-                self.facebook_provider = FacebookOAuthProvider()
+                self._facebook_provider = FacebookOAuthProvider()
                 logger.info("Facebook OAuth provider initialized successfully")
             except ImportError:
                 logger.error("Requests package not installed. Using mock provider.")
-                self.facebook_provider = MockOAuthProvider()
+                self._facebook_provider = MockOAuthProvider()
         else:
             logger.warning("Facebook OAuth credentials not configured. Using mock provider.")
-            self.facebook_provider = MockOAuthProvider()
+            self._facebook_provider = MockOAuthProvider()
 
     async def verify_google_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Verify Google OAuth token"""
@@ -175,3 +195,5 @@ class OAuthService:
 
 # Global OAuth service instance
 oauth_service = OAuthService()
+
+resources.register("oauth", warmup=lambda: oauth_service.google_provider)
@@ -0,0 +1,177 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal, on_committed_changes
+from app.core.resources import resources
+from app.models.user import PromoCode
+
+logger = logging.getLogger(__name__)
+
+INVALID_PROMO_MESSAGE = "Invalid or expired promo code"
+
+class PromoCodeError(Exception):
+    """A promo code can't be applied; the message is safe to show to the customer"""
+
+def normalize_code(code: Optional[str]) -> str:
+    return (code or "").strip().upper()
+
+def _utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite hands back naive datetimes, PostgreSQL aware ones; compare everything as naive UTC
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+class CompiledPromo:
+    """A promo code with its checks and discount formula resolved once at load time"""
+
+    __slots__ = ("id", "code", "discount_type", "discount_value", "usage_limit", "used_count", "rules", "discount")
+
+    def __init__(self, promo: PromoCode):
+        self.id = promo.id
+        self.code = promo.code
+        self.discount_type = promo.discount_type
+        self.discount_value = promo.discount_value
+        self.usage_limit = promo.usage_limit
+        self.used_count = promo.used_count or 0
+        self.rules = self._compile_rules(promo)
+        self.discount = self._compile_discount(promo)
+
+    def _compile_rules(self, promo: PromoCode) -> Tuple[Callable[[float, datetime], Optional[str]], ...]:
+        rules: List[Callable[[float, datetime], Optional[str]]] = []
+
+        expires_at = _utc_naive(promo.expires_at)
+        if expires_at is not None:
+            rules.append(lambda subtotal, now: INVALID_PROMO_MESSAGE if expires_at < now else None)
+
+        if promo.usage_limit:
+            # Advisory only; redeem() enforces the limit atomically in the database
+            rules.append(
+                lambda subtotal, now: INVALID_PROMO_MESSAGE if self.used_count >= self.usage_limit else None
+            )
+
+        min_order_amount = promo.min_order_amount or 0.0
+        if min_order_amount > 0:
+            message = f"Minimum order amount of {promo.min_order_amount} required"
+            rules.append(lambda subtotal, now: message if subtotal < min_order_amount else None)
+
+        return tuple(rules)
+
+    @staticmethod
+    def _compile_discount(promo: PromoCode) -> Callable[[float], float]:
+        value = promo.discount_value or 0.0
+        if promo.discount_type == "percentage":
+            rate = value / 100
+            max_discount = promo.max_discount
+            if max_discount:
+                return lambda subtotal: min(subtotal * rate, max_discount)
+            return lambda subtotal: subtotal * rate
+        return lambda subtotal: value
+
+    def evaluate(self, subtotal: float, now: Optional[datetime] = None) -> float:
+        """Discount for a cart subtotal; raises PromoCodeError when a rule fails"""
+        now = now or datetime.utcnow()
+        for rule in self.rules:
+            message = rule(subtotal, now)
+            if message:
+                raise PromoCodeError(message)
+        return self.discount(subtotal)
+
+class PromoEngine:
+    """In-memory cache of active promo codes with atomic redemption.
+
+    Lookups never touch the database while the cache is fresh; it is reloaded
+    after any committed PromoCode change in this process and otherwise every
+    PROMO_CACHE_REFRESH_SECONDS (to pick up changes made by other workers).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._codes: Dict[str, CompiledPromo] = {}
+        self._loaded_at: Optional[float] = None
+
+    def invalidate(self, promo_ids=None):
+        self._loaded_at = None
+
+    def _ensure_fresh(self, db: Session):
+        loaded_at = self._loaded_at
+        if loaded_at is not None and time.monotonic() - loaded_at < settings.PROMO_CACHE_REFRESH_SECONDS:
+            return
+        with self._lock:
+            if self._loaded_at is not None and self._loaded_at != loaded_at:
+                return  # Another request reloaded meanwhile
+            promos = db.query(PromoCode).filter(PromoCode.is_active == True).all()
+            self._codes = {normalize_code(promo.code): CompiledPromo(promo) for promo in promos}
+            self._loaded_at = time.monotonic()
+        logger.info(f"Promo code cache loaded with {len(self._codes)} active codes")
+
+    def warm_up(self):
+        """Load the active codes before the first checkout needs them"""
+        db = SessionLocal()
+        try:
+            self._ensure_fresh(db)
+        finally:
+            db.close()
+
+    def get(self, db: Session, code: str) -> Optional[CompiledPromo]:
+        self._ensure_fresh(db)
+        return self._codes.get(normalize_code(code))
+
+    def evaluate(self, db: Session, code: str, subtotal: float) -> Tuple[CompiledPromo, float]:
+        """(promo, discount) for a cart subtotal; raises PromoCodeError if it doesn't apply"""
+        promo = self.get(db, code)
+        if promo is None:
+            raise PromoCodeError(INVALID_PROMO_MESSAGE)
+        return promo, promo.evaluate(subtotal)
+
+    def redeem(self, db: Session, code: str) -> bool:
+        """Count one use of a code; False when it is unknown, expired or used up.
+
+        A single conditional UPDATE, so concurrent redemptions can never push
+        used_count past usage_limit. The caller commits (or rolls back) with the order.
+        """
+        promo = self.get(db, code)
+        if promo is None:
+            return False
+
+        now = datetime.utcnow()
+        used_count = func.coalesce(PromoCode.used_count, 0)
+        result = db.execute(
+            update(PromoCode).where(
+                PromoCode.id == promo.id,
+                PromoCode.is_active == True,
+                or_(PromoCode.usage_limit.is_(None), PromoCode.usage_limit <= 0, used_count < PromoCode.usage_limit),
+                or_(PromoCode.expires_at.is_(None), PromoCode.expires_at > now)
+            ).values(used_count=used_count + 1).execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            if promo.usage_limit:
+                # Let later applies fail from the cache without a round trip
+                promo.used_count = max(promo.used_count, promo.usage_limit)
+            return False
+
+        promo.used_count += 1
+        return True
+
+    def release(self, db: Session, code: str) -> bool:
+        """Give back one use of a code, e.g. when its order is cancelled"""
+        result = db.execute(
+            update(PromoCode).where(
+                PromoCode.code == normalize_code(code),
+                PromoCode.used_count > 0
+            ).values(used_count=PromoCode.used_count - 1).execution_options(synchronize_session=False)
+        )
+        promo = self._codes.get(normalize_code(code))
+        if result.rowcount and promo is not None and promo.used_count > 0:
+            promo.used_count -= 1
+        return bool(result.rowcount)
+
+promo_engine = PromoEngine()
+
+on_committed_changes(PromoCode, promo_engine.invalidate)
+resources.register("promo-codes", warmup=promo_engine.warm_up)
@@ -0,0 +1,106 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class QueryProfile:
+    """Statements executed within a request (or a profiled block), their time and shapes.
+
+    Statements are compared as SQLAlchemy renders them, with bound parameters
+    as placeholders, so the same query run once per row of a loop shows up as
+    one shape with a high count (the N+1 pattern).
+    """
+
+    __slots__ = ("label", "queries", "seconds", "shapes")
+
+    def __init__(self, label: str = "", track_shapes: bool = False):
+        self.label = label
+        self.queries = 0
+        self.seconds = 0.0
+        self.shapes: Optional[Counter] = Counter() if track_shapes else None
+
+    def record(self, statement: str, seconds: float):
+        # Unlocked: a request's statements run one at a time, on whichever thread serves it
+        self.queries += 1
+        self.seconds += seconds
+        if self.shapes is not None:
+            self.shapes[statement] += 1
+
+    def repeated(self, threshold: int = None) -> List[Tuple[int, str]]:
+        """(count, statement) of the shapes executed at least threshold times, most frequent first"""
+        threshold = threshold or settings.QUERY_N_PLUS_ONE_THRESHOLD
+        if self.shapes is None:
+            return []
+        return [(count, statement) for statement, count in self.shapes.most_common() if count >= threshold]
+
+    def summary(self) -> str:
+        lines = [f"{self.queries} queries in {self.seconds * 1000:.1f} ms" + (f" ({self.label})" if self.label else "")]
+        for count, statement in self.repeated(2):
+            lines.append(f"  {count}x {_one_line(statement)}")
+        return "\n".join(lines)
+
+# Profile of the request being handled (set by the metrics middleware)
+current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("current_profile", default=None)
+
+# Process-wide profiles opened by profile_queries(): they see statements from every
+# thread, which is what a test driving the app through TestClient needs
+_watchers: List[QueryProfile] = []
+
+def _one_line(statement: str, limit: int = 500) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    profile = current_profile.get()
+    if profile is not None:
+        profile.record(statement, elapsed)
+    for watcher in _watchers:
+        watcher.record(statement, elapsed)
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.0f} ms) in {profile.label if profile is not None else 'background'}: "
+            f"{_one_line(statement)}"
+        )
+
+def report_n_plus_one(profile: QueryProfile):
+    """Log the statement shapes a request repeated often enough to look like an N+1"""
+    repeated = profile.repeated()
+    if repeated:
+        shapes = "\n".join(f"  {count}x {_one_line(statement)}" for count, statement in repeated)
+        logger.warning(f"Possible N+1 in {profile.label} ({profile.queries} queries):\n{shapes}")
+
+@contextmanager
+def profile_queries(label: str = ""):
+    """Count every statement executed in this process while the block runs"""
+    profile = QueryProfile(label, track_shapes=True)
+    _watchers.append(profile)
+    try:
+        yield profile
+    finally:
+        _watchers.remove(profile)
+
+@contextmanager
+def assert_max_queries(limit: int, label: str = ""):
+    """Fail when the block executes more than limit statements, listing the repeated ones"""
+    with profile_queries(label) as profile:
+        yield profile
+    if profile.queries > limit:
+        raise AssertionError(f"Expected at most {limit} queries, got {profile.summary()}")
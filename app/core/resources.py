@@ -0,0 +1,95 @@
+import logging
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+class Resource:
+    """A process-wide resource with optional warm-up and shutdown hooks"""
+
+    def __init__(self, name: str, warmup: Optional[Callable[[], object]], shutdown: Optional[Callable[[], object]]):
+        self.name = name
+        self.warmup = warmup
+        self.shutdown = shutdown
+        self.warmed_up = False
+        self.warmup_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+class ResourceRegistry:
+    """Lifespan-managed registry of the app's long-lived resources.
+
+    Modules register their resource (DB pool, HTTP clients, caches, background
+    writers) at import. The app's lifespan warms them up in registration order
+    before uvicorn accepts traffic, and shuts them down in reverse order after
+    in-flight requests are done, so writers flush before the pool is disposed.
+    A failing warm-up is logged and the resource falls back to its lazy path.
+    """
+
+    def __init__(self):
+        self._resources: Dict[str, Resource] = {}
+        self.state = SimpleNamespace()  # Mutable process-wide flags, e.g. registration_enabled
+        self.ready = False
+
+    def register(
+        self,
+        name: str,
+        warmup: Optional[Callable[[], object]] = None,
+        shutdown: Optional[Callable[[], object]] = None
+    ) -> Resource:
+        resource = Resource(name, warmup, shutdown)
+        self._resources[name] = resource
+        return resource
+
+    def warm_up(self):
+        for resource in list(self._resources.values()):
+            if resource.warmup is None:
+                continue
+            started = time.perf_counter()
+            try:
+                resource.warmup()
+                resource.warmed_up = True
+                resource.error = None
+            except Exception as e:
+                resource.error = str(e).splitlines()[0] if str(e) else type(e).__name__
+                logger.warning(f"Warm-up of {resource.name} failed, it will initialize on first use: {resource.error}")
+            resource.warmup_seconds = time.perf_counter() - started
+            if resource.warmed_up:
+                logger.info(f"Warmed up {resource.name} in {resource.warmup_seconds * 1000:.0f} ms")
+        self.ready = True
+
+    def shutdown(self):
+        self.ready = False
+        for resource in reversed(list(self._resources.values())):
+            if resource.shutdown is None:
+                continue
+            try:
+                resource.shutdown()
+                logger.info(f"Shut down {resource.name}")
+            except Exception as e:
+                logger.error(f"Shutdown of {resource.name} failed: {e}")
+
+    def status(self) -> List[Dict]:
+        return [
+            {
+                "name": resource.name,
+                "warmedUp": resource.warmed_up,
+                "warmupMs": round(resource.warmup_seconds * 1000, 1) if resource.warmup_seconds is not None else None,
+                "error": resource.error
+            }
+            for resource in self._resources.values()
+        ]
+
+    @asynccontextmanager
+    async def lifespan(self, app):
+        """FastAPI lifespan: warm up before serving, shut down after the last request"""
+        await run_in_threadpool(self.warm_up)
+        try:
+            yield
+        finally:
+            await run_in_threadpool(self.shutdown)
+
+resources = ResourceRegistry()
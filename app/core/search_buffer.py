@@ -0,0 +1,164 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.resources import resources
+from app.core.search_stats import normalize_query, record_searches
+from app.core.security import generate_uuid
+from app.models.user import SearchHistory
+
+logger = logging.getLogger(__name__)
+
+class SearchHistoryBuffer:
+    """Write-behind buffer for search history.
+
+    Searches are queued in memory and written by a background thread with
+    multi-row inserts once SEARCH_HISTORY_BATCH_SIZE events are waiting or
+    SEARCH_HISTORY_FLUSH_SECONDS have passed. Repeats of the same search by the
+    same user inside SEARCH_HISTORY_DEDUPE_SECONDS are dropped, and when
+    SEARCH_HISTORY_MAX_PENDING events are already queued new ones are dropped
+    rather than letting memory grow while the database is slow.
+    """
+
+    def __init__(self):
+        self._events: Deque[Dict] = deque()
+        self._recent: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+        self.deduplicated = 0
+
+    def add(self, user_id: str, query: str) -> bool:
+        """Queue a search; returns False when it was dropped as a duplicate or by backpressure"""
+        normalized = normalize_query(query)
+        if not normalized:
+            return False
+
+        now = time.monotonic()
+        key = (user_id, normalized)
+        with self._lock:
+            self._expire_recent(now)
+            if key in self._recent:
+                self.deduplicated += 1
+                return False
+
+            if len(self._events) >= settings.SEARCH_HISTORY_MAX_PENDING:
+                self.dropped += 1
+                if self.dropped % 1000 == 1:
+                    logger.warning(f"Search history buffer full, {self.dropped} searches dropped so far")
+                self._wake.set()
+                return False
+
+            self._recent[key] = now
+            self._events.append({
+                "id": generate_uuid(),
+                "user_id": user_id,
+                "query": query[:255],
+                "created_at": datetime.utcnow()
+            })
+            pending = len(self._events)
+
+        self._ensure_started()
+        if pending >= settings.SEARCH_HISTORY_BATCH_SIZE:
+            self._wake.set()
+        return True
+
+    def pending_for(self, user_id: str) -> List[str]:
+        """Queued (not yet written) queries of a user, newest first"""
+        with self._lock:
+            return [event["query"] for event in reversed(self._events) if event["user_id"] == user_id]
+
+    def _expire_recent(self, now: float):
+        window = settings.SEARCH_HISTORY_DEDUPE_SECONDS
+        while self._recent:
+            key, seen_at = next(iter(self._recent.items()))
+            if now - seen_at < window:
+                break
+            self._recent.popitem(last=False)
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="search-history-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(settings.SEARCH_HISTORY_FLUSH_SECONDS)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Search history flush failed: {e}")
+
+    def flush(self) -> int:
+        """Write everything queued so far; returns the number of rows written"""
+        with self._flush_lock:
+            written = 0
+            while True:
+                with self._lock:
+                    if not self._events:
+                        return written
+                    batch = [
+                        self._events.popleft()
+                        for _ in range(min(len(self._events), settings.SEARCH_HISTORY_BATCH_SIZE))
+                    ]
+                written += self._write(batch)
+
+    def _write(self, rows: List[Dict]) -> int:
+        db = SessionLocal()
+        try:
+            db.execute(insert(SearchHistory), rows)
+            record_searches(db, [(row["query"], row["created_at"]) for row in rows])
+            db.commit()
+            return len(rows)
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(f"Batched search history insert failed ({e}); retrying row by row")
+        finally:
+            db.close()
+
+        # One bad row (e.g. a user deleted meanwhile) must not lose the whole batch
+        written = 0
+        for row in rows:
+            db = SessionLocal()
+            try:
+                db.execute(insert(SearchHistory), [row])
+                record_searches(db, [(row["query"], row["created_at"])])
+                db.commit()
+                written += 1
+            except SQLAlchemyError as e:
+                db.rollback()
+                logger.error(f"Dropping search history row for user {row['user_id']}: {e}")
+            finally:
+                db.close()
+        return written
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the background writer and flush whatever is still queued"""
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+        self._thread = None
+        self.flush()
+
+search_history_buffer = SearchHistoryBuffer()
+
+# Write searches still waiting in the buffer on shutdown
+resources.register("search-history", shutdown=search_history_buffer.stop)
@@ -0,0 +1,436 @@
+import bisect
+import heapq
+import logging
+import math
+import re
+import threading
+import time
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import DDL, event, func, literal_column, text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal, on_committed_changes
+from app.core.resources import resources
+from app.models.menu import MenuItem
+
+logger = logging.getLogger(__name__)
+
+# Field weights: a hit in the product name counts three times a hit in the description
+NAME_WEIGHT = 3.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Match quality per kind of term expansion
+EXACT_QUALITY = 1.0
+PREFIX_QUALITY = 0.8
+FUZZY_QUALITY = 0.6
+
+FUZZY_THRESHOLD = 0.35  # Minimum trigram similarity for a typo match
+MAX_PREFIX_EXPANSIONS = 100
+MAX_FUZZY_EXPANSIONS = 20
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+# Weighted document used by PostgreSQL full-text search. The query must use the
+# same expression as the GIN index below, otherwise the planner cannot use it.
+PG_SEARCH_DOCUMENT = (
+    "(setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B'))"
+)
+
+PG_SEARCH_INDEX_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_products_search_document ON products USING gin ({PG_SEARCH_DOCUMENT})",
+]
+
+PG_TRIGRAM_INDEX_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_products_name_trgm ON products USING gin (name gin_trgm_ops)",
+]
+
+def tokenize(value: Optional[str]) -> List[str]:
+    """Split text into lowercase alphanumeric tokens"""
+    if not value:
+        return []
+    return _TOKEN_RE.findall(value.lower())
+
+def trigrams(token: str) -> Set[str]:
+    """Trigrams of a token, padded the same way as pg_trgm"""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def popularity_boost(order_count: Optional[int], rating: Optional[float]) -> float:
+    """Relevance multiplier for popular and well rated products"""
+    return 1.0 + 0.1 * math.log1p(max(order_count or 0, 0)) + 0.05 * float(rating or 0.0)
+
+class IndexedProduct:
+    """Searchable fields of a single product"""
+
+    __slots__ = ("id", "name", "category_id", "boost", "terms")
+
+    def __init__(self, id: str, name: str, category_id: Optional[str], boost: float, terms: Dict[str, float]):
+        self.id = id
+        self.name = name
+        self.category_id = category_id
+        self.boost = boost
+        self.terms = terms  # term -> field weight
+
+class InvertedIndex:
+    """In-process inverted index with prefix and trigram fuzzy matching"""
+
+    def __init__(self):
+        self._docs: Dict[str, IndexedProduct] = {}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._trigram_terms: Dict[str, Set[str]] = {}
+        self._term_trigram_count: Dict[str, int] = {}
+        self._sorted_terms: List[str] = []
+        self._sorted_terms_dirty = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(
+        self,
+        product_id: str,
+        name: Optional[str],
+        description: Optional[str] = None,
+        category_id: Optional[str] = None,
+        order_count: Optional[int] = 0,
+        rating: Optional[float] = 0.0
+    ):
+        """Add or replace a product in the index"""
+        if product_id in self._docs:
+            self.remove(product_id)
+
+        terms: Dict[str, float] = {}
+        for term in tokenize(description):
+            terms[term] = DESCRIPTION_WEIGHT
+        for term in tokenize(name):
+            terms[term] = NAME_WEIGHT
+
+        boost = popularity_boost(order_count, rating)
+        self._docs[product_id] = IndexedProduct(product_id, (name or "").lower(), category_id, boost, terms)
+        # Postings hold the boosted field weight so ranking needs no per-document lookups
+        for term, weight in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._add_term(term)
+            postings[product_id] = weight * boost
+
+    def remove(self, product_id: str):
+        """Remove a product from the index if present"""
+        doc = self._docs.pop(product_id, None)
+        if doc is None:
+            return
+        for term in doc.terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(product_id, None)
+            if not postings:
+                del self._postings[term]
+                self._remove_term(term)
+
+    def _add_term(self, term: str):
+        grams = trigrams(term)
+        self._term_trigram_count[term] = len(grams)
+        for gram in grams:
+            self._trigram_terms.setdefault(gram, set()).add(term)
+        self._sorted_terms_dirty = True
+
+    def _remove_term(self, term: str):
+        self._term_trigram_count.pop(term, None)
+        for gram in trigrams(term):
+            terms = self._trigram_terms.get(gram)
+            if terms is not None:
+                terms.discard(term)
+                if not terms:
+                    del self._trigram_terms[gram]
+        self._sorted_terms_dirty = True
+
+    def _prefix_terms(self, token: str) -> List[str]:
+        if self._sorted_terms_dirty:
+            self._sorted_terms = sorted(self._postings)
+            self._sorted_terms_dirty = False
+        terms = []
+        start = bisect.bisect_left(self._sorted_terms, token)
+        for term in self._sorted_terms[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(token):
+                break
+            terms.append(term)
+        return terms
+
+    def _fuzzy_terms(self, token: str) -> List[Tuple[str, float]]:
+        grams = trigrams(token)
+        overlap: Dict[str, int] = {}
+        for gram in grams:
+            for term in self._trigram_terms.get(gram, ()):
+                overlap[term] = overlap.get(term, 0) + 1
+
+        matches = []
+        for term, shared in overlap.items():
+            similarity = shared / (len(grams) + self._term_trigram_count[term] - shared)
+            if similarity >= FUZZY_THRESHOLD:
+                matches.append((term, similarity))
+        return heapq.nlargest(MAX_FUZZY_EXPANSIONS, matches, key=lambda match: match[1])
+
+    def _expand(self, token: str) -> Dict[str, float]:
+        """Index terms a query token matches, with their match quality"""
+        expansions: Dict[str, float] = {}
+        for term in self._prefix_terms(token):
+            expansions[term] = EXACT_QUALITY if term == token else PREFIX_QUALITY
+
+        # Only fall back to typo matching when the token matches nothing literally
+        if not expansions:
+            for term, similarity in self._fuzzy_terms(token):
+                expansions[term] = FUZZY_QUALITY * similarity
+        return expansions
+
+    def _score(self, expansions: Dict[str, float], candidates: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """Best score per product over a token's expansions, optionally restricted to candidates"""
+        scores: Dict[str, float] = {}
+        for term, quality in expansions.items():
+            postings = self._postings[term]
+            if candidates is not None and len(candidates) < len(postings):
+                matches = ((pid, postings[pid]) for pid in candidates if pid in postings)
+            else:
+                matches = postings.items()
+            for product_id, weight in matches:
+                score = quality * weight
+                if score > scores.get(product_id, 0.0):
+                    scores[product_id] = score
+        return scores
+
+    def search(
+        self,
+        query: str,
+        category_id: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Tuple[int, List[str]]:
+        """Return (total matches, ranked product ids for the requested page)"""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return 0, []
+
+        expanded = [self._expand(token) for token in tokens]
+        if not all(expanded):
+            return 0, []
+
+        # Every query token has to match (AND semantics): start from the most selective
+        # token and only score the surviving candidates for the rest
+        expanded.sort(key=lambda expansions: sum(len(self._postings[term]) for term in expansions))
+        scores = self._score(expanded[0])
+        for expansions in expanded[1:]:
+            token_scores = self._score(expansions, candidates=scores)
+            scores = {
+                product_id: score + token_scores[product_id]
+                for product_id, score in scores.items()
+                if product_id in token_scores
+            }
+            if not scores:
+                return 0, []
+
+        if category_id:
+            docs = self._docs
+            scores = {
+                product_id: score for product_id, score in scores.items()
+                if docs[product_id].category_id == category_id
+            }
+
+        ranked = heapq.nlargest(offset + limit, scores.items(), key=itemgetter(1))
+        return len(scores), [product_id for product_id, _ in ranked[offset:]]
+
+class ProductSearchEngine:
+    """Product search facade choosing PostgreSQL full-text search or the in-memory index"""
+
+    def __init__(self):
+        self._index = InvertedIndex()
+        self._lock = threading.Lock()
+        self._built = False
+        self._signature = None
+        self._checked_at = 0.0
+        self._stale_ids: Set[str] = set()
+        self._pg_trigram_available: Optional[bool] = None
+
+    def backend_for(self, db: Session) -> str:
+        """Resolve the search backend for the session's database"""
+        backend = settings.SEARCH_BACKEND.lower()
+        if backend == "auto":
+            return "postgres" if db.get_bind().dialect.name == "postgresql" else "memory"
+        return backend
+
+    def search(
+        self,
+        db: Session,
+        query: str,
+        category_id: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Tuple[int, List[str]]:
+        """Return (total matches, ranked product ids for the requested page)"""
+        if self.backend_for(db) == "postgres":
+            return self._search_postgres(db, query, category_id, limit, offset)
+
+        self._ensure_fresh(db)
+        with self._lock:
+            return self._index.search(query, category_id=category_id, limit=limit, offset=offset)
+
+    def warm_up(self):
+        """Build the in-memory index before the first search (no-op on PostgreSQL full-text)"""
+        db = SessionLocal()
+        try:
+            if self.backend_for(db) == "memory":
+                self._ensure_fresh(db)
+        finally:
+            db.close()
+
+    def invalidate(self, product_ids: Iterable[str]):
+        """Mark products for re-indexing on the next search"""
+        with self._lock:
+            self._stale_ids.update(product_ids)
+
+    def reset(self):
+        """Drop the in-memory index so it is rebuilt on the next search"""
+        with self._lock:
+            self._index = InvertedIndex()
+            self._built = False
+            self._signature = None
+            self._stale_ids.clear()
+
+    # In-memory backend
+
+    def _catalog_signature(self, db: Session):
+        return db.query(
+            func.count(MenuItem.id),
+            func.max(func.coalesce(MenuItem.updated_at, MenuItem.created_at))
+        ).one()
+
+    def _ensure_fresh(self, db: Session):
+        now = time.monotonic()
+        if self._built and not self._stale_ids and now - self._checked_at < settings.SEARCH_INDEX_REFRESH_SECONDS:
+            return
+
+        # Changes made by other workers (or bulk updates) only show up in the signature
+        signature = tuple(self._catalog_signature(db))
+        self._checked_at = now
+        if not self._built or signature != self._signature:
+            self._rebuild(db, signature)
+            return
+
+        with self._lock:
+            stale_ids, self._stale_ids = self._stale_ids, set()
+        if stale_ids:
+            self._reindex(db, stale_ids)
+
+    def _rebuild(self, db: Session, signature):
+        started = time.perf_counter()
+        index = InvertedIndex()
+        rows = db.query(
+            MenuItem.id, MenuItem.name, MenuItem.description, MenuItem.category_id,
+            MenuItem.order_count, MenuItem.rating
+        ).filter(MenuItem.is_available == True).yield_per(1000)
+        for row in rows:
+            index.add(row.id, row.name, row.description, row.category_id, row.order_count, row.rating)
+
+        with self._lock:
+            self._index = index
+            self._built = True
+            self._signature = signature
+            self._stale_ids.clear()
+        logger.info(f"Search index rebuilt: {len(index)} products in {time.perf_counter() - started:.2f}s")
+
+    def _reindex(self, db: Session, product_ids: Set[str]):
+        rows = db.query(
+            MenuItem.id, MenuItem.name, MenuItem.description, MenuItem.category_id,
+            MenuItem.order_count, MenuItem.rating, MenuItem.is_available
+        ).filter(MenuItem.id.in_(product_ids)).all()
+        found = {row.id for row in rows}
+        signature = tuple(self._catalog_signature(db))
+
+        with self._lock:
+            for row in rows:
+                if row.is_available:
+                    self._index.add(row.id, row.name, row.description, row.category_id, row.order_count, row.rating)
+                else:
+                    self._index.remove(row.id)
+            for product_id in product_ids - found:
+                self._index.remove(product_id)
+            self._signature = signature
+
+    # PostgreSQL backend
+
+    def _has_pg_trigram(self, db: Session) -> bool:
+        if self._pg_trigram_available is None:
+            self._pg_trigram_available = db.execute(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            ).first() is not None
+        return self._pg_trigram_available
+
+    def _search_postgres(
+        self,
+        db: Session,
+        query: str,
+        category_id: Optional[str],
+        limit: int,
+        offset: int
+    ) -> Tuple[int, List[str]]:
+        tokens = tokenize(query)
+        if not tokens:
+            return 0, []
+
+        boost = (
+            1.0
+            + 0.1 * func.ln(1 + func.coalesce(MenuItem.order_count, 0))
+            + 0.05 * func.coalesce(MenuItem.rating, 0.0)
+        )
+        document = literal_column(PG_SEARCH_DOCUMENT)
+        ts_query = func.to_tsquery("simple", " & ".join(f"{token}:*" for token in tokens))
+
+        base = db.query(MenuItem.id).filter(MenuItem.is_available == True)
+        if category_id:
+            base = base.filter(MenuItem.category_id == category_id)
+
+        matches = base.filter(document.op("@@")(ts_query))
+        total = matches.count()
+        if total:
+            # ts_rank_cd default weights rank 'A' (name) at 1.0 and 'B' (description) at 0.4
+            ranked = matches.order_by((func.ts_rank_cd(document, ts_query) * boost).desc(), MenuItem.name)
+            return total, [row.id for row in ranked.offset(offset).limit(limit)]
+
+        # Typo tolerance: fall back to trigram similarity on the name when pg_trgm is installed
+        if not self._has_pg_trigram(db):
+            return 0, []
+        phrase = " ".join(tokens)
+        similarity = func.similarity(MenuItem.name, phrase)
+        fuzzy = base.filter(MenuItem.name.op("%")(phrase))
+        total = fuzzy.count()
+        ranked = fuzzy.order_by((similarity * boost).desc(), MenuItem.name)
+        return total, [row.id for row in ranked.offset(offset).limit(limit)]
+
+search_engine = ProductSearchEngine()
+
+def ensure_search_indexes(engine) -> bool:
+    """Create the PostgreSQL full-text (and, if permitted, trigram) indexes on products"""
+    if engine.dialect.name != "postgresql":
+        return False
+
+    with engine.begin() as conn:
+        for statement in PG_SEARCH_INDEX_DDL:
+            conn.execute(text(statement))
+    try:
+        with engine.begin() as conn:
+            for statement in PG_TRIGRAM_INDEX_DDL:
+                conn.execute(text(statement))
+    except Exception as e:
+        logger.warning(f"pg_trgm unavailable, typo-tolerant search disabled: {e}")
+    return True
+
+# New databases get the full-text index together with the products table
+for _statement in PG_SEARCH_INDEX_DDL:
+    event.listen(MenuItem.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+# Keep the in-memory index in step with committed catalog changes
+on_committed_changes(MenuItem, search_engine.invalidate)
+resources.register("search-index", warmup=search_engine.warm_up)
@@ -0,0 +1,179 @@
+import heapq
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.search_engine import tokenize
+from app.core.security import generate_uuid
+from app.models.user import SearchHistory, SearchQueryStat
+
+logger = logging.getLogger(__name__)
+
+POPULAR_CACHE_SIZE = 500  # Popular searches kept in memory; reads slice the first k
+COMPACTION_BATCH_SIZE = 5000
+
+def normalize_query(value: Optional[str]) -> str:
+    """Normalized form searches are counted under"""
+    return " ".join(tokenize(value))[:255]
+
+def _utc_today() -> date:
+    return datetime.utcnow().date()
+
+def record_searches(db: Session, queries: Iterable[Tuple[str, Optional[datetime]]]):
+    """Add (query, searched_at) events to the per-day counters; the caller commits"""
+    counts: Counter = Counter()
+    for text, searched_at in queries:
+        normalized = normalize_query(text)
+        if normalized:
+            counts[(normalized, (searched_at or datetime.utcnow()).date())] += 1
+    if counts:
+        _increment_counters(db, counts)
+
+def _increment_counters(db: Session, counts: Dict[Tuple[str, date], int]):
+    dialect = db.get_bind().dialect.name
+    rows = [
+        {"id": generate_uuid(), "query": query, "day": day, "count": count}
+        for (query, day), count in counts.items()
+    ]
+
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        statement = insert(SearchQueryStat)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[SearchQueryStat.query, SearchQueryStat.day],
+                set_={"count": SearchQueryStat.count + statement.excluded["count"], "updated_at": func.now()}
+            ),
+            rows
+        )
+        return
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        statement = insert(SearchQueryStat)
+        db.execute(
+            statement.on_duplicate_key_update(count=SearchQueryStat.count + statement.inserted["count"]),
+            rows
+        )
+        return
+
+    # Generic fallback: bump existing counters, insert the missing ones
+    for row in rows:
+        result = db.execute(
+            update(SearchQueryStat).where(
+                SearchQueryStat.query == row["query"],
+                SearchQueryStat.day == row["day"]
+            ).values(count=SearchQueryStat.count + row["count"])
+        )
+        if result.rowcount == 0:
+            db.add(SearchQueryStat(**row))
+    db.flush()
+
+class PopularSearches:
+    """Time-decayed heavy hitters over the per-day search counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._top: List[Tuple[str, float]] = []
+        self._loaded_at: Optional[float] = None
+
+    def top(self, db: Session, k: int = 10) -> List[str]:
+        """The k most popular searches; recomputed at most every POPULAR_SEARCH_REFRESH_SECONDS"""
+        return [query for query, _ in self.top_scored(db, k)]
+
+    def top_scored(self, db: Session, k: int = 10) -> List[Tuple[str, float]]:
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= settings.POPULAR_SEARCH_REFRESH_SECONDS:
+            self.refresh(db)
+        return self._top[:k]
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    def refresh(self, db: Session):
+        today = _utc_today()
+        start = today - timedelta(days=settings.POPULAR_SEARCH_WINDOW_DAYS - 1)
+        half_life = max(settings.POPULAR_SEARCH_HALF_LIFE_DAYS, 0.1)
+
+        scores: Dict[str, float] = {}
+        rows = db.query(SearchQueryStat.query, SearchQueryStat.day, SearchQueryStat.count).filter(
+            SearchQueryStat.day >= start
+        )
+        for query, day, count in rows:
+            age = max((today - day).days, 0)
+            scores[query] = scores.get(query, 0.0) + count * 0.5 ** (age / half_life)
+
+        top = heapq.nlargest(POPULAR_CACHE_SIZE, scores.items(), key=lambda item: (item[1], item[0]))
+        with self._lock:
+            self._top = top
+            self._loaded_at = time.monotonic()
+
+popular_searches = PopularSearches()
+
+def backfill_search_stats(db: Session, since: Optional[date] = None) -> int:
+    """Rebuild the daily counters from raw search history (one-off, for existing data)"""
+    day = func.date(SearchHistory.created_at)
+    query = db.query(SearchHistory.query, day, func.count(SearchHistory.id)).group_by(SearchHistory.query, day)
+    if since:
+        query = query.filter(SearchHistory.created_at >= datetime.combine(since, datetime.min.time()))
+
+    counts: Counter = Counter()
+    for text, searched_on, count in query:
+        normalized = normalize_query(text)
+        if not normalized or searched_on is None:
+            continue
+        if isinstance(searched_on, str):
+            searched_on = date.fromisoformat(searched_on[:10])
+        elif isinstance(searched_on, datetime):
+            searched_on = searched_on.date()
+        counts[(normalized, searched_on)] += count
+
+    if since:
+        db.query(SearchQueryStat).filter(SearchQueryStat.day >= since).delete(synchronize_session=False)
+    else:
+        db.query(SearchQueryStat).delete(synchronize_session=False)
+    if counts:
+        _increment_counters(db, counts)
+    db.commit()
+    popular_searches.invalidate()
+    return len(counts)
+
+def compact_search_history(db: Session, retention_days: Optional[int] = None) -> Tuple[int, int]:
+    """Delete raw history past retention and counters past the popularity window.
+
+    Popularity lives in the daily counters, so old raw rows are only needed for
+    "recent searches" and can go. Returns (history rows, counter rows) deleted.
+    """
+    retention_days = retention_days or settings.SEARCH_HISTORY_RETENTION_DAYS
+    history_cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    stats_cutoff = _utc_today() - timedelta(days=settings.POPULAR_SEARCH_WINDOW_DAYS)
+
+    history_deleted = 0
+    while True:
+        ids = [
+            row.id for row in db.query(SearchHistory.id).filter(
+                SearchHistory.created_at < history_cutoff
+            ).limit(COMPACTION_BATCH_SIZE)
+        ]
+        if not ids:
+            break
+        history_deleted += db.query(SearchHistory).filter(
+            SearchHistory.id.in_(ids)
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    stats_deleted = db.query(SearchQueryStat).filter(
+        SearchQueryStat.day < stats_cutoff
+    ).delete(synchronize_session=False)
+    db.commit()
+
+    logger.info(f"Compacted search history: {history_deleted} raw rows, {stats_deleted} counters")
+    return history_deleted, stats_deleted
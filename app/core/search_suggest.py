@@ -0,0 +1,273 @@
+import heapq
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal, on_committed_changes
+from app.core.resources import resources
+from app.core.search_engine import tokenize
+from app.core.search_stats import popular_searches
+from app.models.menu import Category, MenuItem
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_TOP_K = 10  # Largest number of suggestions cached per trie node
+
+# When the same text is a product, a category and a popular query, show it as the product
+SOURCE_PRIORITY = {"product": 0, "category": 1, "query": 2}
+
+def normalize_phrase(value: Optional[str]) -> str:
+    """Normalize text the same way for indexing and lookups"""
+    return " ".join(tokenize(value))
+
+class SuggestionEntry:
+    """A suggestion phrase and the catalog objects / queries it came from"""
+
+    __slots__ = ("phrase", "sources", "weight")
+
+    def __init__(self, phrase: str):
+        self.phrase = phrase
+        self.sources: Dict[str, Tuple[str, Optional[str], float]] = {}  # kind -> (text, id, weight)
+        self.weight = 0.0
+
+    def best_source(self) -> Tuple[str, Tuple[str, Optional[str], float]]:
+        kind = min(self.sources, key=SOURCE_PRIORITY.get)
+        return kind, self.sources[kind]
+
+class _TrieNode:
+    __slots__ = ("children", "phrases", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.phrases: Set[str] = set()
+        self.top: Optional[List[str]] = None  # Cached best phrases in this subtree; None when dirty
+
+class SuggestionTrie:
+    """Prefix trie with a cached top-k per node, updated incrementally"""
+
+    def __init__(self):
+        self._root = _TrieNode()
+        self._entries: Dict[str, SuggestionEntry] = {}
+        self._source_phrases: Dict[Tuple[str, str], str] = {}  # (kind, id) -> phrase
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _keys(phrase: str) -> List[str]:
+        # Index every word start so "shaw" also finds "chicken shawarma"
+        words = phrase.split(" ")
+        return [" ".join(words[i:]) for i in range(len(words))]
+
+    def _walk(self, key: str, create: bool = False) -> Optional[_TrieNode]:
+        node = self._root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[char] = _TrieNode()
+            node = child
+        return node
+
+    def _mark_dirty(self, key: str):
+        node = self._root
+        node.top = None
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return
+            node.top = None
+
+    def set_source(self, kind: str, source_id: str, text: str, weight: float, ref_id: Optional[str] = None):
+        """Add or update the suggestion contributed by a product, category or query"""
+        phrase = normalize_phrase(text)
+        previous = self._source_phrases.get((kind, source_id))
+        if previous is not None and previous != phrase:
+            self.remove_source(kind, source_id)
+        if not phrase:
+            return
+
+        entry = self._entries.get(phrase)
+        if entry is None:
+            entry = self._entries[phrase] = SuggestionEntry(phrase)
+            for key in self._keys(phrase):
+                self._walk(key, create=True).phrases.add(phrase)
+
+        entry.sources[kind] = (text.strip(), ref_id, weight)
+        self._source_phrases[(kind, source_id)] = phrase
+        new_weight = max(source[2] for source in entry.sources.values())
+        if previous != phrase or new_weight != entry.weight:
+            entry.weight = new_weight
+            for key in self._keys(phrase):
+                self._mark_dirty(key)
+
+    def remove_source(self, kind: str, source_id: str):
+        """Drop a product, category or query from the suggestions"""
+        phrase = self._source_phrases.pop((kind, source_id), None)
+        if phrase is None:
+            return
+        entry = self._entries.get(phrase)
+        if entry is None:
+            return
+
+        entry.sources.pop(kind, None)
+        if entry.sources:
+            entry.weight = max(source[2] for source in entry.sources.values())
+        else:
+            del self._entries[phrase]
+            for key in self._keys(phrase):
+                node = self._walk(key)
+                if node is not None:
+                    node.phrases.discard(phrase)
+        for key in self._keys(phrase):
+            self._mark_dirty(key)
+
+    def source_ids(self, kind: str) -> Set[str]:
+        return {source_id for source_kind, source_id in self._source_phrases if source_kind == kind}
+
+    def _rank_key(self, phrase: str):
+        entry = self._entries[phrase]
+        return (entry.weight, -len(phrase))
+
+    def _top(self, node: _TrieNode) -> List[str]:
+        if node.top is None:
+            candidates = set(node.phrases)
+            for child in node.children.values():
+                candidates.update(self._top(child))
+            node.top = heapq.nlargest(SUGGEST_TOP_K, candidates, key=self._rank_key)
+        return node.top
+
+    def suggest(self, prefix: str, limit: int = SUGGEST_TOP_K) -> List[Dict]:
+        """Top suggestions for a prefix, most popular first"""
+        key = normalize_phrase(prefix)
+        if not key:
+            return []
+        node = self._walk(key)
+        if node is None:
+            return []
+
+        suggestions = []
+        for phrase in self._top(node)[:limit]:
+            kind, (text, ref_id, _) = self._entries[phrase].best_source()
+            suggestions.append({"text": text, "type": kind, "id": ref_id})
+        return suggestions
+
+class SuggestionService:
+    """Keeps the suggestion trie in step with the catalog and popular searches"""
+
+    def __init__(self):
+        self._trie = SuggestionTrie()
+        self._lock = threading.Lock()
+        self._built = False
+        self._queries_loaded_at = 0.0
+        self._stale_products: Set[str] = set()
+        self._categories_stale = False
+
+    def suggest(self, db: Session, prefix: str, limit: int = SUGGEST_TOP_K) -> List[Dict]:
+        self.ensure_fresh(db)
+        with self._lock:
+            return self._trie.suggest(prefix, limit)
+
+    def invalidate_products(self, product_ids: Iterable[str]):
+        with self._lock:
+            self._stale_products.update(product_ids)
+            # Category popularity is derived from its products
+            self._categories_stale = True
+
+    def invalidate_categories(self, category_ids: Iterable[str] = ()):
+        with self._lock:
+            self._categories_stale = True
+
+    def reset(self):
+        with self._lock:
+            self._trie = SuggestionTrie()
+            self._built = False
+            self._queries_loaded_at = 0.0
+            self._stale_products.clear()
+            self._categories_stale = False
+
+    def warm_up(self):
+        """Build the suggestion trie before the first keystroke asks for it"""
+        db = SessionLocal()
+        try:
+            self.ensure_fresh(db)
+        finally:
+            db.close()
+
+    def ensure_fresh(self, db: Session):
+        """Apply pending catalog changes and periodically refresh popular searches"""
+        if not self._built:
+            self._load_products(db, None)
+            self._load_categories(db)
+            self._load_queries(db)
+            self._built = True
+            logger.info(f"Suggestion trie built with {len(self._trie)} phrases")
+            return
+
+        if self._stale_products or self._categories_stale:
+            with self._lock:
+                stale_products, self._stale_products = self._stale_products, set()
+                categories_stale, self._categories_stale = self._categories_stale, False
+            if stale_products:
+                self._load_products(db, stale_products)
+            if categories_stale:
+                self._load_categories(db)
+
+        if time.monotonic() - self._queries_loaded_at >= settings.SUGGEST_REFRESH_SECONDS:
+            self._load_queries(db)
+
+    def _load_products(self, db: Session, product_ids: Optional[Set[str]]):
+        query = db.query(MenuItem.id, MenuItem.name, MenuItem.order_count, MenuItem.is_available)
+        if product_ids is not None:
+            query = query.filter(MenuItem.id.in_(product_ids))
+        rows = query.all()
+
+        with self._lock:
+            for row in rows:
+                if row.is_available:
+                    self._trie.set_source("product", row.id, row.name, float(row.order_count or 0), row.id)
+                else:
+                    self._trie.remove_source("product", row.id)
+            if product_ids is not None:
+                for product_id in product_ids - {row.id for row in rows}:
+                    self._trie.remove_source("product", product_id)
+
+    def _load_categories(self, db: Session):
+        popularity = dict(
+            db.query(MenuItem.category_id, func.sum(MenuItem.order_count)).filter(
+                MenuItem.is_available == True
+            ).group_by(MenuItem.category_id).all()
+        )
+        rows = db.query(Category.id, Category.name).all()
+
+        with self._lock:
+            current = {row.id for row in rows}
+            for category_id in self._trie.source_ids("category") - current:
+                self._trie.remove_source("category", category_id)
+            for row in rows:
+                self._trie.set_source("category", row.id, row.name, float(popularity.get(row.id) or 0), row.id)
+
+    def _load_queries(self, db: Session):
+        counts: Dict[str, Tuple[str, float]] = {}
+        for text, score in popular_searches.top_scored(db, settings.SUGGEST_POPULAR_QUERIES):
+            phrase = normalize_phrase(text)
+            if phrase:
+                counts[phrase] = (text, score)
+
+        with self._lock:
+            for phrase in self._trie.source_ids("query") - set(counts):
+                self._trie.remove_source("query", phrase)
+            for phrase, (text, score) in counts.items():
+                self._trie.set_source("query", phrase, text, score)
+            self._queries_loaded_at = time.monotonic()
+
+suggestion_service = SuggestionService()
+
+on_committed_changes(MenuItem, suggestion_service.invalidate_products)
+on_committed_changes(Category, suggestion_service.invalidate_categories)
+resources.register("search-suggestions", warmup=suggestion_service.warm_up)
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
 from typing import Optional
 import logging
+import threading
 from app.core.config import settings
+from app.core.resources import resources
 
 logger = logging.getLogger(__name__)
 
@@ -78,15 +80,7 @@ class MockSMSProvider(SMSProvider):
 
     async def send_sms(self, phone_number: str, message: str) -> bool:
         """Mock SMS - just log the message"""
-        print("=" * 60)
-        print("MOCK SMS PROVIDER - DEVELOPMENT MODE")
-        print("=" * 60)
-        print(f"To: {phone_number}")
-        print(f"Message: {message}")
-        print("")
-        print("✅ SMS sent successfully (mock mode)")
-        print("📝 Use the OTP code shown above to complete registration")
-        print("=" * 60)
+        logger.info(f"MOCK SMS to {phone_number}: {message}", extra={"phone_number": phone_number})
         return True
 
 class ConsoleSMSProvider(SMSProvider):
@@ -94,84 +88,56 @@ class ConsoleSMSProvider(SMSProvider):
 
     async def send_sms(self, phone_number: str, message: str) -> bool:
         """Console SMS - shows OTP in clear format for testing"""
-        print("=" * 80)
-        print("📱 SHAWARMA STOP - OTP VERIFICATION")
-        print("=" * 80)
-        print(f"📞 Phone Number: {phone_number}")
-        print(f"💬 Message: {message}")
-        print("")
-        print("✅ OTP sent to console (development mode)")
-        print("🔄 Copy the verification code above to complete registration")
-        print("=" * 80)
+        logger.info(f"[DEV SMS] To {phone_number}: {message}", extra={"phone_number": phone_number})
         return True
 
 class SMSService:
-    """SMS service manager"""
+    """SMS service manager; the provider (and its client) is built on first use"""
 
     def __init__(self):
-        self.provider: Optional[SMSProvider] = None
-        self._initialize_provider()
+        self._provider: Optional[SMSProvider] = None
+        self._lock = threading.Lock()
+
+    @property
+    def provider(self) -> Optional[SMSProvider]:
+        if self._provider is None:
+            with self._lock:
+                if self._provider is None:
+                    self._initialize_provider()
+        return self._provider
 
     def _initialize_provider(self):
         """Initialize SMS provider based on settings"""
-        print("Initializing SMS Service...")
-        print(f"   SMS_ENABLED: {settings.SMS_ENABLED}")
-        print(f"   SMS_PROVIDER: {settings.SMS_PROVIDER}")
-
         if not settings.SMS_ENABLED:
-            print("   INFO: SMS is disabled. Using console provider for development.")
-            self.provider = ConsoleSMSProvider()
+            logger.info("SMS is disabled, using the console provider")
+            self._provider = ConsoleSMSProvider()
             return
 
         if settings.SMS_PROVIDER.lower() == "twilio":
             if not all([settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN, settings.TWILIO_PHONE_NUMBER]):
-                print("   INFO: Twilio credentials not configured. Using console provider for development.")
-                print("   SETUP: To enable real SMS:")
-                print("      1. Sign up for Twilio account at https://www.twilio.com")
-                print("      2. Get your Account SID, Auth Token, and phone number")
-                print("      3. Set TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_PHONE_NUMBER in .env")
-                print("      4. Install twilio package: pip install twilio")
-                print("")
-                self.provider = ConsoleSMSProvider()
+                logger.info(
+                    "Twilio credentials not configured, using the console provider "
+                    "(set TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_PHONE_NUMBER and install twilio for real SMS)"
+                )
+                self._provider = ConsoleSMSProvider()
             else:
                 try:
-                    self.provider = TwilioSMSProvider()
-                    print("   SUCCESS: Twilio SMS provider initialized")
-                    print(f"      From: {settings.TWILIO_PHONE_NUMBER}")
+                    self._provider = TwilioSMSProvider()
+                    logger.info(f"Twilio SMS provider initialized, from {settings.TWILIO_PHONE_NUMBER}")
                 except ImportError:
-                    print("   WARNING: Twilio package not installed. Using console provider.")
-                    print("      Install with: pip install twilio")
-                    self.provider = ConsoleSMSProvider()
+                    logger.warning("Twilio package not installed (pip install twilio), using the console provider")
+                    self._provider = ConsoleSMSProvider()
                 except Exception as e:
-                    print(f"   ERROR: Twilio initialization failed: {e}")
-                    print("      Using console provider as fallback.")
-                    self.provider = ConsoleSMSProvider()
+                    logger.error(f"Twilio initialization failed, using the console provider: {e}")
+                    self._provider = ConsoleSMSProvider()
         else:
-            print(f"   WARNING: Unknown SMS provider: {settings.SMS_PROVIDER}. Using console provider.")
-            self.provider = ConsoleSMSProvider()
-
-        print(f"   Final provider: {type(self.provider).__name__}")
-        print("=" * 70)
+            logger.warning(f"Unknown SMS provider {settings.SMS_PROVIDER}, using the console provider")
+            self._provider = ConsoleSMSProvider()
 
     async def send_otp(self, phone_number: str, otp_code: str) -> bool:
         """Send OTP via SMS (Primary) or WhatsApp (Fallback)"""
         message = f"Your Shawarma Stop verification code is: {otp_code}. Valid for 10 minutes."
 
-        # For development providers, show clear OTP information
-        if isinstance(self.provider, (MockSMSProvider, ConsoleSMSProvider)):
-            print("=" * 80)
-            print("SHAWARMA STOP - OTP VERIFICATION CODE")
-            print("=" * 80)
-            print(f"Phone: {phone_number}")
-            print(f"OTP Code: {otp_code}")
-            print(f"Valid for: 10 minutes")
-            print("")
-            print("DEVELOPMENT MODE:")
-            print("   - This OTP appears in the console for testing")
-            print("   - Copy this code to complete registration")
-            print("   - In production, this will be sent via SMS")
-            print("=" * 80)
-
         # Try SMS first (higher priority)
         sms_sent = await self.send_sms(phone_number, message)
         if sms_sent:
@@ -213,3 +179,6 @@ class SMSService:
 
 # Global SMS service instance
 sms_service = SMSService()
+
+# Build the provider client before serving instead of on the first request
+resources.register("sms", warmup=lambda: sms_service.provider)
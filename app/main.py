@@ -1,15 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.log_config import configure_logging
+from app.core.metrics import MetricsMiddleware, metrics, pool_metric_lines
+from app.core.resources import resources
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# JSON lines to stdout, written off the request path by a queue listener thread
+configure_logging()
+
+# The schema is managed by Alembic: run `python migrate.py` before starting the API
 
 app = FastAPI(
     title="Shawarma Stop API",
     description="Backend API for Shawarma Stop - Admin Panel & Mobile App",
-    version="2.0.0"
+    version="2.0.0",
+    # Warms up the DB pool, provider clients and caches before serving; drains them on shutdown
+    lifespan=resources.lifespan
 )
 
 # CORS Middleware
@@ -21,6 +28,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so CORS preflights and error responses are measured too
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Import and include routers
 from app.api.v1 import (
     addresses, admin, auth, cart, categories, chat, customers, dashboard,
@@ -29,6 +40,9 @@ from app.api.v1 import (
     search, sms_webhook, staff, transactions, user
 )
 
+# Award loyalty points whenever a commit moves an order to delivered
+from app.core import loyalty_accrual  # noqa: F401
+
 # Include all API routers
 app.include_router(addresses.router, prefix="/api", tags=["Addresses"])
 app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
@@ -58,10 +72,31 @@ app.include_router(user.router, prefix="/api/user", tags=["User"])
 
 @app.get("/")
 async def root():
-    print("DEBUG: Root endpoint called!")
     return {"message": "Shawarma Stop API", "version": "2.0.0"}
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", "ready": resources.ready, "resources": resources.status()}
+
+@app.get("/metrics/db-pool")
+async def db_pool_metrics():
+    """Connection pool occupancy (checked out, overflow) and checkout wait times"""
+    from app.core.database import engine, replica_router
+    from app.core.db_pool import pool_stats
+    stats = pool_stats(engine)
+    if replica_router.engines:
+        stats["readReplicas"] = replica_router.status()
+    return stats
+
+def _pool_metrics():
+    from app.core.database import engine, replica_router
+    pools = {"primary": engine}
+    pools.update({f"replica-{index}": replica for index, replica in enumerate(replica_router.engines)})
+    return pool_metric_lines(pools)
+
+metrics.add_collector(_pool_metrics)
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics():
+    """Request and DB pool metrics in the Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -6,8 +6,8 @@ from app.models.review import Review
 from app.models.transaction import Transaction
 from app.models.role import Role, Permission
 from app.models.user import (
-    User, OTP, Address, CartItem, Favorite, Notification, NotificationSettings,
-    LoyaltyPoint, Reward, SearchHistory, PaymentCard, PromoCode,
+    User, OTP, Address, CartItem, CartTotals, Favorite, Notification, NotificationSettings,
+    LoyaltyPoint, LoyaltyBalance, Reward, SearchHistory, SearchQueryStat, PaymentCard, PromoCode,
     Chat, ChatParticipant, ChatMessage
 )
 
@@ -29,12 +29,15 @@ __all__ = [
     "OTP",
     "Address",
     "CartItem",
+    "CartTotals",
     "Favorite",
     "Notification",
     "NotificationSettings",
     "LoyaltyPoint",
+    "LoyaltyBalance",
     "Reward",
     "SearchHistory",
+    "SearchQueryStat",
     "PaymentCard",
     "PromoCode",
     "Chat",
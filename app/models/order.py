@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Enum, Text, JSON
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Enum, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -56,6 +56,15 @@ class Order(Base):
     branch = Column(String(255))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # Customer order history, newest first (optionally filtered by status)
+        Index("ix_orders_user_id_created_at", "user_id", "created_at"),
+        # Admin listings and exports filtered by status / branch, newest first
+        Index("ix_orders_status_created_at", "status", "created_at"),
+        Index("ix_orders_branch_created_at", "branch", "created_at"),
+        Index("ix_orders_created_at", "created_at"),
+    )
     
     # Relationships
     user = relationship("User", foreign_keys=[user_id], back_populates="orders")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -27,6 +27,12 @@ class Transaction(Base):
     transaction_id = Column(String(100), nullable=True)  # External transaction ID
     branch = Column(String(255))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Filtered listings and exports scan a created_at range within one branch / status
+        Index("ix_transactions_branch_created_at", "branch", "created_at"),
+        Index("ix_transactions_status_created_at", "status", "created_at"),
+    )
     
     # Relationships
     order = relationship("Order", back_populates="transaction")
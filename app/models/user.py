@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime, Text, Boolean, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -47,6 +47,12 @@ class OTP(Base):
     expires_at = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Active-OTP lookups during send / verify, by phone or by email
+        Index("ix_otps_phone_purpose_expires_at", "phone_number", "purpose", "expires_at"),
+        Index("ix_otps_email_purpose_expires_at", "email", "purpose", "expires_at"),
+    )
+
 class Address(Base):
     __tablename__ = "addresses"
     
@@ -74,13 +80,41 @@ class CartItem(Base):
     quantity = Column(Integer, default=1)
     customizations = Column(Text)  # JSON string for customizations
     add_ons = Column(Text)  # JSON string for add-ons
+    line_key = Column(String(64), nullable=True)  # Hash of product + normalized customizations/add-ons
+    unit_price = Column(Float, nullable=True)  # Product price the cart totals were computed with
+    add_ons_total = Column(Float, default=0.0)  # Add-on price * quantity, per unit of this line
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        # Adding the same product with the same options bumps the quantity of one line;
+        # leading with user_id, it also serves every "this user's cart" lookup
+        UniqueConstraint("user_id", "line_key", name="uq_cart_items_user_line"),
+    )
+
     # Relationships
     user = relationship("User", back_populates="cart_items")
     product = relationship("MenuItem", foreign_keys=[product_id])
 
+class CartTotals(Base):
+    __tablename__ = "cart_totals"
+
+    id = Column(String(36), primary_key=True, index=True)
+    user_id = Column(String(36), ForeignKey("users.id"), unique=True, nullable=False)
+    item_count = Column(Integer, default=0)  # Number of cart lines
+    items_subtotal = Column(Float, default=0.0)  # Sum of unit_price * quantity
+    add_ons_total = Column(Float, default=0.0)  # Sum of line add-ons * quantity
+    subtotal = Column(Float, default=0.0)
+    delivery_fee = Column(Float, default=0.0)
+    platform_fee = Column(Float, default=0.0)
+    gst = Column(Float, default=0.0)  # GST before any promo discount
+    total = Column(Float, default=0.0)  # Total before any promo discount
+    is_stale = Column(Boolean, default=False)  # Set when a product price in the cart changed
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    user = relationship("User", foreign_keys=[user_id])
+
 class Favorite(Base):
     __tablename__ = "favorites"
 
@@ -88,6 +122,10 @@ class Favorite(Base):
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
     product_id = Column(String(36), ForeignKey("products.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_favorites_user_id_product_id", "user_id", "product_id"),
+    )
     
     # Relationships
     user = relationship("User", back_populates="favorites")
@@ -104,6 +142,12 @@ class Notification(Base):
     data = Column(Text)  # JSON string for additional data
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Notification list newest first, and the unread list / count
+        Index("ix_notifications_user_id_created_at", "user_id", "created_at"),
+        Index("ix_notifications_user_id_is_read_created_at", "user_id", "is_read", "created_at"),
+    )
     
     # Relationships
     user = relationship("User", back_populates="notifications")
@@ -134,11 +178,32 @@ class LoyaltyPoint(Base):
     description = Column(Text)
     order_id = Column(String(36), ForeignKey("orders.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # An order earns points once, however often its accrual is retried
+        UniqueConstraint("order_id", "type", name="uq_loyalty_points_order_type"),
+        # Per-user ledger sums by entry type
+        Index("ix_loyalty_points_user_id_type", "user_id", "type"),
+    )
     
     # Relationships
     user = relationship("User", back_populates="loyalty_points")
     order = relationship("Order", foreign_keys=[order_id])
 
+class LoyaltyBalance(Base):
+    __tablename__ = "loyalty_balances"
+
+    id = Column(String(36), primary_key=True, index=True)
+    user_id = Column(String(36), ForeignKey("users.id"), unique=True, nullable=False)
+    earned_points = Column(Integer, default=0)  # Sum of 'earned' ledger entries
+    used_points = Column(Integer, default=0)  # Sum of 'used' ledger entries
+    available_points = Column(Integer, default=0)  # earned_points - used_points
+    visits = Column(Integer, default=0)  # Number of orders placed
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    user = relationship("User", foreign_keys=[user_id])
+
 class Reward(Base):
     __tablename__ = "rewards"
     
@@ -161,6 +226,18 @@ class SearchHistory(Base):
     # Relationships
     user = relationship("User", back_populates="search_history")
 
+class SearchQueryStat(Base):
+    __tablename__ = "search_query_stats"
+    __table_args__ = (
+        UniqueConstraint("query", "day", name="uq_search_query_stats_query_day"),
+    )
+
+    id = Column(String(36), primary_key=True, index=True)
+    query = Column(String(255), nullable=False)  # Normalized search text
+    day = Column(Date, nullable=False, index=True)  # UTC day the searches happened
+    count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 class PaymentCard(Base):
     __tablename__ = "payment_cards"
     
@@ -199,6 +276,12 @@ class ChatParticipant(Base):
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
     role = Column(String(50), default="member")  # 'admin', 'member'
     joined_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # A user's chats and the membership check; the other participants of a chat
+        Index("ix_chat_participants_user_id_chat_id", "user_id", "chat_id"),
+        Index("ix_chat_participants_chat_id", "chat_id"),
+    )
     
     # Relationships
     chat = relationship("Chat", back_populates="participants")
@@ -214,6 +297,11 @@ class ChatMessage(Base):
     type = Column(String(50), default="text")  # 'text', 'image', 'file'
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Message pages and the last message of a chat
+        Index("ix_chat_messages_chat_id_created_at", "chat_id", "created_at"),
+    )
     
     # Relationships
     chat = relationship("Chat", back_populates="messages")
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Maintenance script for loyalty accrual: awards points to delivered orders
+that never earned any, in chunks
+
+Run `python migrate.py` first; accrual relies on the unique (order_id, type)
+ledger constraint and the loyalty_balances table from the migrations.
+Safe to re-run at any time; orders that already earned are skipped.
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal
+from app.core.loyalty_accrual import BACKFILL_CHUNK_SIZE, backfill_accruals
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill loyalty points for delivered orders")
+    parser.add_argument("--since", type=str, default=None, help="Only orders created on/after this date (YYYY-MM-DD)")
+    parser.add_argument("--chunk-size", type=int, default=BACKFILL_CHUNK_SIZE, help="Orders accrued per transaction")
+    args = parser.parse_args()
+
+    since = datetime.strptime(args.since, "%Y-%m-%d") if args.since else None
+
+    db = SessionLocal()
+    try:
+        stats = backfill_accruals(db, since=since, chunk_size=args.chunk_size)
+        print(f"Backfilled {stats['orders']} delivered orders, {stats['points']} points awarded")
+        return True
+    except Exception as e:
+        db.rollback()
+        print(f"ERROR: Loyalty backfill failed: {e}")
+        return False
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Check that the streaming exports run in constant memory
+
+Seeds a throwaway SQLite database with synthetic transactions, streams
+GET /api/transactions/export through the ASGI app without keeping the body,
+and compares resident memory early in the stream with its peak.
+
+Usage: python benchmark_exports.py [--rows 1000000] [--format csv|ndjson] [--max-growth-mb 32]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+SEED_BATCH_SIZE = 50000
+BRANCHES = ["DHA Phase 4", "Main PIA Road", "Lake City"]
+METHODS = ["Cash", "Card (VISA)", "Card (Master)", "Meezan Bank Transfer"]
+STATUSES = ["Completed", "Completed", "Completed", "Pending", "Refund"]
+
+def rss_mb() -> float:
+    """Current resident set size (peak RSS where /proc isn't available)"""
+    try:
+        with open("/proc/self/status") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def seed(engine, rows: int):
+    from app.models.order import Order
+    from app.models.transaction import Transaction
+
+    rng = random.Random(42)
+    start = datetime.utcnow() - timedelta(days=365)
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        for offset in range(0, rows, SEED_BATCH_SIZE):
+            count = min(SEED_BATCH_SIZE, rows - offset)
+            orders, transactions = [], []
+            for i in range(offset, offset + count):
+                created_at = start + timedelta(seconds=i * 30)
+                total = round(rng.uniform(300, 5000), 2)
+                orders.append({"id": f"o{i}", "order_number": f"ORD-{i:07d}", "subtotal": total, "total": total,
+                               "status": "delivered", "created_at": created_at})
+                transactions.append({"id": f"t{i}", "order_id": f"o{i}", "amount": total,
+                                     "payment_method": rng.choice(METHODS), "status": rng.choice(STATUSES),
+                                     "branch": rng.choice(BRANCHES), "created_at": created_at})
+            conn.execute(Order.__table__.insert(), orders)
+            conn.execute(Transaction.__table__.insert(), transactions)
+    print(f"Seeded {rows} orders + transactions in {time.perf_counter() - started:.1f}s")
+
+async def stream(app, path: str, query: str, total_rows: int):
+    """Drive the ASGI app directly, counting and discarding the body"""
+    stats = {"bytes": 0, "lines": 0, "status": None, "baseline": None, "peak": 0.0}
+    warmup_lines = max(total_rows // 10, 1)
+    finished = asyncio.Event()
+    request_sent = False
+
+    async def receive():
+        # The request body once, then block like a connected client until the response ends
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            stats["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            if not message.get("more_body", False):
+                finished.set()
+            body = message.get("body", b"")
+            stats["bytes"] += len(body)
+            stats["lines"] += body.count(b"\n")
+            if stats["baseline"] is None and stats["lines"] >= warmup_lines:
+                stats["baseline"] = rss_mb()
+            stats["peak"] = max(stats["peak"], rss_mb())
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query.encode(), "headers": [], "client": ("127.0.0.1", 0), "server": ("test", 80)
+    }
+    await app(scope, receive, send)
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memory while streaming a large export")
+    parser.add_argument("--rows", type=int, default=1000000, help="Synthetic transactions to export")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+    parser.add_argument("--max-growth-mb", type=float, default=32.0, help="Allowed RSS growth after warm-up")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="export-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'export_bench.db')}"
+
+    from app.main import app
+    from app.core.database import Base, engine
+
+    Base.metadata.create_all(bind=engine)
+    seed(engine, args.rows)
+
+    started = time.perf_counter()
+    stats = asyncio.run(stream(app, "/api/transactions/export", f"format={args.format}", args.rows))
+    elapsed = time.perf_counter() - started
+
+    growth = stats["peak"] - (stats["baseline"] or stats["peak"])
+    print(f"Status {stats['status']}: {stats['lines'] - (1 if args.format == 'csv' else 0)} rows, "
+          f"{stats['bytes'] / 1024 / 1024:.1f} MB in {elapsed:.1f}s "
+          f"({args.rows / max(elapsed, 1e-9):,.0f} rows/s)")
+    print(f"RSS after warm-up {stats['baseline'] or 0:.1f} MB, peak {stats['peak']:.1f} MB, growth {growth:.1f} MB")
+
+    ok = stats["status"] == 200 and growth <= args.max_growth_mb
+    print("PASS" if ok else f"FAIL: RSS grew more than {args.max_growth_mb} MB")
+    return ok
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
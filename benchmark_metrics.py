@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Measure the per-request cost of the metrics middleware
+
+Builds two identical FastAPI apps, one wrapped in MetricsMiddleware, and
+drives both through ASGI directly (no sockets, so the middleware isn't hidden
+behind network noise). Two routes are timed: an async one that does no work
+and a sync one running a few SQL statements, which also exercises the DB
+query timers. Rounds alternate between the apps and the best round counts.
+Fails when the added latency per request exceeds the threshold.
+
+Usage: python benchmark_metrics.py [--requests 5000] [--rounds 5] [--max-overhead-us 50]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+QUERIES_PER_REQUEST = 5
+
+def build_app(instrumented: bool):
+    from fastapi import FastAPI
+    from sqlalchemy import create_engine, text
+    from app.core.metrics import MetricsMiddleware
+
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+
+    @app.get("/ping/{item_id}")
+    async def ping(item_id: str):
+        return {"id": item_id}
+
+    @app.get("/query")
+    def query():
+        with engine.connect() as connection:
+            return {"values": [connection.execute(text("SELECT 1")).scalar() for _ in range(QUERIES_PER_REQUEST)]}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+async def request(app, path: str):
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("127.0.0.1", 0), "server": ("test", 80)
+    }
+    await app(scope, receive, send)
+    if status != 200:
+        raise RuntimeError(f"GET {path} returned {status}")
+
+async def time_requests(app, path: str, count: int) -> float:
+    """Mean seconds per request over count sequential requests"""
+    started = time.perf_counter()
+    for _ in range(count):
+        await request(app, path)
+    return (time.perf_counter() - started) / count
+
+async def run(args):
+    apps = {"plain": build_app(False), "metrics": build_app(True)}
+    results = {}
+    for path in ("/ping/42", "/query"):
+        for app in apps.values():
+            await time_requests(app, path, min(args.requests, 500))  # Warm up both
+        best = {name: float("inf") for name in apps}
+        for _ in range(args.rounds):
+            for name, app in apps.items():
+                best[name] = min(best[name], await time_requests(app, path, args.requests))
+        results[path] = best
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the metrics middleware's overhead per request")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--max-overhead-us", type=float, default=50.0, help="Allowed added latency per request")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    ok = True
+    for path, best in results.items():
+        overhead_us = (best["metrics"] - best["plain"]) * 1e6
+        print(f"GET {path}: {best['plain'] * 1e6:.0f} us plain, {best['metrics'] * 1e6:.0f} us with metrics, "
+              f"overhead {overhead_us:.1f} us ({overhead_us / (best['plain'] * 1e6) * 100:.1f}%)")
+        ok = ok and overhead_us <= args.max_overhead_us
+
+    print("PASS" if ok else f"FAIL: metrics middleware adds more than {args.max_overhead_us:.0f} us per request")
+    return ok
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark the in-memory product search index on a synthetic catalog
+
+Usage: python benchmark_search.py [--products 100000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.search_engine import InvertedIndex
+
+ADJECTIVES = ["spicy", "crispy", "classic", "grilled", "smoky", "garlic", "cheesy", "zinger", "tandoori", "peri"]
+PROTEINS = ["chicken", "beef", "lamb", "falafel", "paneer", "mutton", "fish", "turkey"]
+DISHES = ["shawarma", "wrap", "platter", "burger", "roll", "bowl", "sandwich", "fries", "pizza", "salad"]
+EXTRAS = ["with", "extra", "sauce", "pickles", "hummus", "tahini", "salad", "bread", "rice", "family", "deal"]
+QUERIES = ["chicken", "chick", "shawarma", "chiken shawarma", "beef wrap", "spicy", "garlic sauce", "falafl", "platter rice"]
+
+def synthetic_catalog(count: int, seed: int = 42):
+    """Generate (id, name, description, category_id, order_count, rating) rows"""
+    rng = random.Random(seed)
+    for i in range(count):
+        name = f"{rng.choice(ADJECTIVES)} {rng.choice(PROTEINS)} {rng.choice(DISHES)} {i % 997}"
+        description = " ".join(rng.choice(EXTRAS) for _ in range(rng.randint(4, 12)))
+        # Zipf-ish popularity so ranking boosts matter
+        order_count = int(10000 / (1 + rng.paretovariate(1.2)))
+        yield (f"p{i}", name, description, f"c{i % 25}", order_count, round(rng.uniform(2.5, 5.0), 1))
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def run(products: int, queries: int):
+    catalog = list(synthetic_catalog(products))
+
+    started = time.perf_counter()
+    index = InvertedIndex()
+    for row in catalog:
+        index.add(*row)
+    build_seconds = time.perf_counter() - started
+    print(f"Indexed {len(index)} products in {build_seconds:.2f}s")
+
+    rng = random.Random(7)
+    timings = {}
+    for _ in range(queries):
+        query = rng.choice(QUERIES)
+        started = time.perf_counter()
+        index.search(query, limit=20)
+        timings.setdefault(query, []).append((time.perf_counter() - started) * 1000)
+
+    # Baseline: what ILIKE '%q%' does, a substring scan over every row
+    scan_timings = []
+    for query in QUERIES:
+        needle = query.lower()
+        started = time.perf_counter()
+        [row for row in catalog if needle in row[1].lower() or needle in row[2].lower()]
+        scan_timings.append((time.perf_counter() - started) * 1000)
+
+    print(f"{'query':<20} {'hits':>7} {'p50 ms':>8} {'p95 ms':>8}")
+    for query in QUERIES:
+        total, _ = index.search(query, limit=20)
+        samples = timings.get(query, [0.0])
+        print(f"{query:<20} {total:>7} {percentile(samples, 50):>8.2f} {percentile(samples, 95):>8.2f}")
+    print(f"Substring scan baseline: p50 {percentile(scan_timings, 50):.2f} ms per query")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the in-memory product search index")
+    parser.add_argument("--products", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.products, args.queries)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Measure API cold start: importing app.main in a fresh interpreter
+
+Each run is a new process, like a worker boot or a --reload round trip, and
+reports the import time and how many database connections and SQL statements
+it took before the app could serve (over a network each one costs round trips).
+
+Usage: python benchmark_startup.py [--runs 10] [--database-url sqlite:///./shawarma_local.db]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import json, time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+statements, connections = [], []
+event.listen(Engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+event.listen(Pool, "connect", lambda *args: connections.append(1))
+started = time.perf_counter()
+import app.main
+print("STARTUP " + json.dumps({
+    "seconds": time.perf_counter() - started, "statements": len(statements), "connections": len(connections)
+}))
+"""
+
+def cold_start(database_url):
+    env = dict(os.environ)
+    if database_url:
+        env["DATABASE_URL"] = database_url
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    line = next(line for line in result.stdout.splitlines() if line.startswith("STARTUP "))
+    return json.loads(line[len("STARTUP "):])
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure app import (cold start) time")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--database-url", help="Database the app starts against (default: app settings)")
+    args = parser.parse_args()
+
+    cold_start(args.database_url)  # Warm the OS file cache and .pyc files
+    runs = [cold_start(args.database_url) for _ in range(args.runs)]
+    seconds = sorted(run["seconds"] for run in runs)
+    print(
+        f"Cold start over {args.runs} runs: median {statistics.median(seconds) * 1000:.0f} ms, "
+        f"min {seconds[0] * 1000:.0f} ms, max {seconds[-1] * 1000:.0f} ms, "
+        f"{runs[-1]['connections']} DB connections and {runs[-1]['statements']} SQL statements at import"
+    )
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
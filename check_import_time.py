@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Enforce the import-time budget of the API (python -X importtime)
+
+Imports app.main in a fresh interpreter with -X importtime, prints the slowest
+modules and fails when the cumulative import time exceeds the budget, or when a
+provider SDK / HTTP client that should only load on first use (Twilio, SendGrid,
+google-auth, requests) is imported by app.main. Run it in CI next to the other checks.
+
+Usage: python check_import_time.py [--budget-ms 2500] [--top 15] [--runs 3]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Loaded lazily by the services that need them, never at app import
+LAZY_MODULES = ["twilio", "sendgrid", "google.auth", "google.oauth2", "requests", "smtplib"]
+
+PROBE = """
+import sys
+import app.main
+lazy = {lazy!r}
+print("EAGER " + ",".join(m for m in lazy if m in sys.modules))
+"""
+
+def profile_import():
+    """({module: (self_us, cumulative_us)}, eagerly imported lazy modules) for one cold import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(lazy=LAZY_MODULES)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        timings[module.strip()] = (int(self_us), int(cumulative_us))
+    eager_line = next(line for line in result.stdout.splitlines() if line.startswith("EAGER "))
+    eager = [module for module in eager_line[len("EAGER "):].split(",") if module]
+    return timings, eager
+
+def main():
+    parser = argparse.ArgumentParser(description="Check app.main import time against a budget")
+    parser.add_argument("--budget-ms", type=float, default=2500.0, help="Max cumulative import time of app.main")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    parser.add_argument("--runs", type=int, default=3, help="Cold imports to take the best of")
+    args = parser.parse_args()
+
+    runs = [profile_import() for _ in range(max(args.runs, 1))]
+    timings, eager = min(runs, key=lambda run: run[0].get("app.main", (0, 0))[1])
+    total_ms = timings.get("app.main", (0, 0))[1] / 1000
+
+    print(f"Slowest modules (cumulative, best of {len(runs)} runs):")
+    for module, (self_us, cumulative_us) in sorted(timings.items(), key=lambda item: -item[1][1])[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {module}")
+    print(f"app.main imported in {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+
+    ok = True
+    if total_ms > args.budget_ms:
+        print(f"FAIL: import time over budget by {total_ms - args.budget_ms:.0f} ms")
+        ok = False
+    if eager:
+        print(f"FAIL: imported at startup instead of on first use: {', '.join(eager)}")
+        ok = False
+    if ok:
+        print("PASS")
+    return ok
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
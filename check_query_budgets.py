@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Query budgets for the hot endpoints
+
+Seeds a throwaway SQLite database (categories, products, reviews, orders,
+transactions, favorites, a menu section), calls each endpoint through the app
+and fails when it executes more statements than its budget. Statement shapes
+repeated within one call are listed, which is how an N+1 shows up.
+
+Budgets follow the intended query shape (one statement per table an endpoint
+reads, plus the authenticated user), not the seeded row counts. Endpoints that
+still have a known N+1 carry a debt note: they are reported over budget without
+failing, and fail once they fit, so the note is dropped when the N+1 is fixed.
+tests/test_query_budgets.py runs the same table under pytest.
+
+Usage: python check_query_budgets.py [--verbose]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+CATEGORIES = 4
+PRODUCTS_PER_CATEGORY = 5
+REVIEWS_PER_PRODUCT = 3
+ORDERS = 30
+
+# (path, auth, max queries, debt) - auth is None, "user" or "admin"; debt describes
+# a known N+1 that is tolerated until fixed
+BUDGETS = [
+    ("/api/categories/", None, 1, None),
+    ("/api/products/", None, 3, "reviews and category loaded per product"),
+    ("/api/products/recommended", None, 3, "reviews and category loaded per product"),
+    ("/api/products/high-demand", None, 1, None),
+    ("/api/products/family-deals", None, 1, None),
+    ("/api/menu/items", None, 2, "category loaded per item"),
+    ("/api/menu/sections", None, 3, "product and category loaded per section item"),
+    ("/api/favorites/favorites", "user", 3, "product and reviews loaded per favorite"),
+    ("/api/mobile/orders/", "user", 4, "items and products loaded per order"),
+    ("/api/transactions/", None, 1, None),
+    ("/api/dashboard/stats", None, 10, None),  # One aggregate per card
+    ("/api/dashboard/top-customers", None, 1, None),
+    ("/api/admin/admin/users", "admin", 4, None),
+    ("/api/admin/admin/orders", "admin", 4, None),
+]
+
+def seed(db):
+    """Seed rows for every endpoint above; returns (user id, admin id)"""
+    from app.models import (
+        Category, Favorite, MenuItem, MenuSection, MenuSectionItem, Order, OrderItem, Review, Transaction, User
+    )
+
+    def new_id():
+        return str(uuid.uuid4())
+
+    user = User(id=new_id(), name="Budget User", email="budget@example.com", phone_number="+920000000001")
+    admin = User(id=new_id(), name="Budget Admin", email="admin@example.com", is_admin=True)
+    db.add_all([user, admin])
+
+    products = []
+    section = MenuSection(id=new_id(), name="Deals")
+    db.add(section)
+    for c in range(CATEGORIES):
+        category = Category(id=new_id(), name=f"Category {c}" if c else "Family Deals")
+        db.add(category)
+        for p in range(PRODUCTS_PER_CATEGORY):
+            product = MenuItem(id=new_id(), name=f"Product {c}-{p}", category_id=category.id, price=500 + p * 50)
+            products.append(product)
+            db.add(product)
+            db.add(MenuSectionItem(id=new_id(), section_id=section.id, menu_item_id=product.id))
+            for r in range(REVIEWS_PER_PRODUCT):
+                db.add(Review(id=new_id(), product_id=product.id, user_id=user.id, rating=1 + (p + r) % 5, comment="ok"))
+    db.flush()
+
+    for product in products[::2]:
+        db.add(Favorite(id=new_id(), user_id=user.id, product_id=product.id))
+
+    now = datetime.utcnow()
+    for o in range(ORDERS):
+        total = 1000 + o * 10
+        order = Order(
+            id=new_id(), order_number=f"BUDGET-{o:04d}", user_id=user.id, status="delivered" if o % 3 else "pending",
+            subtotal=total, total=total, branch="DHA Phase 4", created_at=now - timedelta(hours=o)
+        )
+        db.add(order)
+        for product in products[o % len(products):o % len(products) + 2]:
+            db.add(OrderItem(id=new_id(), order_id=order.id, menu_item_id=product.id, item_name=product.name,
+                             quantity=1, price=product.price))
+        db.add(Transaction(id=new_id(), order_id=order.id, amount=total, payment_method="Cash", status="Completed",
+                           branch="DHA Phase 4", created_at=order.created_at))
+    db.commit()
+    return user.id, admin.id
+
+def seeded_client():
+    """(TestClient, headers by auth) for the app on a freshly seeded throwaway SQLite database.
+
+    Must run before anything imports the app, which reads DATABASE_URL once.
+    """
+    workdir = tempfile.mkdtemp(prefix="query-budgets-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'budgets.db')}"
+
+    from fastapi.testclient import TestClient
+    from app.core.database import Base, SessionLocal, engine
+    from app.core.security import create_access_token
+    from app.main import app
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user_id, admin_id = seed(db)
+    finally:
+        db.close()
+
+    headers = {
+        None: {},
+        "user": {"Authorization": f"Bearer {create_access_token({'sub': user_id})}"},
+        "admin": {"Authorization": f"Bearer {create_access_token({'sub': admin_id})}"},
+    }
+    return TestClient(app), headers
+
+def main():
+    parser = argparse.ArgumentParser(description="Check statement counts of the hot endpoints against budgets")
+    parser.add_argument("--verbose", action="store_true", help="List repeated statements of passing endpoints too")
+    args = parser.parse_args()
+
+    client, headers = seeded_client()
+    from app.core.query_profiler import profile_queries
+
+    failures = 0
+    for path, auth, budget, debt in BUDGETS:
+        with profile_queries(path) as profile:
+            response = client.get(path, headers=headers[auth])
+        over = profile.queries > budget
+        if response.status_code != 200 or (over and not debt):
+            status = "FAIL"
+        elif debt and not over:
+            status = "FAIL"  # Fixed: drop the debt note so the budget holds from now on
+        else:
+            status = "debt" if over else "ok  "
+        failures += status == "FAIL"
+        note = f" - N+1 debt: {debt}" if debt else ""
+        print(f"{status} GET {path}: {profile.queries} queries (budget {budget}), HTTP {response.status_code}{note}")
+        if over or args.verbose:
+            for count, statement in profile.repeated(2):
+                print(f"       {count}x {' '.join(statement.split())[:160]}")
+
+    print("PASS" if not failures else f"FAIL: {failures} endpoints over budget, failing or with a stale debt note")
+    return not failures
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Maintenance script for search history
+- --backfill rebuilds the daily popular-search counters from raw history (run once after upgrading)
+- compaction deletes raw history past SEARCH_HISTORY_RETENTION_DAYS and counters past the popularity window
+
+Schedule it daily, e.g. from cron: python compact_search_history.py
+"""
+
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal
+from app.core.search_stats import backfill_search_stats, compact_search_history
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill and compact search history")
+    parser.add_argument("--backfill", action="store_true", help="Rebuild daily counters from raw history first")
+    parser.add_argument("--retention-days", type=int, default=None, help="Override SEARCH_HISTORY_RETENTION_DAYS")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.backfill:
+            counters = backfill_search_stats(db)
+            print(f"Backfilled {counters} daily search counters")
+
+        history_deleted, stats_deleted = compact_search_history(db, args.retention_days)
+        print(f"Deleted {history_deleted} raw search history rows and {stats_deleted} expired counters")
+        return True
+    except Exception as e:
+        db.rollback()
+        print(f"ERROR: Search history maintenance failed: {e}")
+        return False
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,12 @@
+import pytest
+
+@pytest.fixture
+def assert_max_queries():
+    """Query budget for a block of a test:
+
+        def test_products(client, assert_max_queries):
+            with assert_max_queries(6):
+                client.get("/api/products/")
+    """
+    from app.core.query_profiler import assert_max_queries as budget
+    return budget
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Check that the hot router queries are served by the intended indexes
+
+Builds each query the way its router does, runs EXPLAIN on it and fails when
+the plan doesn't mention the expected index. Without --database-url it runs
+against a throwaway SQLite database built from the models; point it at a
+migrated PostgreSQL database (alembic upgrade head) to check production plans.
+On PostgreSQL sequential scans are disabled for the check, since near-empty
+tables would otherwise always be scanned.
+
+Usage: python explain_hot_queries.py [--database-url postgresql://...] [--verbose]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+OTHER_ID = "00000000-0000-0000-0000-000000000002"
+
+def hot_queries(db):
+    """(label, acceptable index names, query) for the queries the indexes exist for"""
+    from sqlalchemy import func
+    from app.models import (
+        CartItem, ChatMessage, ChatParticipant, Favorite, LoyaltyPoint, Notification, OTP, Order, Review,
+        Transaction
+    )
+    now = datetime.utcnow()
+    return [
+        ("mobile order history", ["ix_orders_user_id_created_at"],
+         db.query(Order).filter(Order.user_id == USER_ID).order_by(Order.created_at.desc()).limit(20)),
+        ("admin orders by status", ["ix_orders_status_created_at"],
+         db.query(Order).filter(Order.status == "pending").order_by(Order.created_at.desc()).limit(20)),
+        ("admin orders by branch", ["ix_orders_branch_created_at"],
+         db.query(Order).filter(Order.branch == "DHA Phase 4").order_by(Order.created_at.desc()).limit(20)),
+        ("admin order listing", ["ix_orders_created_at"],
+         db.query(Order).order_by(Order.created_at.desc()).limit(20)),
+        ("notification list", ["ix_notifications_user_id_created_at"],
+         db.query(Notification).filter(Notification.user_id == USER_ID)
+         .order_by(Notification.created_at.desc()).limit(20)),
+        ("unread notification count", ["ix_notifications_user_id_is_read_created_at"],
+         db.query(func.count(Notification.id)).filter(
+             Notification.user_id == USER_ID, Notification.is_read == False)),
+        ("cart lines", ["uq_cart_items_user_line", "sqlite_autoindex_cart_items_"],
+         db.query(CartItem).filter(CartItem.user_id == USER_ID)),
+        ("favorite check", ["ix_favorites_user_id_product_id"],
+         db.query(Favorite).filter(Favorite.user_id == USER_ID, Favorite.product_id == OTHER_ID)),
+        ("product reviews", ["ix_reviews_product_id_created_at"],
+         db.query(Review).filter(Review.product_id == OTHER_ID)),
+        ("last chat message", ["ix_chat_messages_chat_id_created_at"],
+         db.query(ChatMessage).filter(ChatMessage.chat_id == OTHER_ID)
+         .order_by(ChatMessage.created_at.desc()).limit(1)),
+        ("user's chats", ["ix_chat_participants_user_id_chat_id"],
+         db.query(ChatParticipant).filter(ChatParticipant.user_id == USER_ID)),
+        ("other chat participants", ["ix_chat_participants_chat_id"],
+         db.query(ChatParticipant).filter(ChatParticipant.chat_id == OTHER_ID, ChatParticipant.user_id != USER_ID)),
+        ("active phone OTP", ["ix_otps_phone_purpose_expires_at"],
+         db.query(OTP).filter(
+             OTP.phone_number == "+923001234567", OTP.purpose == "login",
+             OTP.is_verified == False, OTP.expires_at > now)),
+        ("active email OTP", ["ix_otps_email_purpose_expires_at"],
+         db.query(OTP).filter(
+             OTP.email == "user@example.com", OTP.purpose == "register",
+             OTP.is_verified == False, OTP.expires_at > now).order_by(OTP.created_at.desc()).limit(1)),
+        ("loyalty ledger sums", ["ix_loyalty_points_user_id_type"],
+         db.query(LoyaltyPoint.user_id, LoyaltyPoint.type, func.sum(LoyaltyPoint.points)).filter(
+             LoyaltyPoint.user_id.in_([USER_ID, OTHER_ID]), LoyaltyPoint.type.in_(("earned", "used"))
+         ).group_by(LoyaltyPoint.user_id, LoyaltyPoint.type)),
+        ("transactions by branch", ["ix_transactions_branch_created_at"],
+         db.query(Transaction).filter(Transaction.branch == "DHA Phase 4")
+         .order_by(Transaction.created_at.desc()).limit(20)),
+    ]
+
+def explain(db, query) -> str:
+    """The query plan as text, from the database the session is bound to"""
+    connection = db.connection()
+    compiled = query.statement.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()
+        return "\n".join(str(row[-1]) for row in rows)
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        rows = connection.exec_driver_sql(f"EXPLAIN {compiled}", params).fetchall()
+        return "\n".join(row[0] for row in rows)
+    raise RuntimeError(f"EXPLAIN checks support SQLite and PostgreSQL, not {connection.dialect.name}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Assert the hot queries use their compound indexes")
+    parser.add_argument("--database-url", help="Migrated database to check (default: throwaway SQLite)")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args()
+
+    throwaway = not args.database_url
+    if throwaway:
+        workdir = tempfile.mkdtemp(prefix="explain-")
+        args.database_url = f"sqlite:///{os.path.join(workdir, 'explain.db')}"
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from app.core.database import Base, SessionLocal, engine
+    import app.models  # noqa: F401
+
+    if throwaway:
+        Base.metadata.create_all(bind=engine)
+
+    print(f"Database dialect: {engine.dialect.name}")
+    db = SessionLocal()
+    failures = 0
+    try:
+        for label, indexes, query in hot_queries(db):
+            plan = explain(db, query)
+            used = next((name for name in indexes if name in plan), None)
+            if used is None:
+                failures += 1
+                print(f"FAIL {label}: expected {indexes[0]}\n    " + plan.replace("\n", "\n    "))
+            else:
+                print(f"ok   {label}: {used}")
+                if args.verbose:
+                    print("    " + plan.replace("\n", "\n    "))
+    finally:
+        db.rollback()
+        db.close()
+
+    print("PASS" if not failures else f"FAIL: {failures} queries not using their index")
+    return not failures
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic data at realistic volumes for benchmarks, load and capacity tests
+
+Creates users (with addresses), categories, products, orders with items and
+transactions, order-status and promotion notifications, product reviews, and
+direct chats with messages. Distributions follow what production traffic
+looks like rather than uniform noise:
+
+  product popularity  Zipfian (--zipf): a few bestsellers take most order lines
+  customers           Zipfian as well, milder: regulars order far more often
+  order times         lunch and dinner peaks, busier weekends, growing over --days
+  branches            skewed (BRANCH_WEIGHTS), not split evenly
+
+Rows are built in memory in batches and written through the raw DBAPI
+connection: COPY on PostgreSQL, executemany on other databases, with the
+non-unique indexes dropped during the load and rebuilt at the end. The target
+must be migrated and must not already hold generated rows (ids are
+deterministic, so the same --seed always produces the same data).
+
+Usage: python generate_data.py [--scale small|medium|large] [--users N] [--products N] [--orders N]
+                               [--database-url sqlite:///./load.db] [--seed 42] [--days 365] [--zipf 1.1]
+"""
+
+import argparse
+import bisect
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.bulk import BATCH_SIZE, BulkWriter
+
+# large is ~10M rows, most of them orders, order items, transactions and notifications
+SCALES = {
+    "small": {"users": 1000, "products": 100, "orders": 10000, "reviews": 5000, "notifications": 5000, "chats": 200},
+    "medium": {"users": 20000, "products": 500, "orders": 200000, "reviews": 50000, "notifications": 50000, "chats": 2000},
+    "large": {"users": 200000, "products": 2000, "orders": 2000000, "reviews": 500000, "notifications": 500000, "chats": 20000},
+}
+
+BRANCH_WEIGHTS = {"DHA Phase 4": 50, "Main PIA Road": 30, "Lake City": 20}
+PAYMENT_METHODS = ["cash", "card", "Meezan Bank Transfer"]
+CATEGORIES = ["Shawarma", "Wraps", "Platters", "Burgers", "Sides", "Drinks", "Desserts", "Family Deals"]
+ADJECTIVES = ["Classic", "Spicy", "Zinger", "Garlic", "Tandoori", "Peri Peri", "Cheesy", "Smoky", "Grilled"]
+PROTEINS = ["Chicken", "Beef", "Mutton", "Falafel", "Paneer", "Fish"]
+COMMENTS = ["Great taste", "Too spicy", "Arrived hot", "Could be bigger", "Best shawarma in town", "Late delivery", ""]
+PROMOTIONS = ["Weekend deal: 20% off platters", "Free delivery tonight", "New: Peri Peri shawarma", "Family deal of the week"]
+
+# Relative order volume by hour of day (0-23): lunch and late dinner peaks
+HOURLY_ORDER_WEIGHTS = [3, 2, 1, 0.5, 0.2, 0.2, 0.3, 0.5, 1, 1.5, 2, 4, 8, 10, 8, 5, 4, 5, 7, 10, 12, 11, 8, 5]
+# Relative order volume by weekday, Monday first
+WEEKDAY_ORDER_WEIGHTS = [0.9, 0.85, 0.9, 0.95, 1.15, 1.35, 1.25]
+# Orders per day at the end of the period, relative to its start
+GROWTH = 1.5
+# Orders newer than this are still in progress; older ones are delivered or cancelled
+IN_PROGRESS_WINDOW = timedelta(hours=2)
+
+# Generated users have emails in this domain
+EMAIL_DOMAIN = "load.test"
+
+def row_id(table: int, index: int) -> str:
+    """Deterministic, ascending UUID-formatted ids: load tests can address generated rows without
+    querying, and appending to the primary key index is much cheaper than random inserts"""
+    return f"{table:08x}-0000-4000-8000-{index + 1:012x}"
+
+def user_id(index: int) -> str:
+    return row_id(0, index)
+
+def product_id(index: int) -> str:
+    return row_id(1, index)
+
+def address_id(index: int) -> str:
+    return row_id(3, index)
+
+class WeightedChoice:
+    """Index drawn with probability proportional to its weight, by bisecting the cumulative weights"""
+
+    def __init__(self, weights):
+        self.cumulative = list(itertools.accumulate(weights))
+        self.total = self.cumulative[-1]
+
+    def pick(self, rng: random.Random) -> int:
+        return bisect.bisect_right(self.cumulative, rng.random() * self.total)
+
+class Zipf:
+    """Zipf-distributed picks over n items; which item gets which rank is shuffled once by rng"""
+
+    def __init__(self, n: int, exponent: float, rng: random.Random):
+        self.choice = WeightedChoice(1 / rank ** exponent for rank in range(1, n + 1))
+        self.by_rank = list(range(n))
+        rng.shuffle(self.by_rank)
+
+    def pick(self, rng: random.Random) -> int:
+        return self.by_rank[self.choice.pick(rng)]
+
+    def share(self, item: int) -> float:
+        """Expected fraction of picks that land on item"""
+        rank = self.by_rank.index(item)
+        return (self.choice.cumulative[rank] - (self.choice.cumulative[rank - 1] if rank else 0)) / self.choice.total
+
+class DataGenerator:
+    """Writes one table at a time, parents before children, in BATCH_SIZE batches"""
+
+    def __init__(self, engine, volumes: dict, seed: int = 42, days: int = 365, zipf: float = 1.1,
+                 defer_indexes: bool = True):
+        self.writer = BulkWriter(engine)
+        self.defer_indexes = defer_indexes
+        self.volumes = volumes
+        self.rng = random.Random(seed)
+        self.end = datetime.utcnow().replace(microsecond=0)
+        self.start = (self.end - timedelta(days=days)).replace(hour=0, minute=0, second=0)
+        self.days = days
+        self.counts = {}
+        self.category_ids = [row_id(2, i) for i in range(len(CATEGORIES))]
+        self.prices = []
+
+        self.products_by_popularity = Zipf(volumes["products"], zipf, self.rng)
+        self.customers = Zipf(volumes["users"], zipf * 0.6, self.rng)
+        self.branches = list(BRANCH_WEIGHTS)
+        self.branch_choice = WeightedChoice(BRANCH_WEIGHTS.values())
+        self.hours = WeightedChoice(HOURLY_ORDER_WEIGHTS)
+        self.day_choice = WeightedChoice(
+            WEEKDAY_ORDER_WEIGHTS[(self.start + timedelta(days=day)).weekday()] * (1 + (GROWTH - 1) * day / days)
+            for day in range(days + 1)
+        )
+
+    def random_time(self) -> datetime:
+        return self.start + timedelta(seconds=self.rng.randint(0, int((self.end - self.start).total_seconds())))
+
+    def order_time(self) -> datetime:
+        """A weighted day of the period, a weighted hour of that day, a uniform second of that hour"""
+        rng = self.rng
+        moment = self.start + timedelta(days=self.day_choice.pick(rng), hours=self.hours.pick(rng), seconds=rng.randrange(3600))
+        return min(moment, self.end)
+
+    def insert(self, table, rows):
+        self.counts[table.name] = self.counts.get(table.name, 0) + self.writer.write(table, rows)
+
+    def users(self):
+        for i in range(self.volumes["users"]):
+            yield {
+                "id": user_id(i), "name": f"Load User {i}", "email": f"user{i}@{EMAIL_DOMAIN}",
+                "phone_number": f"+92300{i:07d}", "is_admin": False, "is_online": False,
+                "created_at": self.random_time()
+            }
+
+    def addresses(self):
+        for i in range(self.volumes["users"]):
+            yield {
+                "id": address_id(i), "user_id": user_id(i), "name": "Home",
+                "address": f"House {i % 500}, Street {i % 40}, Lahore", "latitude": 31.45 + self.rng.random() / 10,
+                "longitude": 74.25 + self.rng.random() / 10, "is_default": True, "type": "home"
+            }
+
+    def categories(self):
+        for category_id, name in zip(self.category_ids, CATEGORIES):
+            yield {"id": category_id, "name": name, "created_at": self.start}
+
+    def products(self):
+        lines_per_order = 2.2
+        for i in range(self.volumes["products"]):
+            category = i % len(CATEGORIES)
+            price = float(self.rng.choice(range(250, 1500, 50)) if CATEGORIES[category] != "Family Deals"
+                          else self.rng.choice(range(2500, 6000, 250)))
+            self.prices.append(price)
+            yield {
+                "id": product_id(i), "category_id": self.category_ids[category], "price": price,
+                "name": f"{self.rng.choice(ADJECTIVES)} {self.rng.choice(PROTEINS)} {CATEGORIES[category]} {i}",
+                "description": "Generated for load testing", "status": "Available", "is_available": True,
+                "rating": round(self.rng.uniform(3.0, 5.0), 1), "reviews_count": 0,
+                "order_count": round(self.volumes["orders"] * lines_per_order * self.products_by_popularity.share(i)),
+                "delivery_time": "30-40 min", "created_at": self.start
+            }
+
+    def orders(self):
+        """(orders, order_items, transactions, notifications) rows, generated together so they agree"""
+        rng = self.rng
+        orders, items, transactions, notifications = [], [], [], []
+        for i in range(self.volumes["orders"]):
+            order_id = row_id(4, i)
+            created_at = self.order_time()
+            customer = self.customers.pick(rng)
+            subtotal = 0.0
+            for line in range(rng.choice((1, 1, 2, 2, 3, 4))):
+                product = self.products_by_popularity.pick(rng)
+                quantity = rng.choice((1, 1, 1, 2, 3))
+                subtotal += self.prices[product] * quantity
+                items.append({
+                    "id": row_id(5, i * 8 + line), "order_id": order_id,
+                    "menu_item_id": product_id(product), "item_name": f"Product {product}",
+                    "quantity": quantity, "price": self.prices[product], "created_at": created_at
+                })
+            if self.end - created_at < IN_PROGRESS_WINDOW:
+                status = rng.choice(("pending", "preparing", "on_the_way"))
+            else:
+                status = "cancelled" if rng.random() < 0.07 else "delivered"
+            branch = self.branches[self.branch_choice.pick(rng)]
+            delivery = rng.random() < 0.8
+            delivery_fee = 150.0 if delivery else 0.0
+            gst = round(subtotal * 0.05, 2)
+            total = round(subtotal + delivery_fee + gst, 2)
+            payment_method = rng.choice(PAYMENT_METHODS)
+            order_number = f"LOAD-{i:09d}"
+            orders.append({
+                "id": order_id, "order_number": order_number, "user_id": user_id(customer),
+                "address_id": address_id(customer) if delivery else None,
+                "status": status, "delivery_type": "delivery" if delivery else "pickup", "payment_method": payment_method,
+                "payment_status": "paid" if status == "delivered" else "pending", "subtotal": subtotal,
+                "delivery_fee": delivery_fee, "platform_fee": 0.0, "gst": gst, "tip": 0.0, "promo_discount": 0.0,
+                "total": total, "branch": branch, "created_at": created_at
+            })
+            transactions.append({
+                "id": row_id(6, i), "order_id": order_id, "amount": total,
+                "payment_method": payment_method, "branch": branch, "created_at": created_at,
+                "status": "Completed" if status == "delivered" else ("Refund" if status == "cancelled" else "Pending")
+            })
+            data = json.dumps({"orderId": order_id})
+            notifications.append({
+                "id": row_id(11, i * 2), "user_id": user_id(customer), "type": "order_status",
+                "title": "Order placed", "message": f"Your order {order_number} has been placed", "data": data,
+                "is_read": True, "created_at": created_at
+            })
+            if status in ("delivered", "cancelled"):
+                notifications.append({
+                    "id": row_id(11, i * 2 + 1), "user_id": user_id(customer), "type": "order_status",
+                    "title": f"Order {status}", "message": f"Your order {order_number} has been {status}", "data": data,
+                    "is_read": rng.random() < 0.7, "created_at": created_at + timedelta(minutes=rng.randint(25, 60))
+                })
+            if len(orders) >= BATCH_SIZE:
+                yield orders, items, transactions, notifications
+                orders, items, transactions, notifications = [], [], [], []
+        if orders:
+            yield orders, items, transactions, notifications
+
+    def promotions(self):
+        """Marketing notifications, sent at campaign times to users regardless of how much they order"""
+        for i in range(self.volumes["notifications"]):
+            title = self.rng.choice(PROMOTIONS)
+            yield {
+                "id": row_id(12, i), "user_id": user_id(self.rng.randrange(self.volumes["users"])), "type": "promotion",
+                "title": title, "message": title, "data": None, "is_read": self.rng.random() < 0.3,
+                "created_at": self.random_time()
+            }
+
+    def reviews(self):
+        for i in range(self.volumes["reviews"]):
+            comment = self.rng.choice(COMMENTS)
+            yield {
+                "id": row_id(7, i), "product_id": product_id(self.products_by_popularity.pick(self.rng)),
+                "user_id": user_id(self.customers.pick(self.rng)), "rating": self.rng.choice((3, 4, 4, 5, 5, 5, 2, 1)),
+                "comment": comment, "review_text": comment, "helpful_count": 0,
+                "branch": self.branches[self.branch_choice.pick(self.rng)], "created_at": self.random_time()
+            }
+
+    def chats(self):
+        """(chats, participants, messages) rows: direct chats between two users"""
+        chats, participants, messages = [], [], []
+        for i in range(self.volumes["chats"]):
+            chat_id = row_id(8, i)
+            created_at = self.random_time()
+            members = self.rng.sample(range(self.volumes["users"]), 2)
+            chats.append({"id": chat_id, "type": "direct", "created_at": created_at})
+            for slot, member in enumerate(members):
+                participants.append({"id": row_id(9, i * 2 + slot), "chat_id": chat_id,
+                                     "user_id": user_id(member), "role": "member"})
+            for m in range(self.rng.randint(2, 30)):
+                messages.append({
+                    "id": row_id(10, i * 64 + m), "chat_id": chat_id,
+                    "sender_id": user_id(members[m % 2]), "content": f"Message {m}", "type": "text",
+                    "is_read": True, "created_at": created_at + timedelta(minutes=m)
+                })
+            if len(chats) >= BATCH_SIZE:
+                yield chats, participants, messages
+                chats, participants, messages = [], [], []
+        if chats:
+            yield chats, participants, messages
+
+    def run(self):
+        from app.models import (
+            Address, ChatMessage, ChatParticipant, MenuItem, Notification, Order, OrderItem, Review, Transaction, User
+        )
+
+        tables = [model.__table__ for model in (
+            User, Address, MenuItem, Order, OrderItem, Transaction, Notification, Review, ChatParticipant, ChatMessage
+        )]
+        with self.writer.deferred_indexes(tables) if self.defer_indexes else nullcontext():
+            self.load()
+        return self.counts
+
+    def load(self):
+        from app.models import (
+            Address, Category, Chat, ChatMessage, ChatParticipant, MenuItem, Notification, Order, OrderItem,
+            Review, Transaction, User
+        )
+
+        self.insert(User.__table__, self.users())
+        self.insert(Address.__table__, self.addresses())
+        self.insert(Category.__table__, self.categories())
+        self.insert(MenuItem.__table__, self.products())
+        for orders, items, transactions, notifications in self.orders():
+            self.insert(Order.__table__, orders)
+            self.insert(OrderItem.__table__, items)
+            self.insert(Transaction.__table__, transactions)
+            self.insert(Notification.__table__, notifications)
+        self.insert(Notification.__table__, self.promotions())
+        self.insert(Review.__table__, self.reviews())
+        for chats, participants, messages in self.chats():
+            self.insert(Chat.__table__, chats)
+            self.insert(ChatParticipant.__table__, participants)
+            self.insert(ChatMessage.__table__, messages)
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load synthetic users, products, orders, notifications, reviews and chats")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    for name in SCALES["small"]:
+        parser.add_argument(f"--{name}", type=int, help=f"Override the number of {name}")
+    parser.add_argument("--database-url", help="Target database (default: app settings); must be migrated")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--days", type=int, default=365, help="Spread orders over this many days up to now")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of product popularity")
+    parser.add_argument("--keep-indexes", action="store_true",
+                        help="Maintain indexes during the load instead of rebuilding them at the end")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    volumes = {name: getattr(args, name) or count for name, count in SCALES[args.scale].items()}
+
+    from app.core.database import engine
+
+    print(f"Generating into {engine.url.render_as_string(hide_password=True)}: {volumes}")
+    started = time.perf_counter()
+    counts = DataGenerator(engine, volumes, seed=args.seed, days=args.days, zipf=args.zipf,
+                           defer_indexes=not args.keep_indexes).run()
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    for table, count in counts.items():
+        print(f"  {table:20s} {count:>10,}")
+    print(f"{total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Reproducible load test: browse -> cart -> checkout -> track
+
+Virtual users run the mobile app's main journey concurrently:
+
+  browse    categories, product listing, recommended, a product, its reviews, search
+  cart      add 1-3 products, view the cart
+  checkout  place the order, clear the cart
+  track     order history, track the new order
+
+By default it generates a throwaway SQLite database (generate_data.py, --scale)
+and drives the app in-process through ASGI, so numbers depend on the code, not
+the network. With --base-url the same journeys run against a live server
+(tokens are minted with the local SECRET_KEY, which must match the server's,
+and the server's database must hold generate_data.py users).
+
+Reports requests, throughput and p50/p95/p99 per endpoint. --output writes the
+report as a JSON baseline; --compare diffs a run against one and fails when an
+endpoint's p95 regresses by more than --max-regression percent.
+
+Usage: python load_test.py [--users 20] [--iterations 10] [--scale small] [--seed 42]
+                           [--base-url http://localhost:8000] [--output baseline.json]
+                           [--compare baseline.json] [--max-regression 25]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+SEARCH_TERMS = ["chicken", "shawarma", "beef wrap", "spicy", "platter", "garlic", "zinger", "falafel"]
+
+def percentile(ordered, pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+class Recorder:
+    """Latencies and errors per endpoint (method + route template)"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def call(self, client, name: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except Exception:
+            self.errors[name] += 1
+            self.latencies[name].append(time.perf_counter() - started)
+            return None
+        self.latencies[name].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+            return None
+        return response.json()
+
+    def report(self, wall_seconds: float) -> dict:
+        endpoints = {}
+        for name in sorted(self.latencies):
+            ordered = sorted(self.latencies[name])
+            endpoints[name] = {
+                "requests": len(ordered),
+                "errors": self.errors[name],
+                "throughputRps": round(len(ordered) / wall_seconds, 2),
+                "meanMs": round(sum(ordered) / len(ordered) * 1000, 2),
+                "p50Ms": round(percentile(ordered, 50) * 1000, 2),
+                "p95Ms": round(percentile(ordered, 95) * 1000, 2),
+                "p99Ms": round(percentile(ordered, 99) * 1000, 2),
+            }
+        total = sum(len(values) for values in self.latencies.values())
+        return {
+            "endpoints": endpoints,
+            "total": {
+                "requests": total,
+                "errors": sum(self.errors.values()),
+                "seconds": round(wall_seconds, 2),
+                "throughputRps": round(total / wall_seconds, 2),
+            }
+        }
+
+async def journey(client, recorder: Recorder, rng: random.Random, headers: dict, products: list):
+    """One browse -> cart -> checkout -> track pass of a virtual user"""
+    call = recorder.call
+    await call(client, "GET /api/categories/", "GET", "/api/categories/")
+    await call(client, "GET /api/products/", "GET", "/api/products/", params={"page": rng.randint(1, 3)}, headers=headers)
+    await call(client, "GET /api/products/recommended", "GET", "/api/products/recommended", headers=headers)
+    product = rng.choice(products)
+    await call(client, "GET /api/products/{product_id}", "GET", f"/api/products/{product['id']}", headers=headers)
+    await call(client, "GET /api/mobile/reviews/products/{product_id}/reviews", "GET",
+               f"/api/mobile/reviews/products/{product['id']}/reviews")
+    await call(client, "GET /api/search/search", "GET", "/api/search/search", params={"q": rng.choice(SEARCH_TERMS)}, headers=headers)
+
+    basket = rng.sample(products, rng.randint(1, min(3, len(products))))
+    for item in basket:
+        await call(client, "POST /api/cart/", "POST", "/api/cart/", json={"productId": item["id"], "quantity": 1}, headers=headers)
+    await call(client, "GET /api/cart/", "GET", "/api/cart/", headers=headers)
+
+    subtotal = sum(item["price"] for item in basket)
+    order = await call(client, "POST /api/mobile/orders/", "POST", "/api/mobile/orders/", headers=headers, json={
+        "items": [{"productId": item["id"], "quantity": 1, "price": item["price"]} for item in basket],
+        "deliveryType": "pickup", "addressId": "1", "paymentMethod": "cash",
+        "subtotal": subtotal, "deliveryFee": 0.0, "platformFee": 0.0, "gst": 0.0, "total": subtotal
+    })
+    await call(client, "DELETE /api/cart/", "DELETE", "/api/cart/", headers=headers)
+
+    await call(client, "GET /api/mobile/orders/", "GET", "/api/mobile/orders/", headers=headers)
+    if order:
+        await call(client, "GET /api/mobile/orders/{order_id}/track", "GET", f"/api/mobile/orders/{order['id']}/track", headers=headers)
+
+async def run_load(client, users: int, iterations: int, seed: int, user_count: int) -> dict:
+    from app.core.security import create_access_token
+    from generate_data import user_id
+
+    listing = await client.get("/api/products/", params={"limit": 100})
+    listing.raise_for_status()
+    products = [{"id": p["id"], "price": p["price"]} for p in listing.json()["products"]]
+    if not products:
+        raise SystemExit("No products in the target database - run generate_data.py first")
+
+    recorder = Recorder()
+
+    async def virtual_user(index: int):
+        rng = random.Random(seed * 100003 + index)
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': user_id(index % user_count)})}"}
+        for _ in range(iterations):
+            await journey(client, recorder, rng, headers, products)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(virtual_user(index) for index in range(users)))
+    return recorder.report(time.perf_counter() - started)
+
+def compare(report: dict, baseline: dict, max_regression: float) -> bool:
+    """Print per-endpoint p95/throughput changes; False when a p95 regressed beyond the limit"""
+    ok = True
+    print(f"\n{'endpoint':55s} {'p95 before':>10s} {'p95 now':>10s} {'change':>8s} {'rps change':>10s}")
+    for name, now in report["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before:
+            print(f"{name:55s} {'-':>10s} {now['p95Ms']:>9.1f}ms {'new':>8s}")
+            continue
+        change = (now["p95Ms"] - before["p95Ms"]) / before["p95Ms"] * 100 if before["p95Ms"] else 0.0
+        rps_change = (now["throughputRps"] - before["throughputRps"]) / before["throughputRps"] * 100 if before["throughputRps"] else 0.0
+        regressed = change > max_regression
+        ok = ok and not regressed
+        print(f"{name:55s} {before['p95Ms']:>9.1f}ms {now['p95Ms']:>9.1f}ms {change:>+7.1f}% {rps_change:>+9.1f}%"
+              + ("  REGRESSED" if regressed else ""))
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the browse/cart/checkout/track load test")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--iterations", type=int, default=10, help="Journeys per virtual user")
+    parser.add_argument("--scale", default="small", help="generate_data.py scale of the throwaway database")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", help="Use this generated database instead of a throwaway one")
+    parser.add_argument("--base-url", help="Load a running server instead of the in-process app")
+    parser.add_argument("--output", help="Write the report (JSON baseline) here")
+    parser.add_argument("--compare", help="Baseline report to diff against")
+    parser.add_argument("--max-regression", type=float, default=25.0, help="Allowed p95 increase per endpoint, percent")
+    args = parser.parse_args()
+
+    import httpx
+    from generate_data import SCALES
+
+    user_count = SCALES.get(args.scale, SCALES["small"])["users"]
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+    else:
+        if not args.database_url:
+            workdir = tempfile.mkdtemp(prefix="load-test-")
+            args.database_url = f"sqlite:///{os.path.join(workdir, 'load.db')}"
+            os.environ["DATABASE_URL"] = args.database_url
+            from migrate import migrate
+            from generate_data import DataGenerator
+            from app.core.database import engine
+            migrate()
+            print(f"Generating {args.scale} data set...")
+            DataGenerator(engine, SCALES[args.scale], seed=args.seed).run()
+        os.environ["DATABASE_URL"] = args.database_url
+        from app.main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load-test", timeout=60)
+
+    async def run():
+        async with client:
+            return await run_load(client, args.users, args.iterations, args.seed, user_count)
+
+    report = asyncio.run(run())
+    report["meta"] = {
+        "target": args.base_url or "in-process",
+        "users": args.users, "iterations": args.iterations, "scale": args.scale, "seed": args.seed,
+        "python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count(),
+        "recordedAt": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+    print(f"\n{'endpoint':55s} {'reqs':>6s} {'err':>5s} {'rps':>8s} {'p50':>8s} {'p95':>8s} {'p99':>8s}")
+    for name, stats in report["endpoints"].items():
+        print(f"{name:55s} {stats['requests']:>6d} {stats['errors']:>5d} {stats['throughputRps']:>8.1f} "
+              f"{stats['p50Ms']:>7.1f}ms {stats['p95Ms']:>7.1f}ms {stats['p99Ms']:>7.1f}ms")
+    total = report["total"]
+    print(f"{total['requests']} requests, {total['errors']} errors in {total['seconds']}s ({total['throughputRps']} req/s)")
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+        print(f"Report written to {args.output}")
+
+    ok = True
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            ok = compare(report, json.load(baseline_file), args.max_regression)
+        print("PASS" if ok else f"FAIL: p95 regressed by more than {args.max_regression:.0f}%")
+    return ok
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
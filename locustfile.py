@@ -0,0 +1,63 @@
+"""
+Locust profile of the load_test.py journey, for load from many machines
+
+Needs locust (pip install locust, not in requirements.txt) and a server whose
+database was filled by generate_data.py; tokens are minted with the local
+SECRET_KEY, which must match the server's.
+
+Usage: locust -f locustfile.py --host http://localhost:8000 --users 200 --spawn-rate 20
+"""
+
+import os
+import random
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from locust import HttpUser, between, task
+
+from app.core.security import create_access_token
+from generate_data import SCALES, user_id
+from load_test import SEARCH_TERMS
+
+# generate_data.py scale the server's database was built with
+USER_COUNT = SCALES[os.getenv("LOAD_SCALE", "small")]["users"]
+
+class AppUser(HttpUser):
+    wait_time = between(0.5, 2)
+
+    def on_start(self):
+        self.headers = {"Authorization": f"Bearer {create_access_token({'sub': user_id(random.randrange(USER_COUNT))})}"}
+        listing = self.client.get("/api/products/", params={"limit": 100}, name="GET /api/products/").json()
+        self.products = [{"id": p["id"], "price": p["price"]} for p in listing["products"]]
+
+    @task
+    def browse_cart_checkout_track(self):
+        get = self.client.get
+        get("/api/categories/", name="GET /api/categories/")
+        get("/api/products/", params={"page": random.randint(1, 3)}, headers=self.headers, name="GET /api/products/")
+        get("/api/products/recommended", headers=self.headers, name="GET /api/products/recommended")
+        product = random.choice(self.products)
+        get(f"/api/products/{product['id']}", headers=self.headers, name="GET /api/products/{product_id}")
+        get(f"/api/mobile/reviews/products/{product['id']}/reviews",
+            name="GET /api/mobile/reviews/products/{product_id}/reviews")
+        get("/api/search/search", params={"q": random.choice(SEARCH_TERMS)}, headers=self.headers,
+            name="GET /api/search/search")
+
+        basket = random.sample(self.products, random.randint(1, min(3, len(self.products))))
+        for item in basket:
+            self.client.post("/api/cart/", json={"productId": item["id"], "quantity": 1}, headers=self.headers,
+                             name="POST /api/cart/")
+        get("/api/cart/", headers=self.headers, name="GET /api/cart/")
+
+        subtotal = sum(item["price"] for item in basket)
+        response = self.client.post("/api/mobile/orders/", headers=self.headers, name="POST /api/mobile/orders/", json={
+            "items": [{"productId": item["id"], "quantity": 1, "price": item["price"]} for item in basket],
+            "deliveryType": "pickup", "addressId": "1", "paymentMethod": "cash",
+            "subtotal": subtotal, "deliveryFee": 0.0, "platformFee": 0.0, "gst": 0.0, "total": subtotal
+        })
+        self.client.delete("/api/cart/", headers=self.headers, name="DELETE /api/cart/")
+
+        get("/api/mobile/orders/", headers=self.headers, name="GET /api/mobile/orders/")
+        if response.ok:
+            get(f"/api/mobile/orders/{response.json()['id']}/track", headers=self.headers,
+                name="GET /api/mobile/orders/{order_id}/track")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Bring the database schema up to date (run before starting the API)
+
+- new databases get every table from the Alembic migrations
+- databases built by the old create_all-at-startup have no alembic_version
+  table yet; they are stamped at the baseline revision first, then upgraded
+
+Usage: python migrate.py [--revision head] [--sql]
+"""
+
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+BASELINE_REVISION = "0001"
+
+def alembic_config() -> Config:
+    return Config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini"))
+
+def migrate(revision: str = "head", sql: bool = False, engine=None) -> bool:
+    """Upgrade the app database (or the given engine's) to revision; True on success"""
+    if engine is None:
+        from app.core.database import engine
+
+    config = alembic_config()
+    config.attributes["engine"] = engine  # migrations/env.py runs against this engine
+    print(f"Database dialect: {engine.dialect.name}")
+    try:
+        if not sql:
+            tables = set(inspect(engine).get_table_names())
+            if "alembic_version" not in tables and "users" in tables:
+                print(f"Existing schema without migration history, stamping baseline {BASELINE_REVISION}...")
+                command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, revision, sql=sql)
+        if not sql:
+            print("Migration completed successfully!")
+        return True
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        return False
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply database migrations")
+    parser.add_argument("--revision", default="head", help="Target revision (default: head)")
+    parser.add_argument("--sql", action="store_true", help="Print the SQL instead of running it")
+    args = parser.parse_args()
+    return migrate(args.revision, args.sql)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
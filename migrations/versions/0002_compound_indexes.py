@@ -0,0 +1,58 @@
+"""Compound indexes for the hot router queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:30:00
+
+Databases created by create_all after the models declared these indexes
+already have some of them, so each index is only created when missing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_orders_user_id_created_at", "orders", ["user_id", "created_at"]),
+    ("ix_orders_status_created_at", "orders", ["status", "created_at"]),
+    ("ix_orders_branch_created_at", "orders", ["branch", "created_at"]),
+    ("ix_orders_created_at", "orders", ["created_at"]),
+    ("ix_notifications_user_id_created_at", "notifications", ["user_id", "created_at"]),
+    ("ix_notifications_user_id_is_read_created_at", "notifications", ["user_id", "is_read", "created_at"]),
+    ("ix_favorites_user_id_product_id", "favorites", ["user_id", "product_id"]),
+    ("ix_reviews_product_id_created_at", "reviews", ["product_id", "created_at"]),
+    ("ix_chat_messages_chat_id_created_at", "chat_messages", ["chat_id", "created_at"]),
+    ("ix_chat_participants_user_id_chat_id", "chat_participants", ["user_id", "chat_id"]),
+    ("ix_chat_participants_chat_id", "chat_participants", ["chat_id"]),
+    ("ix_otps_phone_purpose_expires_at", "otps", ["phone_number", "purpose", "expires_at"]),
+    ("ix_otps_email_purpose_expires_at", "otps", ["email", "purpose", "expires_at"]),
+    ("ix_loyalty_points_user_id_type", "loyalty_points", ["user_id", "type"]),
+]
+
+
+def _existing_indexes(table: str) -> set:
+    if op.get_context().as_sql:
+        return set()  # Offline (--sql): emit every statement
+    return {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    existing = {}
+    for name, table, columns in INDEXES:
+        if table not in existing:
+            existing[table] = _existing_indexes(table)
+        if name not in existing[table]:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        if op.get_context().as_sql or name in _existing_indexes(table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,57 @@
+"""Product full-text and trigram search indexes (PostgreSQL)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 10:00:00
+
+Replaces add_search_indexes.py. The tsvector expression must stay identical
+to PG_SEARCH_DOCUMENT in app/core/search_engine.py, or the planner won't use
+the index; it is copied here so the migration doesn't change with the app.
+The trigram index needs the pg_trgm extension; where it can't be created,
+typo-tolerant search stays disabled and the rest of the upgrade goes on.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_INDEX_DDL = (
+    "CREATE INDEX IF NOT EXISTS ix_products_search_document ON products USING gin "
+    "((setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')))"
+)
+
+TRIGRAM_INDEX_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_products_name_trgm ON products USING gin (name gin_trgm_ops)",
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    op.execute(SEARCH_INDEX_DDL)
+    if op.get_context().as_sql:
+        for statement in TRIGRAM_INDEX_DDL:
+            op.execute(statement)
+        return
+    try:
+        with bind.begin_nested():
+            for statement in TRIGRAM_INDEX_DDL:
+                bind.exec_driver_sql(statement)
+    except Exception as e:
+        print(f"WARNING: pg_trgm unavailable, typo-tolerant search disabled: {e}")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP INDEX IF EXISTS ix_products_name_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_products_search_document")
@@ -0,0 +1,65 @@
+"""Server-side cart totals
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 10:10:00
+
+Replaces add_cart_totals_fields.py. Adds the price snapshot columns to
+cart_items and creates cart_totals. Existing carts have no totals row yet,
+so each one is computed on first access. Anything that script (or create_all)
+already added is left alone.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _inspector():
+    if op.get_context().as_sql:
+        return None  # Offline (--sql): emit every statement
+    return sa.inspect(op.get_bind())
+
+
+def upgrade() -> None:
+    inspector = _inspector()
+    columns = {column["name"] for column in inspector.get_columns("cart_items")} if inspector else set()
+    if "unit_price" not in columns:
+        op.add_column('cart_items', sa.Column('unit_price', sa.Float(), nullable=True))
+    if "add_ons_total" not in columns:
+        op.add_column('cart_items', sa.Column('add_ons_total', sa.Float(), nullable=True))
+
+    if inspector is None or not inspector.has_table("cart_totals"):
+        op.create_table('cart_totals',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('item_count', sa.Integer(), nullable=True),
+        sa.Column('items_subtotal', sa.Float(), nullable=True),
+        sa.Column('add_ons_total', sa.Float(), nullable=True),
+        sa.Column('subtotal', sa.Float(), nullable=True),
+        sa.Column('delivery_fee', sa.Float(), nullable=True),
+        sa.Column('platform_fee', sa.Float(), nullable=True),
+        sa.Column('gst', sa.Float(), nullable=True),
+        sa.Column('total', sa.Float(), nullable=True),
+        sa.Column('is_stale', sa.Boolean(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id')
+        )
+        op.create_index(op.f('ix_cart_totals_id'), 'cart_totals', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_cart_totals_id'), table_name='cart_totals')
+    op.drop_table('cart_totals')
+    with op.batch_alter_table('cart_items') as batch_op:
+        batch_op.drop_column('add_ons_total')
+        batch_op.drop_column('unit_price')
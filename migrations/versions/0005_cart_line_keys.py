@@ -0,0 +1,168 @@
+"""Merge identical cart lines via a canonical line key
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 10:20:00
+
+Replaces add_cart_line_keys.py. Adds cart_items.line_key, fills it for the
+existing lines, merges duplicates (same user, product, customizations and
+add-ons; the oldest line keeps the summed quantity) and then adds the unique
+(user_id, line_key) constraint.
+
+The key is computed the way line_key() in app/core/cart_state.py does it;
+the function is copied here so the migration doesn't change with the app.
+Offline (--sql) only the column and constraint are emitted: lines left
+without a key just don't merge with lines added later.
+"""
+import hashlib
+import json
+from typing import Any, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+cart_items = sa.table(
+    'cart_items',
+    sa.column('id', sa.String), sa.column('user_id', sa.String), sa.column('product_id', sa.String),
+    sa.column('quantity', sa.Integer), sa.column('customizations', sa.Text), sa.column('add_ons', sa.Text),
+    sa.column('line_key', sa.String), sa.column('add_ons_total', sa.Float), sa.column('created_at', sa.DateTime),
+)
+cart_totals = sa.table('cart_totals', sa.column('user_id', sa.String), sa.column('is_stale', sa.Boolean))
+
+
+def _decode(raw: Any, default: Any) -> Any:
+    if not raw:
+        return default
+    if not isinstance(raw, str):
+        return raw
+    try:
+        return json.loads(raw)
+    except (TypeError, ValueError):
+        return default
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, dict):
+        normalized = {}
+        for key in sorted(value, key=str):
+            item = _canonical(value[key])
+            if item is not None and item != "" and item != [] and item != {}:
+                normalized[str(key)] = item
+        return normalized
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _line_key(product_id: str, customizations: Any, add_ons: Any) -> str:
+    add_ons_data = _decode(add_ons, [])
+    if not isinstance(add_ons_data, list):
+        add_ons_data = []
+    canonical = {
+        "product": product_id,
+        "customizations": _canonical(_decode(customizations, {})),
+        "addOns": sorted(
+            (_canonical(addon) for addon in add_ons_data),
+            key=lambda addon: json.dumps(addon, sort_keys=True, default=str)
+        )
+    }
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _add_ons_total(add_ons: Any) -> float:
+    total = 0.0
+    add_ons_data = _decode(add_ons, [])
+    if isinstance(add_ons_data, list):
+        for addon in add_ons_data:
+            if isinstance(addon, dict):
+                try:
+                    total += float(addon.get("price", 0.0) or 0.0) * (addon.get("quantity", 1) or 1)
+                except (TypeError, ValueError):
+                    pass
+    return total
+
+
+def _key_and_merge_lines(bind) -> None:
+    """Fill line_key / add_ons_total and fold duplicate lines into the oldest one"""
+    kept = {}  # (user_id, key) -> [id, quantity, changed]
+    duplicates = []
+    updates = []
+    rows = bind.execute(
+        sa.select(cart_items).order_by(cart_items.c.user_id, cart_items.c.created_at, cart_items.c.id)
+    ).all()
+    for row in rows:
+        key = _line_key(row.product_id, row.customizations, row.add_ons)
+        line = kept.get((row.user_id, key))
+        if line is None:
+            kept[(row.user_id, key)] = [row.id, row.quantity or 0, False]
+            updates.append({"b_id": row.id, "b_key": key, "b_add_ons_total": _add_ons_total(row.add_ons)})
+        else:
+            line[1] += row.quantity or 0
+            line[2] = True
+            duplicates.append(row.id)
+
+    quantities = [{"b_id": line_id, "b_quantity": quantity} for line_id, quantity, changed in kept.values() if changed]
+    for start in range(0, len(duplicates), BATCH_SIZE):
+        bind.execute(cart_items.delete().where(cart_items.c.id.in_(duplicates[start:start + BATCH_SIZE])))
+    if updates:
+        bind.execute(
+            cart_items.update().where(cart_items.c.id == sa.bindparam("b_id")).values(
+                line_key=sa.bindparam("b_key"), add_ons_total=sa.bindparam("b_add_ons_total")
+            ),
+            updates
+        )
+    if quantities:
+        bind.execute(
+            cart_items.update().where(cart_items.c.id == sa.bindparam("b_id")).values(quantity=sa.bindparam("b_quantity")),
+            quantities
+        )
+    # Add-ons are now priced per unit; stale totals are recomputed on next access
+    bind.execute(cart_totals.update().values(is_stale=True))
+    print(f"Keyed {len(updates)} cart lines, merged {len(duplicates)} duplicates")
+
+
+def _create_unique(name: str, table: str, columns: list) -> None:
+    context = op.get_context()
+    if context.as_sql and context.dialect.name == "sqlite":
+        # Batch mode can't rebuild the table without reflecting it; a unique index enforces the same rule
+        op.create_index(name, table, columns, unique=True)
+        return
+    with op.batch_alter_table(table) as batch_op:
+        batch_op.create_unique_constraint(name, columns)
+
+
+def upgrade() -> None:
+    offline = op.get_context().as_sql
+    inspector = None if offline else sa.inspect(op.get_bind())
+    if inspector is None or "line_key" not in {column["name"] for column in inspector.get_columns("cart_items")}:
+        op.add_column('cart_items', sa.Column('line_key', sa.String(length=64), nullable=True))
+
+    if not offline:
+        _key_and_merge_lines(op.get_bind())
+
+    existing = set()
+    if inspector is not None:
+        existing = {index["name"] for index in inspector.get_indexes("cart_items")}
+        existing |= {constraint["name"] for constraint in inspector.get_unique_constraints("cart_items")}
+    if "uq_cart_items_user_line" not in existing:
+        _create_unique('uq_cart_items_user_line', 'cart_items', ['user_id', 'line_key'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('cart_items') as batch_op:
+        batch_op.drop_constraint('uq_cart_items_user_line', type_='unique')
+        batch_op.drop_column('line_key')
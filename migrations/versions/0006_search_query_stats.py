@@ -0,0 +1,41 @@
+"""Daily search query counts for popular searches
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 10:30:00
+
+Skipped where create_all already made the table.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not op.get_context().as_sql and sa.inspect(op.get_bind()).has_table("search_query_stats"):
+        return
+    op.create_table('search_query_stats',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('query', sa.String(length=255), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('query', 'day', name='uq_search_query_stats_query_day')
+    )
+    op.create_index(op.f('ix_search_query_stats_day'), 'search_query_stats', ['day'], unique=False)
+    op.create_index(op.f('ix_search_query_stats_id'), 'search_query_stats', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_search_query_stats_id'), table_name='search_query_stats')
+    op.drop_index(op.f('ix_search_query_stats_day'), table_name='search_query_stats')
+    op.drop_table('search_query_stats')
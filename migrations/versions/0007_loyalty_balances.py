@@ -0,0 +1,94 @@
+"""Materialized loyalty balances and idempotent accrual
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 10:40:00
+
+Creates loyalty_balances and makes (order_id, type) unique in the points
+ledger, so an order can't earn twice. Ledger entries already duplicated are
+removed first, keeping the earliest one; run reconcile_loyalty_balances.py
+afterwards if any were. Whatever backfill_loyalty_points.py or
+reconcile_loyalty_balances.py already created is left alone.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+loyalty_points = sa.table(
+    'loyalty_points',
+    sa.column('id', sa.String), sa.column('order_id', sa.String), sa.column('type', sa.String),
+    sa.column('created_at', sa.DateTime),
+)
+
+
+def _remove_duplicate_entries(bind) -> None:
+    seen = set()
+    duplicates = []
+    rows = bind.execute(
+        sa.select(loyalty_points.c.id, loyalty_points.c.order_id, loyalty_points.c.type)
+        .where(loyalty_points.c.order_id.isnot(None))
+        .order_by(loyalty_points.c.created_at, loyalty_points.c.id)
+    ).all()
+    for row in rows:
+        if (row.order_id, row.type) in seen:
+            duplicates.append(row.id)
+        else:
+            seen.add((row.order_id, row.type))
+    for start in range(0, len(duplicates), 1000):
+        bind.execute(loyalty_points.delete().where(loyalty_points.c.id.in_(duplicates[start:start + 1000])))
+    if duplicates:
+        print(f"Removed {len(duplicates)} duplicate loyalty ledger entries; run reconcile_loyalty_balances.py")
+
+
+def _create_unique(name: str, table: str, columns: list) -> None:
+    context = op.get_context()
+    if context.as_sql and context.dialect.name == "sqlite":
+        # Batch mode can't rebuild the table without reflecting it; a unique index enforces the same rule
+        op.create_index(name, table, columns, unique=True)
+        return
+    with op.batch_alter_table(table) as batch_op:
+        batch_op.create_unique_constraint(name, columns)
+
+
+def upgrade() -> None:
+    offline = op.get_context().as_sql
+    inspector = None if offline else sa.inspect(op.get_bind())
+
+    if inspector is None or not inspector.has_table("loyalty_balances"):
+        op.create_table('loyalty_balances',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('earned_points', sa.Integer(), nullable=True),
+        sa.Column('used_points', sa.Integer(), nullable=True),
+        sa.Column('available_points', sa.Integer(), nullable=True),
+        sa.Column('visits', sa.Integer(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id')
+        )
+        op.create_index(op.f('ix_loyalty_balances_id'), 'loyalty_balances', ['id'], unique=False)
+
+    existing = set()
+    if inspector is not None:
+        existing = {index["name"] for index in inspector.get_indexes("loyalty_points")}
+        existing |= {constraint["name"] for constraint in inspector.get_unique_constraints("loyalty_points")}
+    if "uq_loyalty_points_order_type" not in existing:
+        if not offline:
+            _remove_duplicate_entries(op.get_bind())
+        _create_unique('uq_loyalty_points_order_type', 'loyalty_points', ['order_id', 'type'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('loyalty_points') as batch_op:
+        batch_op.drop_constraint('uq_loyalty_points_order_type', type_='unique')
+    op.drop_index(op.f('ix_loyalty_balances_id'), table_name='loyalty_balances')
+    op.drop_table('loyalty_balances')
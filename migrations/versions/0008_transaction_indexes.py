@@ -0,0 +1,38 @@
+"""Composite transaction indexes for filtered listings and exports
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 10:50:00
+
+Replaces add_transaction_indexes.py; indexes it already created are skipped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_transactions_branch_created_at', ['branch', 'created_at']),
+    ('ix_transactions_status_created_at', ['status', 'created_at']),
+]
+
+
+def upgrade() -> None:
+    existing = set()
+    if not op.get_context().as_sql:
+        existing = {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("transactions")}
+    for name, columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, 'transactions', columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='transactions')
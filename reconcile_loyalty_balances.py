@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Maintenance script for materialized loyalty balances: re-derives every user's
+balance from the loyalty_points ledger and orders, in batches, and reports
+(and by default fixes) any drift
+
+Run `python migrate.py` first; the loyalty_balances table comes from the migrations.
+
+Schedule it daily, e.g. from cron: python reconcile_loyalty_balances.py
+"""
+
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal
+from app.core.loyalty_ledger import RECONCILE_BATCH_SIZE, reconcile_balances
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile loyalty balances with the points ledger")
+    parser.add_argument("--dry-run", action="store_true", help="Only report drift, don't fix it")
+    parser.add_argument("--batch-size", type=int, default=RECONCILE_BATCH_SIZE, help="Users checked per transaction")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        stats = reconcile_balances(db, batch_size=args.batch_size, fix=not args.dry_run)
+        action = "found" if args.dry_run else "fixed"
+        print(
+            f"Checked {stats['checked']} balances, {action} {stats['drifted']} drifted, "
+            f"{'missing' if args.dry_run else 'created'} {stats['created']}"
+        )
+        return True
+    except Exception as e:
+        db.rollback()
+        print(f"ERROR: Loyalty reconciliation failed: {e}")
+        return False
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
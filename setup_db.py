@@ -2,15 +2,17 @@
 Database setup script - Creates initial data for development
 Run this after setting up the database
 """
-from app.core.database import SessionLocal, engine, Base
+from app.core.database import SessionLocal
 from app.models.menu import Category
 from app.models.customer import Customer, MembershipType
 from app.models.staff import Staff, StaffRole, StaffStatus
 from app.models.role import Role, Permission
 import uuid
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
+# Create / upgrade all tables
+from migrate import migrate
+if not migrate():
+    raise SystemExit(1)
 
 db = SessionLocal()
 
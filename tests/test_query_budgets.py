@@ -0,0 +1,22 @@
+"""Statement budgets of the hot endpoints; the table and seed data live in check_query_budgets.py"""
+import pytest
+
+from check_query_budgets import BUDGETS, seeded_client
+
+@pytest.fixture(scope="module")
+def budget_client():
+    return seeded_client()
+
+@pytest.mark.parametrize("path, auth, budget", [
+    pytest.param(
+        path, auth, budget, id=path,
+        # strict: once the N+1 is fixed the test passes unexpectedly, and the debt note must go
+        marks=[pytest.mark.xfail(strict=True, raises=AssertionError, reason=f"N+1 debt: {debt}")] if debt else []
+    )
+    for path, auth, budget, debt in BUDGETS
+])
+def test_query_budget(budget_client, assert_max_queries, path, auth, budget):
+    client, headers = budget_client
+    with assert_max_queries(budget, path):
+        response = client.get(path, headers=headers[auth])
+    assert response.status_code == 200